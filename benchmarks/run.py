@@ -0,0 +1,167 @@
+"""
+Benchmarks of the hot paths of pyNonogram on synthetic puzzles.
+
+Run from the repository root:
+
+    python benchmarks/run.py --output results.json
+    python benchmarks/run.py --output results.json --baseline baseline.json
+
+Results are saved as JSON. When a baseline is given, every benchmark slower than the baseline by more than
+the threshold is reported and the runner exits with status 1.
+"""
+#Built-in imports
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from typing import Callable, Dict, List, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+#Internal imports
+from pyNonogram.nonogram import Nonogram
+from pyNonogram.generator import random_solution
+
+#External imports
+import numpy as np
+
+SIZES = [5, 10, 25, 50, 100, 200, 500]
+#solving is O(lines x line length x clues) in Python, larger sizes take minutes
+MAX_SOLVE_SIZE = 200
+#counting solutions searches, sparse puzzles are exponential and only benchmarked up to MAX_SPARSE_SEARCH_SIZE
+MAX_SEARCH_SIZE = 50
+MAX_SPARSE_SEARCH_SIZE = 25
+SEED = 0
+DENSITY = 0.6
+SPARSE_DENSITY = 0.5
+
+def write_puzzle(directory: str, size: int, with_solution: bool, density: Optional[float] = DENSITY) -> str:
+    """Writes a reproducible synthetic puzzle of size x size and returns its path."""
+    solution = random_solution(size, size, density, np.random.default_rng(SEED + size))
+    nonogram = Nonogram.from_solution(solution, author='benchmark', date='1.1.24')
+    lines = nonogram.to_lines()
+    if not with_solution:
+        lines[-1] = 'solution:'
+    path = os.path.join(directory, '{}{}_{}.non'.format(size, '' if with_solution else '_unsolved', density))
+    with open(path, 'w') as f:
+        f.write('\n'.join(lines) + '\n')
+    return path
+
+def loaded(path: str, with_solution: Optional[bool] = False) -> Nonogram:
+    """Returns a loaded nonogram, with its solution on the grid if requested."""
+    nonogram = Nonogram()
+    nonogram.load(path)
+    if with_solution:
+        nonogram.load_solution()
+    return nonogram
+
+def measure(func: Callable[[], None], setup: Callable[[], object], repeat: int, budget: float) -> Dict[str, float]:
+    """Times func(setup()) repeat times (fewer if over budget seconds), setup is not timed."""
+    times = []
+    started = time.perf_counter()
+    for _ in range(repeat):
+        arg = setup()
+        start = time.perf_counter()
+        func(arg)
+        times.append(time.perf_counter() - start)
+        if time.perf_counter() - started > budget:
+            break
+    return {'min': min(times), 'median': statistics.median(times), 'runs': len(times)}
+
+def benchmarks(directory: str, size: int) -> Dict[str, tuple]:
+    """Returns {name: (func, setup)} of the benchmarks for one size."""
+    solved_path = write_puzzle(directory, size, True)
+    unsolved_path = write_puzzle(directory, size, False)
+
+    def save_setup() -> Nonogram:
+        #every run saves into a fresh copy of the unsolved file
+        path = os.path.join(directory, 'save.non')
+        with open(unsolved_path, 'r') as f, open(path, 'w') as g:
+            g.write(f.read())
+        nonogram = loaded(path)
+        nonogram.grid[:] = loaded(solved_path, True).grid
+        return nonogram
+
+    def print_quietly(nonogram: Nonogram) -> None:
+        with contextlib.redirect_stdout(io.StringIO()):
+            nonogram.print()
+
+    cases = {
+        'load': (lambda path: loaded(path), lambda: solved_path),
+        'load_solution': (lambda nonogram: nonogram.load_solution(), lambda: loaded(solved_path)),
+        'check_all': (lambda nonogram: nonogram.check_all(), lambda: loaded(solved_path, True)),
+        'is_solved': (lambda nonogram: nonogram.is_solved(), lambda: loaded(solved_path, True)),
+        'get_row_segments': (lambda nonogram: [nonogram.grid.get_row_segments(y) for y in range(size)],
+                             lambda: loaded(solved_path, True)),
+        'print': (print_quietly, lambda: loaded(solved_path, True)),
+        'save_solution': (lambda nonogram: nonogram.save_solution(), save_setup),
+    }
+    if size <= MAX_SOLVE_SIZE:
+        cases['solve'] = (lambda nonogram: nonogram.solve(), lambda: loaded(solved_path))
+    if size <= MAX_SEARCH_SIZE:
+        cases['count_solutions'] = (lambda nonogram: nonogram.count_solutions(), lambda: loaded(solved_path))
+    if size <= MAX_SPARSE_SEARCH_SIZE:
+        sparse_path = write_puzzle(directory, size, True, SPARSE_DENSITY)
+        cases['count_solutions_sparse'] = (lambda nonogram: nonogram.count_solutions(), lambda: loaded(sparse_path))
+    return cases
+
+def run(sizes: List[int], repeat: int, budget: float, only: Optional[List[str]] = None) -> Dict[str, dict]:
+    """Runs all benchmarks and returns {"name[size]": timings}."""
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        for size in sizes:
+            for name, (func, setup) in benchmarks(directory, size).items():
+                if only and name not in only:
+                    continue
+                key = '{}[{}]'.format(name, size)
+                results[key] = measure(func, setup, repeat, budget)
+                print('{:<28} {:>12.6f} s'.format(key, results[key]['median']), flush=True)
+    return results
+
+def compare(results: Dict[str, dict], baseline: Dict[str, dict], threshold: float) -> List[str]:
+    """Returns benchmarks whose median got slower than threshold x baseline."""
+    regressions = []
+    for key, timing in results.items():
+        if key not in baseline:
+            continue
+        ratio = timing['median'] / max(baseline[key]['median'], 1e-9)
+        if ratio > threshold:
+            regressions.append('{}: {:.6f} s -> {:.6f} s ({:.2f}x)'.format(key, baseline[key]['median'], timing['median'], ratio))
+    return regressions
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description='Benchmark pyNonogram hot paths on synthetic puzzles.')
+    parser.add_argument('--sizes', type=int, nargs='+', default=SIZES, help='puzzle sizes (width = height)')
+    parser.add_argument('--only', nargs='+', help='run only these benchmarks')
+    parser.add_argument('--repeat', type=int, default=7, help='runs per benchmark')
+    parser.add_argument('--budget', type=float, default=5.0, help='seconds per benchmark before runs are cut short')
+    parser.add_argument('--output', help='save results to this JSON file')
+    parser.add_argument('--baseline', help='compare against results saved by an earlier run')
+    parser.add_argument('--threshold', type=float, default=1.25, help='slowdown ratio reported as regression')
+    args = parser.parse_args(argv)
+
+    results = run(args.sizes, args.repeat, args.budget, args.only)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'python': platform.python_version(), 'numpy': np.__version__,
+                       'machine': platform.machine(), 'results': results}, f, indent=2)
+    if args.baseline:
+        with open(args.baseline, 'r') as f:
+            baseline = json.load(f)['results']
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print('Regressions:')
+            for line in regressions:
+                print('  ' + line)
+            return 1
+        print('No regressions against {}'.format(args.baseline))
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
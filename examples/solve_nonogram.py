@@ -4,7 +4,7 @@ def main():
     nonogram = Nonogram()
     nonogram.load("examples/flower.non")
     nonogram.print()
-    while not nonogram.check_all():
+    while not nonogram.is_solved():
         x = int(input("x: "))
         y = int(input("y: "))
         value = int(input("value: "))
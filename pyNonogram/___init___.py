@@ -1,21 +0,0 @@
-# -*- coding: utf-8 -*-
-
-"""
-pyNonogram
-==========
-
-Description
-
-:copyright:     (c) 2024 Tymon Becella
-:license:       MIT
-"""
-
-__title__ = 'pyNonogram'
-__author__ = 'Tymon Becella'
-__license__ = 'MIT'
-__copyright__ = 'Copyright 2024 Tymon Becella'
-__version__ = '1.0.0'
-
-from .errors import *
-from .nonogram_grid import *
-from .nonogram import *
\ No newline at end of file
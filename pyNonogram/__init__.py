@@ -0,0 +1,45 @@
+# -*- coding: utf-8 -*-
+
+"""
+pyNonogram
+==========
+
+Description
+
+:copyright:     (c) 2024 Tymon Becella
+:license:       MIT
+"""
+
+__title__ = 'pyNonogram'
+__author__ = 'Tymon Becella'
+__license__ = 'MIT'
+__copyright__ = 'Copyright 2024 Tymon Becella'
+__version__ = '1.0.0'
+
+from .errors import *
+
+#classes re-exported from their modules on first access, so importing the package does not import numpy
+_LAZY = {
+    'Nonogram': 'nonogram',
+    'save_solutions': 'nonogram',
+    'NonogramGrid': 'nonogram_grid',
+    'BitsetGrid': 'bitset_grid',
+    'NonogramCollection': 'collection',
+    'NonogramArchive': 'archive',
+    'Renderer': 'render',
+    'LineCache': 'line_cache',
+    'Stats': 'stats',
+    'Hint': 'hint',
+    'HintEngine': 'hint',
+}
+
+def __getattr__(name: str):
+    if name in _LAZY:
+        import importlib
+        value = getattr(importlib.import_module('.' + _LAZY[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError('module {!r} has no attribute {!r}'.format(__name__, name))
+
+def __dir__():
+    return sorted(list(globals()) + list(_LAZY))
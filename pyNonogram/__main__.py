@@ -0,0 +1,7 @@
+#Internal imports
+import pyNonogram.cli
+
+#Built-in imports
+import sys
+
+sys.exit(pyNonogram.cli.main())
@@ -0,0 +1,218 @@
+#Internal imports
+import pyNonogram.nonogram
+import pyNonogram.errors
+
+#Built-in imports
+import mmap
+import struct
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+#External imports
+import numpy as np
+
+#header: magic, format version, number of puzzles, position of the offset table
+MAGIC = b'PYNA'
+VERSION = 1
+HEADER = struct.Struct('<4sHQQ')
+#offset table entry, offsets are relative to the start of the file
+OFFSET = struct.Struct('<Q')
+
+def _write_varint(out: bytearray, value: int) -> None:
+    """Appends an unsigned LEB128 varint to out."""
+    if value < 0:
+        raise ValueError('Varint value must be non-negative')
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+def _read_varint(data, pos: int) -> Tuple[int, int]:
+    """Reads an unsigned LEB128 varint, returns (value, next position)."""
+    value = 0
+    shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, pos
+        shift += 7
+
+def _write_text(out: bytearray, text: str) -> None:
+    """Appends a length prefixed utf-8 string to out."""
+    encoded = text.encode('utf-8')
+    _write_varint(out, len(encoded))
+    out += encoded
+
+def _read_text(data, pos: int) -> Tuple[str, int]:
+    """Reads a length prefixed utf-8 string, returns (text, next position)."""
+    length, pos = _read_varint(data, pos)
+    return bytes(data[pos:pos+length]).decode('utf-8'), pos + length
+
+def _write_hints(out: bytearray, hints: List[List[int]]) -> None:
+    """Appends hints of all lines, each line is its hint count followed by the hints."""
+    for line in hints:
+        _write_varint(out, len(line))
+        for hint in line:
+            _write_varint(out, hint)
+
+def _read_hints(data, pos: int, count: int) -> Tuple[List[List[int]], int]:
+    """Reads hints of count lines, returns (hints, next position)."""
+    hints = []
+    for _ in range(count):
+        length, pos = _read_varint(data, pos)
+        line = []
+        for _ in range(length):
+            hint, pos = _read_varint(data, pos)
+            line.append(hint)
+        hints.append(line)
+    return hints, pos
+
+def encode(nonogram) -> bytes:
+    """Encodes a loaded nonogram as an archive record.
+
+    :param nonogram: Loaded nonogram.
+    :type nonogram: Nonogram
+    :raises NotLoaded: Nonogram not loaded.
+    :raises UnknownFormat: Colored nonogram, archive records are black and white only.
+    :return: Archive record.
+    :rtype: bytes
+    """
+    if not nonogram.is_loaded:
+        raise pyNonogram.errors.NotLoaded('Nonogram not loaded')
+    if nonogram.row_colors is not None:
+        raise pyNonogram.errors.UnknownFormat('Colored nonograms can not be archived')
+    out = bytearray()
+    _write_varint(out, nonogram.width)
+    _write_varint(out, nonogram.height)
+    _write_varint(out, nonogram.picture)
+    _write_varint(out, nonogram.difficulty)
+    _write_text(out, nonogram.author)
+    _write_text(out, nonogram.date)
+    _write_hints(out, nonogram.rows)
+    _write_hints(out, nonogram.columns)
+    if nonogram.solution is None:
+        out.append(0)
+    else:
+        out.append(1)
+        #one bit per cell, row by row
+        out += np.packbits(np.asarray(nonogram.solution, dtype=np.uint8).ravel()).tobytes()
+    return bytes(out)
+
+def decode(data, pos: Optional[int] = 0):
+    """Decodes an archive record into a loaded nonogram.
+
+    :param data: Buffer holding the record.
+    :type data: bytes, memoryview or mmap
+    :param pos: Position of the record in data, defaults to 0
+    :type pos: int, optional
+    :return: Loaded nonogram.
+    :rtype: Nonogram
+    """
+    width, pos = _read_varint(data, pos)
+    height, pos = _read_varint(data, pos)
+    picture, pos = _read_varint(data, pos)
+    difficulty, pos = _read_varint(data, pos)
+    author, pos = _read_text(data, pos)
+    date, pos = _read_text(data, pos)
+    rows, pos = _read_hints(data, pos, height)
+    columns, pos = _read_hints(data, pos, width)
+    solution = None
+    if data[pos]:
+        pos += 1
+        cells = width*height
+        packed = np.frombuffer(data, dtype=np.uint8, count=(cells+7)//8, offset=pos)
+        solution = np.unpackbits(packed, count=cells).reshape(height, width)
+    nonogram = pyNonogram.nonogram.Nonogram()
+    nonogram.load_data(author, date, picture, difficulty, width, height, rows, columns, solution)
+    return nonogram
+
+def write_archive(path: str, nonograms: Iterable) -> int:
+    """Writes nonograms to a binary archive (.nona).
+
+    :param path: Path to archive (.nona)
+    :type path: str
+    :param nonograms: Loaded nonograms.
+    :type nonograms: Iterable[Nonogram]
+    :raises UnknownFormat: Invalid file format when file does not end with (.nona)
+    :return: Number of puzzles written.
+    :rtype: int
+    """
+    if not path.endswith('.nona'):
+        raise pyNonogram.errors.UnknownFormat('Invalid file format (Expected .nona got {})'.format(path.split('.')[-1]))
+    #records are streamed after the header, the offset table is appended once all are written
+    offsets = bytearray()
+    count = 0
+    with open(path, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, VERSION, 0, 0))
+        offset = HEADER.size
+        for nonogram in nonograms:
+            record = encode(nonogram)
+            offsets += OFFSET.pack(offset)
+            f.write(record)
+            offset += len(record)
+            count += 1
+        f.write(offsets)
+        f.seek(0)
+        f.write(HEADER.pack(MAGIC, VERSION, count, offset))
+    return count
+
+class NonogramArchive:
+    """Read-only binary archive of nonograms (.nona), memory-mapped for random access.
+
+    ``archive[i]`` decodes only the i-th puzzle.
+
+    :param path: Path to archive (.nona)
+    :type path: str
+    :raises PathException: Invalid path when path is not a file.
+    :raises UnknownFormat: Invalid file format when file is not an archive.
+    """
+    def __init__(self, path: str) -> None:
+        """Opens the archive.
+        """
+        self.path = path
+        try:
+            self._file = open(path, 'rb')
+        except OSError:
+            raise pyNonogram.errors.PathException('Invalid path')
+        try:
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            magic, version, self.count, self._table = HEADER.unpack_from(self._mmap, 0)
+        except (ValueError, struct.error):
+            self._file.close()
+            raise pyNonogram.errors.UnknownFormat('Invalid file format (Not a nonogram archive)')
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise pyNonogram.errors.UnknownFormat('Invalid file format (Not a nonogram archive)')
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __getitem__(self, idx: int):
+        """Decodes the puzzle at idx.
+
+        :raises IndexError: Index out of range.
+        :rtype: Nonogram
+        """
+        if idx < 0:
+            idx += self.count
+        if not 0 <= idx < self.count:
+            raise IndexError('Archive index out of range')
+        (offset,) = OFFSET.unpack_from(self._mmap, self._table + OFFSET.size*idx)
+        return decode(self._mmap, offset)
+
+    def __iter__(self) -> Iterator:
+        for idx in range(self.count):
+            yield self[idx]
+
+    def __enter__(self) -> 'NonogramArchive':
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Closes the memory map and the file.
+        """
+        self._mmap.close()
+        self._file.close()
@@ -0,0 +1,137 @@
+#Internal imports
+import pyNonogram.nonogram
+import pyNonogram.nonogram_grid
+import pyNonogram.solver
+import pyNonogram.errors
+
+#Built-in imports
+import os
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Executor, ProcessPoolExecutor, wait
+from typing import Any, Callable, Iterable, Iterator, List, Optional, Tuple, Union
+
+#External imports
+import numpy as np
+
+SOLVED = 'solved'
+PARTIAL = 'partial'
+CONTRADICTION = 'contradiction'
+ERROR = 'error'
+
+def describe(nonogram) -> Tuple[int, int, List[List[int]], List[List[int]]]:
+    """Returns the compact description of a loaded nonogram sent to worker processes.
+
+    :param nonogram: Loaded nonogram.
+    :type nonogram: Nonogram
+    :return: (width, height, rows, columns), rows and columns of colored nonograms hold (length, color) pairs
+    :rtype: Tuple[int, int, List[List[int]], List[List[int]]]
+    """
+    if not nonogram.is_loaded:
+        raise pyNonogram.errors.NotLoaded('Nonogram not loaded')
+    if nonogram.row_colors is not None:
+        return nonogram.width, nonogram.height, nonogram._row_tuples(), nonogram._col_tuples()
+    return nonogram.width, nonogram.height, nonogram.rows, nonogram.columns
+
+def solve_description(description: Union[str, tuple]) -> Tuple[str, Optional[str]]:
+    """Solves a puzzle given by path or compact description.
+
+    :param description: Path to nonogram file (.non) or description from :func:`describe`.
+    :type description: Union[str, tuple]
+    :return: (status, solution) where solution is a string of 0s and 1s (or color codes) as in .non files, None if not solved.
+    :rtype: Tuple[str, Optional[str]]
+    """
+    try:
+        if isinstance(description, str):
+            nonogram = pyNonogram.nonogram.Nonogram()
+            nonogram.load(description)
+            description = describe(nonogram)
+        width, height, rows, columns = description
+        colors = pyNonogram.solver.clue_colors([pyNonogram.solver.normalize_clues(clues) for clues in rows])
+        grid = pyNonogram.nonogram_grid.NonogramGrid((height, width), colors=colors[-1])
+        pyNonogram.solver.propagate(grid, rows, columns)
+    except pyNonogram.errors.Contradiction:
+        return CONTRADICTION, None
+    except (pyNonogram.errors.NonogramException, pyNonogram.errors.PathException,
+            pyNonogram.errors.UnknownFormat, ValueError, IndexError, OSError):
+        return ERROR, None
+    if np.any(grid == 0):
+        return PARTIAL, None
+    return SOLVED, pyNonogram.nonogram._solution_string(np.maximum(grid, 0))
+
+def _solve_chunk(chunk: List[Tuple[int, Union[str, tuple]]]) -> List[Tuple[int, str, Optional[str]]]:
+    """Solves a chunk of (id, description) pairs in a worker process."""
+    return [(idx, *solve_description(description)) for idx, description in chunk]
+
+def _chunks(puzzles: Iterable, chunksize: int) -> Iterator[List[Tuple[int, Union[str, tuple]]]]:
+    """Groups puzzles into chunks of (id, description) pairs."""
+    chunk = []
+    for idx, puzzle in enumerate(puzzles):
+        chunk.append((idx, puzzle if isinstance(puzzle, (str, tuple)) else describe(puzzle)))
+        if len(chunk) == chunksize:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+def _bounded_map(executor: Executor, fn: Callable, items: Iterable, window: int,
+                 ordered: Optional[bool] = True) -> Iterator[Any]:
+    """Yields fn(item) for every item run on executor, with at most window items in flight.
+
+    Items are only taken from the iterable when a slot frees up, so inputs are streamed instead of
+    being read and pickled before the first result.
+    """
+    if ordered:
+        #results of a FIFO queue of futures come back in input order
+        pending = deque()
+        for item in items:
+            pending.append(executor.submit(fn, item))
+            if len(pending) >= window:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+        return
+    pending = set()
+    for item in items:
+        pending.add(executor.submit(fn, item))
+        while len(pending) >= window:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield future.result()
+    while pending:
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            yield future.result()
+
+def _window(workers: Optional[int]) -> int:
+    """Returns the number of chunks kept in flight, two per worker process."""
+    return 2*(workers or os.cpu_count() or 1)
+
+def solve_many(puzzles: Iterable, workers: Optional[int] = None, chunksize: Optional[int] = 16,
+               ordered: Optional[bool] = True) -> Iterator[Tuple[int, str, Optional[str]]]:
+    """Solves many puzzles across worker processes.
+
+    Puzzles are sent to workers as paths or compact descriptions, never as pickled grids.
+    Ids are positions of puzzles in the input. Puzzles are read lazily, at most two chunks
+    per worker are in flight at a time.
+
+    :param puzzles: Paths to nonogram files (.non), loaded nonograms or descriptions from :func:`describe`.
+    :type puzzles: Iterable[Union[str, Nonogram, tuple]]
+    :param workers: Number of worker processes, defaults to number of CPUs. 0 solves in this process.
+    :type workers: int, optional
+    :param chunksize: Number of puzzles sent to a worker at once, defaults to 16
+    :type chunksize: int, optional
+    :param ordered: Yield results in input order instead of completion order, defaults to True
+    :type ordered: bool, optional
+    :return: (id, status, solution) for every puzzle, see :func:`solve_description`.
+    :rtype: Iterator[Tuple[int, str, Optional[str]]]
+    """
+    if chunksize < 1:
+        raise ValueError('Chunksize must be positive')
+    chunks = _chunks(puzzles, chunksize)
+    if workers == 0:
+        for chunk in chunks:
+            yield from _solve_chunk(chunk)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for results in _bounded_map(executor, _solve_chunk, chunks, _window(workers), ordered):
+            yield from results
@@ -0,0 +1,494 @@
+#Internal imports
+import pyNonogram.nonogram_grid
+import pyNonogram.solver
+
+#Built-in imports
+from typing import Iterable, List, Optional, Sequence, Set, Tuple
+
+#External imports
+import numpy as np
+
+def _mask_runs(mask: int) -> List[int]:
+    """Returns lengths of runs of set bits in mask, from the lowest bit up."""
+    #bin() walks the whole int in C, the reversed digits run from the lowest bit up
+    return [len(run) for run in bin(mask)[:1:-1].split('0') if run]
+
+def _line_masks(values: Sequence[int]) -> Tuple[int, int]:
+    """Returns (filled mask, crossed mask) of a line of checked values (0, 1 or -1)."""
+    filled = 0
+    crossed = 0
+    for idx, value in enumerate(values):
+        if value == 1:
+            filled |= 1 << idx
+        elif value == -1:
+            crossed |= 1 << idx
+    return filled, crossed
+
+class BitsetGrid:
+    """Grid backend storing filled and crossed cells as bitmasks.
+
+    Every row and every column keeps two Python int bitmasks, bit x of a row mask is cell (x, y) and bit y of
+    a column mask is cell (x, y). Whole line writes and segment extraction are shifts and ANDs instead of
+    per cell array access. Exposes the same API as :class:`NonogramGrid`. :func:`pyNonogram.solver.propagate`
+    and :func:`pyNonogram.solver.check_cell_lines` work on the masks directly, see
+    :func:`pyNonogram.solver.solve_line_masks`.
+
+    :param shape: (height, width)
+    :type shape: Tuple[int, int]
+    """
+    def __init__(self, shape: Tuple[int, int]) -> None:
+        """Creates a new BitsetGrid object with all cells set to 0.
+        """
+        height, width = shape
+        self.shape = (height, width)
+        self.row_filled = [0]*height
+        self.row_crossed = [0]*height
+        self.col_filled = [0]*width
+        self.col_crossed = [0]*width
+        #rows and columns written since the last pop_dirty call
+        self.dirty_rows = set()
+        self.dirty_cols = set()
+        #(row clues, column clues) checked by set_cell, None while checked mode is off
+        self._check_clues = None
+
+    def _index(self, idx: int, size: int) -> int:
+        """Returns idx with negative values counted from the end, as in numpy indexing."""
+        if idx < 0:
+            idx += size
+        if not 0 <= idx < size:
+            raise IndexError('index {} is out of bounds for size {}'.format(idx, size))
+        return idx
+
+    def enable_checks(self, rows: Sequence[Sequence[int]], columns: Sequence[Sequence[int]]) -> None:
+        """Turns on checked mode, see :meth:`NonogramGrid.enable_checks`.
+        """
+        if len(rows) != self.shape[0] or len(columns) != self.shape[1]:
+            raise ValueError('Clues for {}x{} lines do not match the grid shape {}'.format(len(rows), len(columns), self.shape))
+        self._check_clues = ([pyNonogram.solver.normalize_clues(clues) for clues in rows],
+                             [pyNonogram.solver.normalize_clues(clues) for clues in columns])
+
+    def disable_checks(self) -> None:
+        """Turns off checked mode.
+        """
+        self._check_clues = None
+
+    def mark_dirty(self, rows: Optional[Iterable[int]] = None, cols: Optional[Iterable[int]] = None) -> None:
+        """Marks rows and columns as changed, see :meth:`NonogramGrid.mark_dirty`.
+        """
+        if rows is None and cols is None:
+            rows = range(self.shape[0])
+            cols = range(self.shape[1])
+        if rows is not None:
+            self.dirty_rows.update(rows)
+        if cols is not None:
+            self.dirty_cols.update(cols)
+
+    def pop_dirty(self) -> Tuple[Set[int], Set[int]]:
+        """Returns rows and columns changed since the last call and clears them.
+
+        :return: (dirty rows, dirty columns)
+        :rtype: Tuple[Set[int], Set[int]]
+        """
+        rows, cols = self.dirty_rows, self.dirty_cols
+        self.dirty_rows = set()
+        self.dirty_cols = set()
+        return rows, cols
+
+    def set_cell(self, x: int, y: int, value: int) -> None:
+        """Sets a cell value.
+
+        :param x: x coordinate
+        :type x: int
+        :param y: y coordinate
+        :type y: int
+        :param value: value to set (0, 1 or -1)
+        :type value: int
+        :raises Contradiction: In checked mode, see :meth:`NonogramGrid.set_cell`.
+        """
+        pyNonogram.nonogram_grid._checked_values(value)
+        y = self._index(y, self.shape[0])
+        x = self._index(x, self.shape[1])
+        row_bit = 1 << x
+        col_bit = 1 << y
+        self.row_filled[y] &= ~row_bit
+        self.row_crossed[y] &= ~row_bit
+        self.col_filled[x] &= ~col_bit
+        self.col_crossed[x] &= ~col_bit
+        if value == 1:
+            self.row_filled[y] |= row_bit
+            self.col_filled[x] |= col_bit
+        elif value == -1:
+            self.row_crossed[y] |= row_bit
+            self.col_crossed[x] |= col_bit
+        self.dirty_rows.add(y)
+        self.dirty_cols.add(x)
+        if self._check_clues is not None:
+            pyNonogram.solver.check_cell_lines(self, *self._check_clues, x, y)
+
+    def get_cell(self, x: int, y: int) -> int:
+        """Returns a cell value.
+
+        :param x: x coordinate
+        :type x: int
+        :param y: y coordinate
+        :type y: int
+        :return: cell value (0, 1 or -1)
+        :rtype: int
+        """
+        y = self._index(y, self.shape[0])
+        x = self._index(x, self.shape[1])
+        if self.row_filled[y] >> x & 1:
+            return 1
+        if self.row_crossed[y] >> x & 1:
+            return -1
+        return 0
+
+    def _line(self, filled: int, crossed: int, size: int) -> np.ndarray:
+        """Returns a line of values (0, 1 or -1) from its masks."""
+        nbytes = (size + 7) // 8
+        filled = np.unpackbits(np.frombuffer(filled.to_bytes(nbytes, 'little'), dtype=np.uint8), count=size, bitorder='little')
+        crossed = np.unpackbits(np.frombuffer(crossed.to_bytes(nbytes, 'little'), dtype=np.uint8), count=size, bitorder='little')
+        return filled.astype(np.int8) - crossed.astype(np.int8)
+
+    def get_row(self, y: int) -> np.ndarray:
+        """Returns cell values in a row.
+
+        :param y: y coordinate of row
+        :type y: int
+        :return: row
+        :rtype: np.ndarray
+        """
+        y = self._index(y, self.shape[0])
+        return self._line(self.row_filled[y], self.row_crossed[y], self.shape[1])
+
+    def get_col(self, x: int) -> np.ndarray:
+        """Returns cell values in a column.
+
+        :param x: x coordinate of column
+        :type x: int
+        :return: column
+        :rtype: np.ndarray
+        """
+        x = self._index(x, self.shape[1])
+        return self._line(self.col_filled[x], self.col_crossed[x], self.shape[0])
+
+    def get_row_masks(self, y: int) -> Tuple[int, int]:
+        """Returns (filled mask, crossed mask) of a row, bit x is cell (x, y).
+
+        :param y: y coordinate of row
+        :type y: int
+        :rtype: Tuple[int, int]
+        """
+        y = self._index(y, self.shape[0])
+        return self.row_filled[y], self.row_crossed[y]
+
+    def get_col_masks(self, x: int) -> Tuple[int, int]:
+        """Returns (filled mask, crossed mask) of a column, bit y is cell (x, y).
+
+        :param x: x coordinate of column
+        :type x: int
+        :rtype: Tuple[int, int]
+        """
+        x = self._index(x, self.shape[1])
+        return self.col_filled[x], self.col_crossed[x]
+
+    def set_row_masks(self, y: int, filled: int, crossed: int) -> None:
+        """Sets a row from its masks, columns are updated only where the row changed.
+
+        :param y: y coordinate of row
+        :type y: int
+        :param filled: Mask of filled cells.
+        :type filled: int
+        :param crossed: Mask of crossed cells.
+        :type crossed: int
+        """
+        y = self._index(y, self.shape[0])
+        full = (1 << self.shape[1]) - 1
+        filled &= full
+        crossed &= full & ~filled
+        changed = (self.row_filled[y] ^ filled) | (self.row_crossed[y] ^ crossed)
+        self.row_filled[y] = filled
+        self.row_crossed[y] = crossed
+        col_bit = 1 << y
+        for x in pyNonogram.solver._mask_bits(changed):
+            if filled >> x & 1:
+                self.col_filled[x] |= col_bit
+            else:
+                self.col_filled[x] &= ~col_bit
+            if crossed >> x & 1:
+                self.col_crossed[x] |= col_bit
+            else:
+                self.col_crossed[x] &= ~col_bit
+            self.dirty_cols.add(x)
+        if changed:
+            self.dirty_rows.add(y)
+
+    def set_col_masks(self, x: int, filled: int, crossed: int) -> None:
+        """Sets a column from its masks, rows are updated only where the column changed.
+
+        :param x: x coordinate of column
+        :type x: int
+        :param filled: Mask of filled cells.
+        :type filled: int
+        :param crossed: Mask of crossed cells.
+        :type crossed: int
+        """
+        x = self._index(x, self.shape[1])
+        full = (1 << self.shape[0]) - 1
+        filled &= full
+        crossed &= full & ~filled
+        changed = (self.col_filled[x] ^ filled) | (self.col_crossed[x] ^ crossed)
+        self.col_filled[x] = filled
+        self.col_crossed[x] = crossed
+        row_bit = 1 << x
+        for y in pyNonogram.solver._mask_bits(changed):
+            if filled >> y & 1:
+                self.row_filled[y] |= row_bit
+            else:
+                self.row_filled[y] &= ~row_bit
+            if crossed >> y & 1:
+                self.row_crossed[y] |= row_bit
+            else:
+                self.row_crossed[y] &= ~row_bit
+            self.dirty_rows.add(y)
+        if changed:
+            self.dirty_cols.add(x)
+
+    def set_row(self, y: int, values: Sequence[int]) -> None:
+        """Sets all cell values in a row.
+
+        :param y: y coordinate of row
+        :type y: int
+        :param values: values to set (0, 1 or -1), one per column
+        :type values: Sequence[int]
+        """
+        values = pyNonogram.nonogram_grid._checked_values(values)
+        if values.shape != (self.shape[1],):
+            raise ValueError('Row must have {} values'.format(self.shape[1]))
+        self.set_row_masks(y, *_line_masks(values.tolist()))
+
+    def set_col(self, x: int, values: Sequence[int]) -> None:
+        """Sets all cell values in a column.
+
+        :param x: x coordinate of column
+        :type x: int
+        :param values: values to set (0, 1 or -1), one per row
+        :type values: Sequence[int]
+        """
+        values = pyNonogram.nonogram_grid._checked_values(values)
+        if values.shape != (self.shape[0],):
+            raise ValueError('Column must have {} values'.format(self.shape[0]))
+        self.set_col_masks(x, *_line_masks(values.tolist()))
+
+    def fill_row(self, y: int, value: int, with_overwritting: Optional[bool] = True) -> None:
+        """Fills a row with a value.
+
+        :param y: y coordinate of row
+        :type y: int
+        :param value: value to fill with (0, 1 or -1)
+        :type value: int
+        :param with_overwritting: decides if existing non-zero values should be overwritten, defaults to True
+        :type with_overwritting: bool, optional
+        """
+        pyNonogram.nonogram_grid._checked_values(value)
+        filled, crossed = self.get_row_masks(y)
+        target = (1 << self.shape[1]) - 1
+        if not with_overwritting:
+            target &= ~(filled | crossed)
+        filled &= ~target
+        crossed &= ~target
+        if value == 1:
+            filled |= target
+        elif value == -1:
+            crossed |= target
+        self.set_row_masks(y, filled, crossed)
+
+    def fill_col(self, x: int, value: int, with_overwritting: Optional[bool] = True) -> None:
+        """Fills a column with a value.
+
+        :param x: x coordinate of column
+        :type x: int
+        :param value: value to fill with (0, 1 or -1)
+        :type value: int
+        :param with_overwritting: decides if existing non-zero values should be overwritten, defaults to True
+        :type with_overwritting: bool, optional
+        """
+        pyNonogram.nonogram_grid._checked_values(value)
+        filled, crossed = self.get_col_masks(x)
+        target = (1 << self.shape[0]) - 1
+        if not with_overwritting:
+            target &= ~(filled | crossed)
+        filled &= ~target
+        crossed &= ~target
+        if value == 1:
+            filled |= target
+        elif value == -1:
+            crossed |= target
+        self.set_col_masks(x, filled, crossed)
+
+    def set_cells(self, xs: Iterable[int], ys: Iterable[int], values) -> None:
+        """Sets many cells, see :meth:`NonogramGrid.set_cells`.
+
+        Cells are grouped by row, so every touched row is written once.
+        """
+        xs = np.asarray(xs, dtype=np.int64).ravel()
+        ys = np.asarray(ys, dtype=np.int64).ravel()
+        values = np.broadcast_to(np.asarray(values), xs.shape) if np.ndim(values) == 0 else np.asarray(values)
+        if xs.shape != ys.shape or values.shape != xs.shape:
+            raise ValueError('Coordinates and values must have the same length')
+        pyNonogram.nonogram_grid._checked_values(values)
+        updates = {}
+        for x, y, value in zip(xs.tolist(), ys.tolist(), values.tolist()):
+            y = self._index(y, self.shape[0])
+            updates.setdefault(y, []).append((self._index(x, self.shape[1]), value))
+        for y, cells in updates.items():
+            filled, crossed = self.row_filled[y], self.row_crossed[y]
+            for x, value in cells:
+                bit = 1 << x
+                filled &= ~bit
+                crossed &= ~bit
+                if value == 1:
+                    filled |= bit
+                elif value == -1:
+                    crossed |= bit
+            self.set_row_masks(y, filled, crossed)
+
+    def fill_rect(self, x: int, y: int, width: int, height: int, value: int,
+                  with_overwritting: Optional[bool] = True) -> None:
+        """Fills a rectangle with a value, see :meth:`NonogramGrid.fill_rect`.
+        """
+        pyNonogram.nonogram_grid._checked_values(value)
+        if width < 0 or height < 0 or x < 0 or y < 0 or x+width > self.shape[1] or y+height > self.shape[0]:
+            raise IndexError('Rectangle ({}, {}, {}, {}) is out of the grid'.format(x, y, width, height))
+        span = ((1 << width) - 1) << x
+        for row in range(y, y+height):
+            self._fill_row_mask(row, span, value, with_overwritting)
+
+    def apply_mask(self, mask: np.ndarray, value: int, overwrite: Optional[bool] = False) -> None:
+        """Sets every cell where mask is True to a value, see :meth:`NonogramGrid.apply_mask`.
+        """
+        pyNonogram.nonogram_grid._checked_values(value)
+        mask = np.asarray(mask, dtype=bool)
+        if mask.shape != self.shape:
+            raise ValueError('Mask must have shape {}'.format(self.shape))
+        nbytes = (self.shape[1] + 7) // 8
+        packed = np.packbits(mask, axis=1, bitorder='little')
+        for y in np.flatnonzero(mask.any(axis=1)).tolist():
+            self._fill_row_mask(y, int.from_bytes(packed[y, :nbytes].tobytes(), 'little'), value, overwrite)
+
+    def _fill_row_mask(self, y: int, target: int, value: int, overwrite: bool) -> None:
+        """Sets cells of row y whose bits are set in target to value."""
+        filled, crossed = self.row_filled[y], self.row_crossed[y]
+        if not overwrite:
+            target &= ~(filled | crossed)
+        filled &= ~target
+        crossed &= ~target
+        if value == 1:
+            filled |= target
+        elif value == -1:
+            crossed |= target
+        self.set_row_masks(y, filled, crossed)
+
+    def fill(self, value: int) -> None:
+        """Sets every cell to value.
+
+        :param value: value to fill with (0, 1 or -1)
+        :type value: int
+        """
+        pyNonogram.nonogram_grid._checked_values(value)
+        height, width = self.shape
+        row_full = (1 << width) - 1
+        col_full = (1 << height) - 1
+        self.row_filled = [row_full if value == 1 else 0]*height
+        self.row_crossed = [row_full if value == -1 else 0]*height
+        self.col_filled = [col_full if value == 1 else 0]*width
+        self.col_crossed = [col_full if value == -1 else 0]*width
+        self.mark_dirty()
+
+    def get_row_segments(self, y: int) -> List[int]:
+        """Returns lengths of segments of 1s in a row.
+
+        :param y: y coordinate of row
+        :type y: int
+        :return: Lengths of segments of 1s in a row.
+        :rtype: List[int]
+        """
+        return _mask_runs(self.get_row_masks(y)[0])
+
+    def get_col_segments(self, x: int) -> List[int]:
+        """Returns lengths of segments of 1s in a column.
+
+        :param x: x coordinate of column
+        :type x: int
+        :return: Lengths of segments of 1s in a column.
+        :rtype: List[int]
+        """
+        return _mask_runs(self.get_col_masks(x)[0])
+
+    def all_row_segments(self) -> List[List[int]]:
+        """Returns lengths of segments of 1s in every row.
+
+        :rtype: List[List[int]]
+        """
+        return [_mask_runs(mask) for mask in self.row_filled]
+
+    def all_col_segments(self) -> List[List[int]]:
+        """Returns lengths of segments of 1s in every column.
+
+        :rtype: List[List[int]]
+        """
+        return [_mask_runs(mask) for mask in self.col_filled]
+
+    def row_runs(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Returns segments of 1s of all rows as flat arrays, see :meth:`NonogramGrid.row_runs`.
+
+        :rtype: Tuple[np.ndarray, np.ndarray]
+        """
+        return _flat_runs(self.all_row_segments())
+
+    def col_runs(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Returns segments of 1s of all columns as flat arrays, see :meth:`NonogramGrid.col_runs`.
+
+        :rtype: Tuple[np.ndarray, np.ndarray]
+        """
+        return _flat_runs(self.all_col_segments())
+
+    def to_array(self) -> np.ndarray:
+        """Returns the grid as a 2D array of type np.int8.
+
+        :rtype: np.ndarray
+        """
+        height, width = self.shape
+        array = np.zeros((height, width), dtype=np.int8)
+        for y in range(height):
+            array[y] = self._line(self.row_filled[y], self.row_crossed[y], width)
+        return array
+
+    def __array__(self, dtype=None, copy=None) -> np.ndarray:
+        array = self.to_array()
+        return array if dtype is None else array.astype(dtype)
+
+    def copy(self) -> 'BitsetGrid':
+        """Returns a copy of the grid without dirty lines.
+
+        :rtype: BitsetGrid
+        """
+        grid = BitsetGrid(self.shape)
+        grid.row_filled = list(self.row_filled)
+        grid.row_crossed = list(self.row_crossed)
+        grid.col_filled = list(self.col_filled)
+        grid.col_crossed = list(self.col_crossed)
+        return grid
+
+    def __str__(self) -> str:
+        """Returns string representation of the grid, same as for NonogramGrid.
+
+        :rtype: str
+        """
+        return str(self.to_array())
+
+def _flat_runs(segments: List[List[int]]) -> Tuple[np.ndarray, np.ndarray]:
+    """Returns (line index, length) arrays of per line segments."""
+    counts = np.fromiter(map(len, segments), dtype=np.int64, count=len(segments))
+    lengths = np.fromiter((length for line in segments for length in line), dtype=np.int64, count=int(counts.sum()))
+    return np.repeat(np.arange(len(segments)), counts), lengths
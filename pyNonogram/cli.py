@@ -0,0 +1,282 @@
+"""
+Command-line tool for nonogram files.
+
+    pynonogram solve puzzles/ --workers 4
+    pynonogram check corpus.nonl
+    pynonogram index puzzles/ --where difficulty=1 --where width=5:10
+    pynonogram convert puzzles/ corpus.nonl
+    pynonogram bench house.non --repeat 5
+    pynonogram rate corpus.nonl --write
+
+Modules are imported by the subcommands that need them, so header only work (index, converting between
+.non directories and .nonl files) starts without importing numpy.
+"""
+#Internal imports
+import pyNonogram.errors
+
+#Built-in imports
+import argparse
+import os
+import sys
+from collections import deque
+from typing import Iterator, List, Optional, Tuple
+
+def _non_files(paths: List[str]) -> Iterator[str]:
+    """Yields .non files and files of other formats, directories are expanded to their .non files."""
+    for path in paths:
+        if os.path.isdir(path):
+            with os.scandir(path) as it:
+                yield from sorted(entry.path for entry in it if entry.name.endswith('.non') and entry.is_file())
+        else:
+            yield path
+
+def _puzzles(paths: List[str]) -> Iterator[Tuple[str, object]]:
+    """Yields (name, puzzle) where puzzle is a .non path or a loaded nonogram from a .nonl or .nona file."""
+    for path in _non_files(paths):
+        if path.endswith('.nonl'):
+            import pyNonogram.stream
+            for idx, nonogram in enumerate(pyNonogram.stream.iter_nonograms(path)):
+                yield '{}#{}'.format(path, idx), nonogram
+        elif path.endswith('.nona'):
+            import pyNonogram.archive
+            with pyNonogram.archive.NonogramArchive(path) as archive:
+                for idx, nonogram in enumerate(archive):
+                    yield '{}#{}'.format(path, idx), nonogram
+        else:
+            yield path, path
+
+def _named(paths: List[str], names: deque) -> Iterator:
+    """Yields puzzles of :func:`_puzzles` lazily, appending their names to names.
+
+    Results come back in input order, so the name of every result is the oldest name left.
+    """
+    for name, puzzle in _puzzles(paths):
+        names.append(name)
+        yield puzzle
+
+def _loaded(puzzle):
+    """Returns a loaded nonogram of a puzzle from :func:`_puzzles`."""
+    if isinstance(puzzle, str):
+        import pyNonogram.nonogram
+        nonogram = pyNonogram.nonogram.Nonogram()
+        nonogram.load(puzzle)
+        return nonogram
+    return puzzle
+
+def cmd_solve(args: argparse.Namespace) -> int:
+    """Solves puzzles and prints name, status and optionally the solution of each."""
+    import pyNonogram.batch
+    names = deque()
+    puzzles = _named(args.paths, names)
+    failed = 0
+    if args.search or args.save:
+        #search and saving need the nonogram objects, solved in this process
+        results = (_solve_loaded(puzzle, args.search, args.save) for puzzle in puzzles)
+    else:
+        results = ((status, solution) for _, status, solution
+                   in pyNonogram.batch.solve_many(puzzles, workers=args.workers, chunksize=args.chunksize))
+    for status, solution in results:
+        name = names.popleft()
+        failed += status != pyNonogram.batch.SOLVED
+        fields = [name, status]
+        if args.solution and solution is not None:
+            fields.append(solution)
+        print('\t'.join(fields))
+    return 1 if failed else 0
+
+def _solve_loaded(puzzle, search: bool, save: bool) -> Tuple[str, Optional[str]]:
+    """Solves one puzzle in this process, saving the solution to its .non file if requested."""
+    import numpy as np
+    import pyNonogram.batch
+    import pyNonogram.nonogram
+    try:
+        nonogram = _loaded(puzzle)
+        if not nonogram.solve(search=search):
+            return pyNonogram.batch.PARTIAL, None
+        if save and isinstance(puzzle, str):
+            nonogram.save_solution()
+    except pyNonogram.errors.Contradiction:
+        return pyNonogram.batch.CONTRADICTION, None
+    except (pyNonogram.errors.NonogramException, pyNonogram.errors.PathException,
+            pyNonogram.errors.UnknownFormat, ValueError, IndexError, OSError):
+        return pyNonogram.batch.ERROR, None
+    return pyNonogram.batch.SOLVED, pyNonogram.nonogram._solution_string(np.maximum(np.asarray(nonogram.grid), 0))
+
+def cmd_check(args: argparse.Namespace) -> int:
+    """Checks that stored solutions satisfy their hints."""
+    failed = 0
+    for name, puzzle in _puzzles(args.paths):
+        try:
+            nonogram = _loaded(puzzle)
+            status = 'ok' if nonogram.check_solution() else 'mismatch'
+        except pyNonogram.errors.NotSolved:
+            status = 'no solution'
+        except (pyNonogram.errors.NonogramException, pyNonogram.errors.PathException,
+                pyNonogram.errors.UnknownFormat, ValueError, IndexError, OSError) as e:
+            status = 'error: {}'.format(e)
+        failed += status != 'ok'
+        print('{}\t{}'.format(name, status))
+    return 1 if failed else 0
+
+def _filters(where: List[str]) -> dict:
+    """Parses --where field=value and field=min:max filters."""
+    import pyNonogram.collection
+    filters = {}
+    for item in where:
+        field, sep, value = item.partition('=')
+        if not sep or field not in pyNonogram.collection.HEADER_FIELDS:
+            raise ValueError('Invalid filter {} (Expected field=value with field one of {})'.format(
+                item, ', '.join(pyNonogram.collection.HEADER_FIELDS)))
+        if field in ('author', 'date'):
+            filters[field] = value
+        elif ':' in value:
+            low, high = value.split(':')
+            filters[field] = (int(low), int(high))
+        else:
+            filters[field] = int(value)
+    return filters
+
+def cmd_index(args: argparse.Namespace) -> int:
+    """Builds or refreshes the header index of a directory and prints matching puzzles."""
+    import pyNonogram.collection
+    collection = pyNonogram.collection.NonogramCollection(args.directory)
+    if args.force:
+        collection.refresh(force=True)
+    entries = collection.query(**_filters(args.where)) if args.where else collection.entries
+    if args.count:
+        print(len(entries))
+        return 0
+    for info in entries:
+        print('\t'.join(map(str, info)))
+    return 0
+
+def cmd_convert(args: argparse.Namespace) -> int:
+    """Converts between .non directories, .nonl files and .nona archives."""
+    import pyNonogram.stream
+    sources = list(_non_files(args.sources))
+    if args.destination.endswith('.nonl') and all(path.endswith('.non') for path in sources):
+        #raw records are copied without parsing
+        count = pyNonogram.stream.pack(sources, args.destination)
+    elif len(sources) == 1 and sources[0].endswith('.nonl') and not args.destination.endswith(('.nonl', '.nona')):
+        count = len(pyNonogram.stream.unpack(sources[0], args.destination))
+    else:
+        import pyNonogram.generator
+        nonograms = (_loaded(puzzle) for _, puzzle in _puzzles(sources))
+        count = pyNonogram.generator.write_all(args.destination, nonograms)
+    print('{} puzzles written to {}'.format(count, args.destination))
+    return 0
+
+def cmd_bench(args: argparse.Namespace) -> int:
+    """Times load, solve and check_all of puzzles with instrumentation enabled."""
+    import statistics
+    import pyNonogram.nonogram
+    import pyNonogram.stats
+    import pyNonogram.line_cache
+    print('\t'.join(['puzzle', 'load ms', 'solve ms', 'check_all ms', 'lines', 'cells', 'rounds', 'guesses']))
+    for path in _non_files(args.paths):
+        times = {'load': [], 'solve': [], 'check_all': []}
+        for _ in range(args.repeat):
+            stats = pyNonogram.stats.Stats(callback=lambda phase, seconds, _: times[phase].append(seconds))
+            #every run solves cold
+            pyNonogram.line_cache.shared_cache.clear()
+            nonogram = pyNonogram.nonogram.Nonogram(stats=stats)
+            nonogram.load(path)
+            nonogram.solve(search=args.search)
+            nonogram.check_all()
+        print('\t'.join([path] + ['{:.3f}'.format(statistics.median(times[phase])*1000) for phase in times] +
+                        [str(stats.lines), str(stats.cells), str(stats.rounds), str(stats.guesses)]))
+    return 0
+
+def cmd_rate(args: argparse.Namespace) -> int:
+    """Rates puzzles from solver traces, printing the scores or writing them into the difficulty field."""
+    import pyNonogram.rating
+    if args.write:
+        for path in args.paths:
+            count = pyNonogram.rating.write_ratings(path, workers=args.workers, chunksize=args.chunksize)
+            print('{} puzzles rated in {}'.format(count, path))
+        return 0
+    print('\t'.join(['puzzle', 'score'] + list(pyNonogram.rating.Trace._fields)))
+    names = deque()
+    failed = 0
+    for _, trace in pyNonogram.rating.rate_many(_named(args.paths, names), workers=args.workers, chunksize=args.chunksize):
+        name = names.popleft()
+        if trace is None:
+            failed += 1
+            print('{}\terror'.format(name))
+        else:
+            print('\t'.join([name, str(pyNonogram.rating.score(trace))] + list(map(str, trace))))
+    return 1 if failed else 0
+
+def _positive_int(value: str) -> int:
+    """Parses an integer option that must be at least 1."""
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError('invalid integer {}'.format(value))
+    if number < 1:
+        raise argparse.ArgumentTypeError('must be positive (got {})'.format(value))
+    return number
+
+def parser() -> argparse.ArgumentParser:
+    """Returns the argument parser of the command-line tool."""
+    main_parser = argparse.ArgumentParser(prog='pynonogram', description='Work with nonogram files.')
+    commands = main_parser.add_subparsers(dest='command', metavar='command')
+    commands.required = True
+
+    solve = commands.add_parser('solve', help='solve puzzles')
+    solve.add_argument('paths', nargs='+', help='.non files, directories, .nonl or .nona files')
+    solve.add_argument('--search', action='store_true', help='guess and backtrack when line logic gets stuck')
+    solve.add_argument('--save', action='store_true', help='save solutions into .non files')
+    solve.add_argument('--solution', action='store_true', help='print solutions')
+    solve.add_argument('--workers', type=int, default=0, help='worker processes, 0 solves in this process (default)')
+    solve.add_argument('--chunksize', type=int, default=16, help='puzzles sent to a worker at once')
+    solve.set_defaults(func=cmd_solve)
+
+    check = commands.add_parser('check', help='check stored solutions against hints')
+    check.add_argument('paths', nargs='+', help='.non files, directories, .nonl or .nona files')
+    check.set_defaults(func=cmd_check)
+
+    index = commands.add_parser('index', help='index puzzle headers of a directory and list them')
+    index.add_argument('directory', help='directory with .non files')
+    index.add_argument('--where', action='append', default=[], help='field=value or field=min:max filter')
+    index.add_argument('--force', action='store_true', help='rescan the directory')
+    index.add_argument('--count', action='store_true', help='print only the number of matching puzzles')
+    index.set_defaults(func=cmd_index)
+
+    convert = commands.add_parser('convert', help='convert between .non directories, .nonl and .nona files')
+    convert.add_argument('sources', nargs='+', help='.non files, directories, .nonl or .nona files')
+    convert.add_argument('destination', help='.nonl file, .nona archive or directory')
+    convert.set_defaults(func=cmd_convert)
+
+    bench = commands.add_parser('bench', help='time loading, solving and checking puzzles')
+    bench.add_argument('paths', nargs='+', help='.non files or directories')
+    bench.add_argument('--repeat', type=_positive_int, default=5, help='runs per puzzle')
+    bench.add_argument('--search', action='store_true', help='guess and backtrack when line logic gets stuck')
+    bench.set_defaults(func=cmd_bench)
+
+    rate = commands.add_parser('rate', help='rate difficulty from solver traces')
+    rate.add_argument('paths', nargs='+', help='.non files, directories, .nonl or .nona files')
+    rate.add_argument('--write', action='store_true', help='write scores into the difficulty field (.non files, directories and .nonl files)')
+    rate.add_argument('--workers', type=int, default=0, help='worker processes, 0 rates in this process (default)')
+    rate.add_argument('--chunksize', type=int, default=64, help='puzzles sent to a worker at once')
+    rate.set_defaults(func=cmd_rate)
+    return main_parser
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Runs the command-line tool.
+
+    :param argv: Arguments without the program name, defaults to sys.argv[1:]
+    :type argv: Optional[List[str]]
+    :return: Exit status.
+    :rtype: int
+    """
+    args = parser().parse_args(argv)
+    try:
+        return args.func(args)
+    except (pyNonogram.errors.NonogramException, pyNonogram.errors.PathException,
+            pyNonogram.errors.UnknownFormat, ValueError, OSError) as e:
+        print('pynonogram: error: {}'.format(e), file=sys.stderr)
+        return 2
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,134 @@
+#Internal imports
+import pyNonogram.errors
+
+#Built-in imports
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+#largest color code of colored nonograms, codes are single digits in solution lines
+MAX_COLORS = 9
+
+class LineClues(NamedTuple):
+    """Immutable clue metadata of one row or column.
+
+    Block positions are 0-based, block i can only start between earliest[i] and latest[i].
+    colors holds the color of every block of colored lines and is empty for black and white lines.
+    """
+    clues: Tuple[int, ...]
+    length: int
+    min_span: int
+    slack: int
+    earliest: Tuple[int, ...]
+    latest: Tuple[int, ...]
+    colors: Tuple[int, ...] = ()
+
+def line_clues(hints: Sequence[int], length: int, colors: Optional[Sequence[int]] = None) -> LineClues:
+    """Returns clue metadata of a line.
+
+    A line hinted with ``0`` is an empty line, zero-length blocks are dropped. Neighbouring blocks
+    of different colors don't need an empty cell between them.
+
+    :param hints: Block lengths of the line.
+    :type hints: Sequence[int]
+    :param length: Number of cells in the line.
+    :type length: int
+    :param colors: Color (1 to MAX_COLORS) of every block of a colored line, defaults to None
+    :type colors: Optional[Sequence[int]]
+    :raises ValueError: Negative block length, invalid color or not one color per block.
+    :return: Clue metadata, slack is negative when the blocks don't fit the line.
+    :rtype: LineClues
+    """
+    if any(hint < 0 for hint in hints):
+        raise ValueError('Negative block length in {}'.format(list(hints)))
+    if colors is None:
+        colors = ()
+    else:
+        if len(colors) != len(hints):
+            raise ValueError('Expected {} block colors got {}'.format(len(hints), len(colors)))
+        if any(not 1 <= color <= MAX_COLORS for color in colors):
+            raise ValueError('Block colors must be between 1 and {} (got {})'.format(MAX_COLORS, list(colors)))
+        colors = tuple(color for hint, color in zip(hints, colors) if hint > 0)
+    clues = tuple(hint for hint in hints if hint > 0)
+    earliest = []
+    start = 0
+    for idx, clue in enumerate(clues):
+        #blocks of the same color are separated by an empty cell
+        if idx and (not colors or colors[idx] == colors[idx-1]):
+            start += 1
+        earliest.append(start)
+        start += clue
+    min_span = start
+    slack = length - min_span
+    return LineClues(clues, length, min_span, slack, tuple(earliest), tuple(start + slack for start in earliest), colors)
+
+def puzzle_clues(width: int, height: int, rows: Sequence[Sequence[int]], columns: Sequence[Sequence[int]],
+                 row_colors: Optional[Sequence[Sequence[int]]] = None,
+                 col_colors: Optional[Sequence[Sequence[int]]] = None) -> Tuple[Tuple[LineClues, ...], Tuple[LineClues, ...]]:
+    """Returns clue metadata of all rows and columns, checking that the puzzle can be solved at all.
+
+    Only checks that need no solving are done: number of lines, blocks fitting their lines and
+    equal number of filled cells (of every color) by rows and by columns.
+
+    :param width: Width of the nonogram.
+    :type width: int
+    :param height: Height of the nonogram.
+    :type height: int
+    :param rows: Row hints.
+    :type rows: Sequence[Sequence[int]]
+    :param columns: Column hints.
+    :type columns: Sequence[Sequence[int]]
+    :param row_colors: Block colors of every row of a colored nonogram, defaults to None
+    :type row_colors: Optional[Sequence[Sequence[int]]]
+    :param col_colors: Block colors of every column of a colored nonogram, defaults to None
+    :type col_colors: Optional[Sequence[Sequence[int]]]
+    :raises InvalidHints: Hints that no grid can satisfy.
+    :return: (row metadata, column metadata)
+    :rtype: Tuple[Tuple[LineClues, ...], Tuple[LineClues, ...]]
+    """
+    if len(rows) != height:
+        raise pyNonogram.errors.InvalidHints('Expected {} row hints got {}'.format(height, len(rows)))
+    if len(columns) != width:
+        raise pyNonogram.errors.InvalidHints('Expected {} column hints got {}'.format(width, len(columns)))
+    if (row_colors is None) != (col_colors is None):
+        raise pyNonogram.errors.InvalidHints('Rows and columns must both have block colors or neither')
+    colored = row_colors is not None
+    if not colored:
+        row_colors = [None]*height
+        col_colors = [None]*width
+    elif len(row_colors) != height or len(col_colors) != width:
+        raise pyNonogram.errors.InvalidHints('Expected block colors of {} rows and {} columns'.format(height, width))
+    try:
+        row_clues = tuple(line_clues(hints, width, colors) for hints, colors in zip(rows, row_colors))
+        col_clues = tuple(line_clues(hints, height, colors) for hints, colors in zip(columns, col_colors))
+    except ValueError as e:
+        raise pyNonogram.errors.InvalidHints(str(e))
+    _check_fit(row_clues, 'Row')
+    _check_fit(col_clues, 'Column')
+    row_totals = _color_totals(row_clues)
+    col_totals = _color_totals(col_clues)
+    for color in sorted(set(row_totals) | set(col_totals)):
+        if row_totals.get(color, 0) != col_totals.get(color, 0):
+            raise pyNonogram.errors.InvalidHints('Row hints fill {} cells{} but column hints fill {}'.format(
+                row_totals.get(color, 0), ' of color {}'.format(color) if colored else '', col_totals.get(color, 0)))
+    return row_clues, col_clues
+
+def _color_totals(lines: Sequence[LineClues]) -> Dict[int, int]:
+    """Returns the number of filled cells of every color, black and white lines fill color 1."""
+    totals = {}
+    for line in lines:
+        for clue, color in zip(line.clues, line.colors or (1,)*len(line.clues)):
+            totals[color] = totals.get(color, 0) + clue
+    return totals
+
+def _check_fit(lines: Sequence[LineClues], name: str) -> None:
+    """Raises InvalidHints for the first line whose blocks don't fit it."""
+    for idx, line in enumerate(lines):
+        if line.slack < 0:
+            raise pyNonogram.errors.InvalidHints('{} {} hints {} need {} cells but the line has {}'.format(
+                name, idx, list(line.clues), line.min_span, line.length))
+
+def clue_tuples(lines: Sequence[LineClues]) -> List[Tuple[int, ...]]:
+    """Returns the clue tuples of lines, as accepted by the solver.
+
+    Colored lines give (length, color) pairs.
+    """
+    return [tuple(zip(line.clues, line.colors)) if line.colors else line.clues for line in lines]
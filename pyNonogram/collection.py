@@ -0,0 +1,210 @@
+#Internal imports
+import pyNonogram.errors
+
+#Built-in imports
+import os
+import random
+from typing import Dict, Iterator, List, NamedTuple, Optional, Tuple, Union
+
+INDEX_NAME = '.nonindex'
+INDEX_VERSION = 'pynonogram-index 1'
+
+#header fields in order of appearance in a .non file
+HEADER_FIELDS = ('author', 'date', 'picture', 'difficulty', 'width', 'height')
+
+class PuzzleInfo(NamedTuple):
+    """Header data of a nonogram file.
+    """
+    path: str
+    author: str
+    date: str
+    picture: int
+    difficulty: int
+    width: int
+    height: int
+
+def read_header(path: str) -> PuzzleInfo:
+    """Reads only the header lines of a nonogram file (.non).
+
+    :param path: Path to nonogram file (.non)
+    :type path: str
+    :raises UnknownFormat: When header lines are missing or malformed.
+    :return: Header data.
+    :rtype: PuzzleInfo
+    """
+    values = []
+    with open(path, 'r') as f:
+        for field in HEADER_FIELDS:
+            key, sep, value = f.readline().rstrip('\n').partition(':')
+            if key != field or not sep:
+                raise pyNonogram.errors.UnknownFormat('Invalid file format (Expected {} line in {})'.format(field, path))
+            values.append(value)
+    try:
+        return PuzzleInfo(path, values[0], values[1], *map(int, values[2:]))
+    except ValueError:
+        raise pyNonogram.errors.UnknownFormat('Invalid file format (Non integer header value in {})'.format(path))
+
+class NonogramCollection:
+    """Directory of nonogram files (.non) indexed by their headers.
+
+    The header of every file is read once and stored in a sidecar index file in the directory.
+    The index is reused while the directory modification time does not change, so queries and
+    random picks never parse hint or solution lines.
+
+    .. note:: Editing a file in place does not change the directory modification time, call
+        :meth:`refresh` with ``force=True`` after such edits.
+
+    :param path: Path to directory with nonogram files (.non)
+    :type path: str
+    :param index_name: Name of the sidecar index file, defaults to '.nonindex'
+    :type index_name: str, optional
+    :raises PathException: Invalid path type when path is not a directory.
+    """
+    def __init__(self, path: str, index_name: Optional[str] = INDEX_NAME) -> None:
+        """Creates a new NonogramCollection object and loads or builds its index.
+        """
+        if not os.path.isdir(path):
+            raise pyNonogram.errors.PathException('Invalid path type. (Expected dir got {})'.format(path))
+        self.path = path
+        self.index_path = os.path.join(path, index_name)
+        self.entries = []
+        self.refresh()
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __iter__(self) -> Iterator[PuzzleInfo]:
+        return iter(self.entries)
+
+    def refresh(self, force: Optional[bool] = False) -> None:
+        """Brings the index up to date with the directory.
+
+        Without force the stored index is used as is when the directory modification time did not change.
+        Otherwise the directory is rescanned and only files whose modification time changed are read again.
+
+        :param force: rescan the directory even if it looks unchanged, defaults to False
+        :type force: bool, optional
+        """
+        dir_mtime = os.stat(self.path).st_mtime_ns
+        stored_mtime, stored = self._read_index()
+        if not force and stored_mtime == dir_mtime:
+            self.entries = [info for info, _ in stored.values()]
+            return
+
+        entries = []
+        files = {}
+        with os.scandir(self.path) as it:
+            for entry in it:
+                if not entry.name.endswith('.non') or not entry.is_file():
+                    continue
+                mtime = entry.stat().st_mtime_ns
+                cached = stored.get(entry.name)
+                if cached is not None and cached[1] == mtime:
+                    info = cached[0]
+                else:
+                    try:
+                        info = read_header(entry.path)
+                    except (pyNonogram.errors.UnknownFormat, UnicodeDecodeError):
+                        #files with broken headers are not part of the collection
+                        continue
+                entries.append(info)
+                files[entry.name] = (info, mtime)
+        entries.sort(key=lambda info: info.path)
+        self.entries = entries
+        self._write_index(dir_mtime, files)
+
+    def query(self, **filters: Union[int, str, Tuple[int, int]]) -> List[PuzzleInfo]:
+        """Returns puzzles whose headers match all filters.
+
+        Filters are header fields (author, date, picture, difficulty, width, height). A value matches
+        exactly, a (min, max) tuple matches an inclusive range.
+
+        :raises ValueError: Unknown filter field.
+        :return: Matching puzzles.
+        :rtype: List[PuzzleInfo]
+        """
+        for field in filters:
+            if field not in HEADER_FIELDS:
+                raise ValueError('Unknown filter {} (Expected one of {})'.format(field, ', '.join(HEADER_FIELDS)))
+        checks = []
+        for field, value in filters.items():
+            idx = PuzzleInfo._fields.index(field)
+            if isinstance(value, tuple):
+                low, high = value
+                checks.append(lambda info, idx=idx, low=low, high=high: low <= info[idx] <= high)
+            else:
+                checks.append(lambda info, idx=idx, value=value: info[idx] == value)
+        return [info for info in self.entries if all(check(info) for check in checks)]
+
+    def random(self, **filters: Union[int, str, Tuple[int, int]]) -> PuzzleInfo:
+        """Returns a random puzzle whose header matches all filters, see :meth:`query`.
+
+        :raises LoadingException: No puzzle matches the filters.
+        :return: Random matching puzzle.
+        :rtype: PuzzleInfo
+        """
+        matches = self.query(**filters) if filters else self.entries
+        if not matches:
+            raise pyNonogram.errors.LoadingException('No nonogram matches {}'.format(filters))
+        return random.choice(matches)
+
+    def load_random(self, **filters: Union[int, str, Tuple[int, int]]):
+        """Loads a random puzzle whose header matches all filters, see :meth:`query`.
+
+        :raises LoadingException: No puzzle matches the filters.
+        :return: Loaded nonogram.
+        :rtype: Nonogram
+        """
+        #imported here so header only work does not import numpy
+        import pyNonogram.nonogram
+        nonogram = pyNonogram.nonogram.Nonogram()
+        nonogram.load(self.random(**filters).path)
+        return nonogram
+
+    def _read_index(self) -> Tuple[Optional[int], Dict[str, Tuple[PuzzleInfo, int]]]:
+        """Reads the sidecar index, returns (directory mtime, {file name: (info, file mtime)})."""
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                version, _, dir_mtime = f.readline().rstrip('\n').partition('\t')
+                if version != INDEX_VERSION:
+                    return None, {}
+                stored = {}
+                for line in f:
+                    name, mtime, author, date, picture, difficulty, width, height = line.rstrip('\n').split('\t')
+                    info = PuzzleInfo(os.path.join(self.path, name), author, date,
+                                      int(picture), int(difficulty), int(width), int(height))
+                    stored[name] = (info, int(mtime))
+                return int(dir_mtime), stored
+        except (OSError, ValueError):
+            #missing or corrupted index is rebuilt
+            return None, {}
+
+    def _write_index(self, dir_mtime: int, files: Dict[str, Tuple[PuzzleInfo, int]]) -> None:
+        """Atomically writes the sidecar index.
+
+        dir_mtime is the directory modification time read before the scan. The header is only moved
+        to the time after the write when nothing but the index changed the directory, files added
+        or removed during the scan keep the old time so the next open rescans.
+        """
+        tmp_path = self.index_path + '.tmp'
+        try:
+            #the directory changed during the scan, the index is stale as soon as it is written
+            unchanged = os.stat(self.path).st_mtime_ns == dir_mtime
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write(_index_header(dir_mtime))
+                for name, (info, mtime) in sorted(files.items()):
+                    f.write('\t'.join(map(str, (name, mtime, info.author.replace('\t', ' '), info.date.replace('\t', ' '),
+                                                info.picture, info.difficulty, info.width, info.height))) + '\n')
+            os.replace(tmp_path, self.index_path)
+            #replacing the index changes the directory mtime, patch the fixed width header in place
+            new_mtime = os.stat(self.path).st_mtime_ns
+            if unchanged and new_mtime != dir_mtime:
+                with open(self.index_path, 'r+', encoding='utf-8') as f:
+                    f.write(_index_header(new_mtime))
+        except OSError:
+            #index is only a cache, read-only directories are scanned on every open
+            return
+
+def _index_header(dir_mtime: int) -> str:
+    """Returns the fixed width first line of the index file."""
+    return '{}\t{:020d}\n'.format(INDEX_VERSION, dir_mtime)
@@ -32,4 +32,18 @@ class NotSolved(NonogramException):
 class UnknownFormat(Exception):
     """Exception thrown when trying to export to a unknown format. Supported formats: .non
     """
-    pass
\ No newline at end of file
+    pass
+
+class Contradiction(NonogramException):
+    """Exception thrown when a line can't be completed with its hints.
+
+    :param lines: Lines that can't be completed as ('row', y) or ('column', x), empty when unknown.
+    """
+    def __init__(self, message='', lines=()):
+        super().__init__(message)
+        self.lines = list(lines)
+
+class InvalidHints(LoadingException):
+    """Exception thrown when hints can't be satisfied by any grid.
+    """
+    pass
@@ -0,0 +1,116 @@
+#Internal imports
+import pyNonogram.nonogram
+import pyNonogram.nonogram_grid
+import pyNonogram.solver
+import pyNonogram.stream
+import pyNonogram.archive
+import pyNonogram.errors
+
+#Built-in imports
+import os
+from typing import Iterable, Iterator, Optional
+
+#External imports
+import numpy as np
+
+def random_solution(width: int, height: int, density: Optional[float] = 0.6,
+                    rng: Optional[np.random.Generator] = None) -> np.ndarray:
+    """Returns a random solution where each cell is filled with probability density.
+
+    :param width: Width of the solution.
+    :type width: int
+    :param height: Height of the solution.
+    :type height: int
+    :param density: Probability of a cell being filled, defaults to 0.6
+    :type density: float, optional
+    :param rng: Random generator, defaults to a new unseeded one
+    :type rng: Optional[np.random.Generator]
+    :return: 2D array of 0s and 1s.
+    :rtype: np.ndarray
+    """
+    if not 0 <= density <= 1:
+        raise ValueError('Density must be between 0 and 1')
+    if rng is None:
+        rng = np.random.default_rng()
+    return (rng.random((height, width)) < density).astype(np.int8)
+
+def is_unique(nonogram, line_solvable: Optional[bool] = False) -> bool:
+    """Checks if a nonogram has exactly one solution.
+
+    Line logic alone decides most puzzles, search is only used when it gets stuck.
+
+    :param nonogram: Loaded nonogram.
+    :type nonogram: Nonogram
+    :param line_solvable: only accept puzzles line logic solves without guessing, defaults to False
+    :type line_solvable: bool, optional
+    :return: True if the nonogram has exactly one solution.
+    :rtype: bool
+    """
+    grid = pyNonogram.nonogram_grid.NonogramGrid((nonogram.height, nonogram.width))
+    try:
+        pyNonogram.solver.propagate(grid, nonogram.rows, nonogram.columns)
+    except pyNonogram.errors.Contradiction:
+        return False
+    if np.all(grid != 0):
+        return True
+    if line_solvable:
+        return False
+    return pyNonogram.solver.search(grid, nonogram.rows, nonogram.columns, limit=2) == 1
+
+def generate(width: int, height: int, count: int, density: Optional[float] = 0.6,
+             unique: Optional[bool] = True, line_solvable: Optional[bool] = False,
+             seed: Optional[int] = None, author: Optional[str] = '', date: Optional[str] = '') -> Iterator:
+    """Generates random nonograms.
+
+    :param width: Width of the nonograms.
+    :type width: int
+    :param height: Height of the nonograms.
+    :type height: int
+    :param count: Number of nonograms to generate.
+    :type count: int
+    :param density: Probability of a cell being filled, defaults to 0.6
+    :type density: float, optional
+    :param unique: only yield nonograms with exactly one solution, defaults to True
+    :type unique: bool, optional
+    :param line_solvable: only yield nonograms line logic solves without guessing, defaults to False.
+        Much faster than the uniqueness search on large or sparse grids.
+    :type line_solvable: bool, optional
+    :param seed: Seed of the random generator, defaults to None
+    :type seed: Optional[int]
+    :return: Loaded nonograms with solutions.
+    :rtype: Iterator[Nonogram]
+    """
+    rng = np.random.default_rng(seed)
+    generated = 0
+    while generated < count:
+        solution = random_solution(width, height, density, rng)
+        nonogram = pyNonogram.nonogram.Nonogram.from_solution(solution, author=author, date=date)
+        if (unique or line_solvable) and not is_unique(nonogram, line_solvable=line_solvable):
+            continue
+        generated += 1
+        yield nonogram
+
+def write_all(path: str, nonograms: Iterable) -> int:
+    """Writes nonograms in bulk.
+
+    Paths ending with .nonl are written as multi-puzzle files, paths ending with .nona as binary archives,
+    any other path is a directory that gets one nonogram file (.non) per nonogram.
+
+    :param path: Path to multi-puzzle file (.nonl), archive (.nona) or directory.
+    :type path: str
+    :param nonograms: Loaded nonograms.
+    :type nonograms: Iterable[Nonogram]
+    :return: Number of nonograms written.
+    :rtype: int
+    """
+    if path.endswith('.nonl'):
+        return pyNonogram.stream.write_nonograms(path, nonograms)
+    if path.endswith('.nona'):
+        return pyNonogram.archive.write_archive(path, nonograms)
+    os.makedirs(path, exist_ok=True)
+    count = 0
+    for nonogram in nonograms:
+        with open(os.path.join(path, '{:06d}.non'.format(count)), 'w') as f:
+            f.write('\n'.join(nonogram.to_lines()))
+        count += 1
+    return count
@@ -0,0 +1,114 @@
+#Internal imports
+import pyNonogram.errors
+import pyNonogram.line_cache
+import pyNonogram.solver
+
+#Built-in imports
+from collections import deque
+from typing import List, NamedTuple, Optional, Sequence
+
+#External imports
+import numpy as np
+
+class Hint(NamedTuple):
+    """Cell deducible from a single line.
+
+    * *x*, *y* -- coordinates of the cell
+    * *value* -- 1 (filled, or the color of a colored cell) or -1 (crossed)
+    * *line* -- 'row' or 'column', the line that forces the cell
+    * *index* -- index of that line
+    """
+    x: int
+    y: int
+    value: int
+    line: str
+    index: int
+
+class HintEngine:
+    """Line solver state kept between hints of one puzzle.
+
+    Lines whose cells did not change since they were last solved without a deduction stay settled,
+    so every call only solves lines crossing cells the player changed since the previous call.
+    A line with a deduction stays first in the queue until its cells change.
+
+    :param rows: Row clues.
+    :type rows: Sequence[Sequence[int]]
+    :param columns: Column clues.
+    :type columns: Sequence[Sequence[int]]
+    :param cache: Line solver memo, defaults to the cache shared by the process
+    :type cache: Optional[LineCache]
+    """
+    def __init__(self, rows: Sequence[Sequence[int]], columns: Sequence[Sequence[int]],
+                 cache: Optional[pyNonogram.line_cache.LineCache] = None) -> None:
+        """Creates a new HintEngine object, every line is queued by the first hint.
+        """
+        self.row_clues = [pyNonogram.solver.normalize_clues(clues) for clues in rows]
+        self.col_clues = [pyNonogram.solver.normalize_clues(clues) for clues in columns]
+        self.cache = pyNonogram.line_cache.shared_cache if cache is None else cache
+        #grid values when the last hint was computed, None before the first hint
+        self._cells = None
+        #work queue of (is_row, index), queued marks lines waiting in the queue
+        self._queue = deque()
+        self._row_queued = [False]*len(self.row_clues)
+        self._col_queued = [False]*len(self.col_clues)
+
+    def _queue_lines(self, rows: List[int], cols: List[int]) -> None:
+        """Adds lines not already waiting to the end of the queue."""
+        for y in rows:
+            if not self._row_queued[y]:
+                self._row_queued[y] = True
+                self._queue.append((True, y))
+        for x in cols:
+            if not self._col_queued[x]:
+                self._col_queued[x] = True
+                self._queue.append((False, x))
+
+    def _update(self, cells: np.ndarray) -> None:
+        """Queues lines crossing cells changed since the last call."""
+        if self._cells is None or self._cells.shape != cells.shape:
+            if cells.shape != (len(self.row_clues), len(self.col_clues)):
+                raise ValueError('Grid shape {} does not match the clues'.format(cells.shape))
+            self._cells = cells.copy()
+            self._queue_lines(range(cells.shape[0]), range(cells.shape[1]))
+            return
+        changed = cells != self._cells
+        if not changed.any():
+            return
+        self._queue_lines(np.flatnonzero(changed.any(axis=1)).tolist(), np.flatnonzero(changed.any(axis=0)).tolist())
+        np.copyto(self._cells, cells)
+
+    def next(self, grid) -> Optional[Hint]:
+        """Returns the next cell of the grid deducible from one line, without changing the grid.
+
+        :param grid: Current grid of the player.
+        :type grid: Union[NonogramGrid, BitsetGrid, np.ndarray]
+        :raises Contradiction: A line can't be completed with the cells set by the player.
+        :return: Hint, None if no single line allows a deduction.
+        :rtype: Optional[Hint]
+        """
+        cells = np.asarray(grid)
+        self._update(cells)
+        while self._queue:
+            is_row, idx = self._queue[0]
+            if is_row:
+                line = cells[idx].tolist()
+                clues = self.row_clues[idx]
+            else:
+                line = cells[:, idx].tolist()
+                clues = self.col_clues[idx]
+            result = pyNonogram.solver.solve_line_cached(clues, line, self.cache)
+            if result is None:
+                raise pyNonogram.errors.Contradiction('{} {} can not be completed'.format('Row' if is_row else 'Column', idx),
+                                                      [('row' if is_row else 'column', idx)])
+            for i in range(len(line)):
+                if line[i] != result[i]:
+                    if is_row:
+                        return Hint(i, idx, result[i], 'row', idx)
+                    return Hint(idx, i, result[i], 'column', idx)
+            #settled until one of its cells changes
+            self._queue.popleft()
+            if is_row:
+                self._row_queued[idx] = False
+            else:
+                self._col_queued[idx] = False
+        return None
@@ -0,0 +1,109 @@
+#Built-in imports
+from collections import OrderedDict
+from typing import Dict, Hashable, Optional
+
+#marks a cached line that can't be completed, None means "not cached"
+CONTRADICTION = b''
+
+class LineCache:
+    """Bounded LRU memo of line solver results.
+
+    Keys are (clue tuple, packed line state), values are packed deduced lines. One cache can be shared by
+    every nonogram solved in a process, short clues on short lines repeat across puzzles.
+
+    :param maxsize: Maximum number of cached lines, 0 disables caching, defaults to 65536
+    :type maxsize: int, optional
+    """
+    def __init__(self, maxsize: Optional[int] = 65536) -> None:
+        """Creates an empty cache.
+        """
+        if maxsize < 0:
+            raise ValueError('Maxsize must be non-negative')
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: Hashable) -> Optional[bytes]:
+        """Returns the cached value of key and marks it as recently used.
+
+        :param key: (clues, packed line)
+        :type key: Hashable
+        :return: Cached value, None when key is not cached.
+        :rtype: Optional[bytes]
+        """
+        value = self._data.get(key)
+        if value is None:
+            self.misses += 1
+            return None
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key: Hashable, value: bytes) -> None:
+        """Caches value under key, evicting the least recently used entries over maxsize.
+
+        :param key: (clues, packed line)
+        :type key: Hashable
+        :param value: Packed deduced line or CONTRADICTION.
+        :type value: bytes
+        """
+        if self.maxsize == 0:
+            return
+        self._data[key] = value
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def resize(self, maxsize: int) -> None:
+        """Changes maxsize, evicting least recently used entries if needed.
+
+        :param maxsize: Maximum number of cached lines, 0 disables caching.
+        :type maxsize: int
+        """
+        if maxsize < 0:
+            raise ValueError('Maxsize must be non-negative')
+        self.maxsize = maxsize
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self) -> None:
+        """Removes all entries and resets the counters.
+        """
+        self._data.clear()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def stats(self) -> Dict[str, float]:
+        """Returns cache counters.
+
+        :return: size, maxsize, hits, misses, evictions and hit_rate
+        :rtype: Dict[str, float]
+        """
+        lookups = self.hits + self.misses
+        return {
+            'size': len(self._data),
+            'maxsize': self.maxsize,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+        }
+
+def pack_line(line) -> bytes:
+    """Packs a line of values (0, 1 or -1) into one byte per cell."""
+    return bytes(value + 1 for value in line)
+
+def unpack_line(packed: bytes) -> list:
+    """Unpacks a line packed by :func:`pack_line`."""
+    return [value - 1 for value in packed]
+
+#cache shared by all solves in the process
+shared_cache = LineCache()
@@ -1,14 +1,28 @@
 #Internal imports
 import pyNonogram.nonogram_grid
+import pyNonogram.bitset_grid
 import pyNonogram.errors
+import pyNonogram.solver
+import pyNonogram.clues
+import pyNonogram.render
+import pyNonogram.hint
+import pyNonogram.stats
 
 #Built-in imports
 import os
-from typing import Optional, Union
+import stat
+import tempfile
+from typing import Iterable, List, Optional, Tuple, Union
 
 #External imports
 import numpy as np
 
+#grid classes by backend name
+GRID_BACKENDS = {
+    'numpy': pyNonogram.nonogram_grid.NonogramGrid,
+    'bitset': pyNonogram.bitset_grid.BitsetGrid,
+}
+
 class Nonogram:
     """Nonogram class, used to store nonogram data.
     
@@ -18,14 +32,26 @@ class Nonogram:
     :Keyword Arguments:
         * *path* (``str``) --
           Path to nonogram file (.non) or directory with nonogram files
+        * *backend* (``str``) --
+          Grid backend, 'numpy' (:class:`NonogramGrid`, default) or 'bitset' (:class:`BitsetGrid`)
+        * *stats* (``Stats``) --
+          Records counters and timings of load, check_all and solve, defaults to None (disabled)
+        * *checked* (``bool``) --
+          Grids check every set_cell move against the hints of its row and column, defaults to False
     """    
     def __init__(self, **kwargs) -> None:
         """Creates a new Nonogram object.
 
         :raises PathException: Invalid path when path is neither file nor directory.
+        :raises ValueError: Unknown grid backend.
         """        
         self.path = None
         self.path_type = None
+        self.backend = kwargs.get('backend', 'numpy')
+        self.stats = kwargs.get('stats')
+        self.checked = kwargs.get('checked', False)
+        if self.backend not in GRID_BACKENDS:
+            raise ValueError('Unknown grid backend {} (Expected one of {})'.format(self.backend, ', '.join(GRID_BACKENDS)))
         if 'path' in kwargs:
             self.path = kwargs['path']
             if os.path.isfile(self.path):
@@ -44,18 +70,49 @@ class Nonogram:
         self.height = None
         self.rows = None
         self.columns = None
+        #block colors of colored nonograms, one list per line parallel to rows and columns, None in black and white ones
+        self.row_colors = None
+        self.col_colors = None
+        #largest color code, 1 for black and white nonograms
+        self.colors = 1
         self.solution = None
+        self._solution_cells = None
+        
+        #immutable per line clue metadata, see LineClues
+        self.row_clues = None
+        self.col_clues = None
         
         self.solved = False
         self.is_loaded = False
         
         self.grid = None
         
-    def load(self, path: Optional[str] = None) -> None:
+        #flattened hints used by vectorized checks
+        self._row_hint_counts = None
+        self._row_hint_lengths = None
+        self._col_hint_counts = None
+        self._col_hint_lengths = None
+        
+        #per line solved state kept by is_solved
+        self._tracked_grid = None
+        self._rows_ok = None
+        self._cols_ok = None
+        self._unsatisfied = 0
+        
+        #renderer with hint gutters of the loaded puzzle
+        self._renderer = None
+        
+        #line solver state kept between hints
+        self._hint_engine = None
+        
+    @pyNonogram.stats.timed('load')
+    def load(self, path: Optional[str] = None, verify: Optional[bool] = False) -> None:
         """Loads a nonogram from a file.
 
         :param path: Path to nonogram file (.non)
         :type path: Optional[str]
+        :param verify: check that the stored solution satisfies the hints, defaults to False
+        :type verify: bool, optional
         :raises PathException: Invalid path when path is neither file nor directory.
         :raises PathException: When path and self.path are None.
         :raises PathException: Invalid path type when path is not a file.
@@ -83,53 +140,220 @@ class Nonogram:
         #reads file
         with open(self.path, 'r') as f:
             data = f.readlines()
+        
+        self.load_lines(data, verify)
+    
+    def load_lines(self, data: List[str], verify: Optional[bool] = False) -> None:
+        """Loads a nonogram from the lines of a nonogram record.
 
+        Used by :meth:`load` and by readers of multi-puzzle files, does not change self.path.
+
+        :param data: 9 lines of a nonogram record, with or without trailing newlines.
+        :type data: List[str]
+        :param verify: check that the stored solution satisfies the hints, defaults to False
+        :type verify: bool, optional
+        :raises UnknownFormat: Invalid file format when record does not have 9 lines.
+        :raises UnknownFormat: Solution is not width x height 0s and 1s (or color codes).
+        """
         #checks if file has 9 lines (author, date, picture, difficulty, width, height, rows, columns, solution)
         #this is the structure of a nonogram file (.non)
         if len(data) != 9:
             raise pyNonogram.errors.UnknownFormat('Invalid file format')
         
         #first line: author
-        self.author = data[0].split(':')[1].strip('\n')
+        author = data[0].split(':')[1].strip('\n')
         #second line: date
-        self.date = data[1].split(':')[1].strip('\n')
+        date = data[1].split(':')[1].strip('\n')
         #third line: picture rating
-        self.picture = int(data[2].split(':')[1].strip('\n'))
+        picture = int(data[2].split(':')[1].strip('\n'))
         #fourth line: difficulty
-        self.difficulty = int(data[3].split(':')[1].strip('\n'))
+        difficulty = int(data[3].split(':')[1].strip('\n'))
         #fifth line: width
-        self.width = int(data[4].split(':')[1].strip('\n'))
+        width = int(data[4].split(':')[1].strip('\n'))
         #sixth line: height
-        self.height = int(data[5].split(':')[1].strip('\n'))
+        height = int(data[5].split(':')[1].strip('\n'))
         
-        #seventh line: row hints
-        self.rows = data[6].split(':')[1].strip('\n').split(' ')
-        for idx in range(len(self.rows)):
-            self.rows[idx] = self.rows[idx].split(',')
-            self.rows[idx] = list(map(int, self.rows[idx]))
+        #seventh line: row hints, blocks of colored nonograms are written as length.color
+        rows, row_colors = _parse_hints(data[6].split(':')[1].strip('\n'))
         
         #eighth line: column hints
-        self.columns = data[7].split(':')[1].strip('\n').split(' ')
-        for idx in range(len(self.columns)):
-            self.columns[idx] = self.columns[idx].split(',')
-            self.columns[idx] = list(map(int, self.columns[idx]))
+        columns, col_colors = _parse_hints(data[7].split(':')[1].strip('\n'))
+        #black and white blocks of a colored nonogram have color 1
+        if row_colors is not None or col_colors is not None:
+            row_colors = row_colors or [[1]*len(hints) for hints in rows]
+            col_colors = col_colors or [[1]*len(hints) for hints in columns]
+        colors = max((color for line in row_colors + col_colors for color in line), default=1) if row_colors else 1
         #ninth line: solution
-        self.solution = data[8].split(':')[1].strip('\n')
-        self.solution = list(map(''.join, zip(*[iter(self.solution)]*self.width)))
-        for idx in range(len(self.solution)):
-            self.solution[idx] = list(map(int, self.solution[idx]))
-        #if solution is empty, set it to None
-        if len(self.solution) == 0:
+        solution = _decode_solution(data[8].split(':')[1].strip('\n'), width, height, colors)
+        
+        self.load_data(author, date, picture, difficulty, width, height, rows, columns, solution, verify,
+                       row_colors=row_colors, col_colors=col_colors)
+    
+    def load_data(self, author: str, date: str, picture: int, difficulty: int, width: int, height: int,
+                  rows: List[List[int]], columns: List[List[int]],
+                  solution: Optional[Union[List[List[int]], np.ndarray]] = None, verify: Optional[bool] = False,
+                  row_colors: Optional[List[List[int]]] = None, col_colors: Optional[List[List[int]]] = None) -> None:
+        """Loads a nonogram from already parsed values.
+
+        Used by :meth:`load_lines` and by other formats, does not change self.path.
+
+        :param rows: Row hints, from left to right.
+        :type rows: List[List[int]]
+        :param columns: Column hints, from top to bottom.
+        :type columns: List[List[int]]
+        :param solution: Rows of the solution (1 filled, or the color of the cell, 0 empty), defaults to None
+        :type solution: Optional[Union[List[List[int]], np.ndarray]]
+        :param verify: check that the solution satisfies the hints, defaults to False
+        :type verify: bool, optional
+        :param row_colors: Block colors (1 to 9) of every row of a colored nonogram, defaults to None
+        :type row_colors: Optional[List[List[int]]]
+        :param col_colors: Block colors (1 to 9) of every column of a colored nonogram, defaults to None
+        :type col_colors: Optional[List[List[int]]]
+        :raises InvalidHints: Hints that no grid can satisfy.
+        :raises ValueError: Colored nonogram with a backend other than numpy.
+        :raises LoadingException: Solution is not height x width.
+        :raises LoadingException: Solution does not satisfy the hints when verify is True.
+        """
+        #fails before anything is changed
+        row_clues, col_clues = pyNonogram.clues.puzzle_clues(width, height, rows, columns, row_colors, col_colors)
+        colored = row_colors is not None
+        if colored and self.backend != 'numpy':
+            raise ValueError('Colored nonograms need the numpy grid backend (got {})'.format(self.backend))
+        colors = max((color for line in row_clues + col_clues for color in line.colors), default=1)
+        row_hints = _flatten_hints(_hint_keys(row_clues))
+        col_hints = _flatten_hints(_hint_keys(col_clues))
+        cells = None
+        if solution is not None and len(solution) > 0:
+            try:
+                cells = np.asarray(solution, dtype=np.int8)
+            except ValueError:
+                raise pyNonogram.errors.LoadingException('Solution rows of different lengths')
+            if cells.shape != (height, width):
+                raise pyNonogram.errors.LoadingException('Solution must be {} x {} (got {})'.format(height, width, cells.shape))
+            if verify and not _solution_matches(cells, row_hints, col_hints, colored):
+                raise pyNonogram.errors.LoadingException('Solution does not satisfy the hints')
+        self.author = author
+        self.date = date
+        self.picture = picture
+        self.difficulty = difficulty
+        self.width = width
+        self.height = height
+        self.rows = rows
+        self.columns = columns
+        self.row_colors = row_colors
+        self.col_colors = col_colors
+        self.colors = colors
+        self.row_clues = row_clues
+        self.col_clues = col_clues
+        #solution is kept as rows of ints, cells is the same solution as an array
+        self._solution_cells = cells
+        if cells is None:
             self.solution = None
             self.solved = False
         else:
+            self.solution = solution if isinstance(solution, list) else cells.tolist()
             self.solved = True
         
         self.is_loaded = True
         
+        self._renderer = None
+        self._hint_engine = None
+        self._row_hint_counts, self._row_hint_lengths = row_hints
+        self._col_hint_counts, self._col_hint_lengths = col_hints
         #load grid
         self.load_grid()
     
+    @classmethod
+    def from_solution(cls, solution: np.ndarray, author: Optional[str] = '', date: Optional[str] = '',
+                      picture: Optional[int] = 0, difficulty: Optional[int] = 0) -> 'Nonogram':
+        """Creates a nonogram whose hints are derived from a solution.
+
+        All row and column hints are derived in one vectorized pass over the array. Solutions with
+        color codes above 1 give colored nonograms.
+
+        :param solution: 2D array with 1 (or a color code up to 9) for filled cells and 0 (or -1) for empty cells.
+        :type solution: np.ndarray
+        :raises ValueError: Solution is not a 2D array.
+        :return: Loaded nonogram with solution.
+        :rtype: Nonogram
+        """
+        solution = np.asarray(solution)
+        if solution.ndim != 2:
+            raise ValueError('Solution must be a 2D array')
+        height, width = solution.shape
+        if solution.size and solution.max() > 1:
+            return cls._from_color_solution(solution, author, date, picture, difficulty)
+        grid = pyNonogram.nonogram_grid.NonogramGrid((height, width))
+        grid[:] = np.where(solution == 1, 1, -1)
+        #lines without filled cells are hinted with 0
+        rows = [hints or [0] for hints in grid.all_row_segments()]
+        columns = [hints or [0] for hints in grid.all_col_segments()]
+        nonogram = cls()
+        nonogram.load_data(author, date, picture, difficulty, width, height, rows, columns,
+                           (solution == 1).astype(np.int8))
+        return nonogram
+    
+    @classmethod
+    def _from_color_solution(cls, solution: np.ndarray, author: str, date: str, picture: int, difficulty: int) -> 'Nonogram':
+        """Creates a colored nonogram whose hints are derived from a solution of color codes."""
+        height, width = solution.shape
+        #checked before the cast, larger codes would wrap around in int8
+        if (solution > pyNonogram.clues.MAX_COLORS).any():
+            raise ValueError('Colors must be between 1 and {}'.format(pyNonogram.clues.MAX_COLORS))
+        cells = np.where(solution > 0, solution, 0).astype(np.int8)
+        rows, row_colors = _color_hints(*pyNonogram.nonogram_grid._grid_color_runs(cells), height)
+        columns, col_colors = _color_hints(*pyNonogram.nonogram_grid._grid_color_runs(cells.T), width)
+        nonogram = cls()
+        nonogram.load_data(author, date, picture, difficulty, width, height, rows, columns, cells,
+                           row_colors=row_colors, col_colors=col_colors)
+        return nonogram
+    
+    def _row_tuples(self) -> List[Tuple[int, ...]]:
+        """Returns row clues without zeros, as accepted by the solver, (length, color) pairs when colored."""
+        return pyNonogram.clues.clue_tuples(self.row_clues)
+    
+    def _col_tuples(self) -> List[Tuple[int, ...]]:
+        """Returns column clues without zeros, as accepted by the solver, (length, color) pairs when colored."""
+        return pyNonogram.clues.clue_tuples(self.col_clues)
+    
+    def _row_runs(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Returns (row index, run key) of all segments of the grid, see :func:`_run_key`."""
+        if self.row_colors is None:
+            return self.grid.row_runs()
+        idx, lengths, colors = self.grid.row_color_runs()
+        return idx, _run_key(lengths, colors)
+    
+    def _col_runs(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Returns (column index, run key) of all segments of the grid, see :func:`_run_key`."""
+        if self.col_colors is None:
+            return self.grid.col_runs()
+        idx, lengths, colors = self.grid.col_color_runs()
+        return idx, _run_key(lengths, colors)
+    
+    def to_lines(self) -> List[str]:
+        """Returns the nonogram as the 9 lines of a nonogram record, without trailing newlines.
+
+        :raises NotLoaded: Nonogram not loaded.
+        :return: Lines of a nonogram record.
+        :rtype: List[str]
+        """
+        if not self.is_loaded:
+            raise pyNonogram.errors.NotLoaded('Nonogram not loaded')
+        solution = ''
+        if self.solution is not None:
+            solution = ''.join(''.join(map(str, row)) for row in self.solution)
+        return [
+            'author:{}'.format(self.author),
+            'date:{}'.format(self.date),
+            'picture:{}'.format(self.picture),
+            'difficulty:{}'.format(self.difficulty),
+            'width:{}'.format(self.width),
+            'height:{}'.format(self.height),
+            'rows:{}'.format(_format_hints(self.rows, self.row_colors)),
+            'columns:{}'.format(_format_hints(self.columns, self.col_colors)),
+            'solution:{}'.format(solution),
+        ]
+    
     def load_random(self, path: Optional[str]) -> None:
         """Loads a random nonogram from a directory.
 
@@ -138,6 +362,9 @@ class Nonogram:
         :raises PathException: Invalid path when path is neither file nor directory.
         :raises PathException: When path and self.path are None.
         :raises PathException: Invalid path type when path is not a directory.
+        :raises LoadingException: No nonogram files in directory.
+        
+        .. note:: Lists the directory on every call, use :class:`NonogramCollection` to pick from large directories.
         """        
         if path is not None:
             self.path = path
@@ -154,48 +381,63 @@ class Nonogram:
         if self.path_type != 'dir':
             raise pyNonogram.errors.PathException('Invalid path type. (Expected dir got {})'.format(self.path_type))
         
-        #gets random file from directory
-        files = os.listdir(self.path)
+        #gets random nonogram file from directory
+        files = [name for name in os.listdir(self.path) if name.endswith('.non')]
+        if not files:
+            raise pyNonogram.errors.LoadingException('No nonogram files in {}'.format(self.path))
         _file = np.random.choice(files)
         
         #loads it
         self.load(os.path.join(self.path, _file))
     
     def load_grid(self) -> None:
-        """Loads the nonogram grid object.
+        """Loads the nonogram grid object, in checked mode when self.checked is set.
 
         :raises LoadingException: Nonogram not loaded.
+        :raises ValueError: Colored nonogram with a backend other than numpy.
         """        
         if not self.is_loaded:
             raise pyNonogram.errors.LoadingException('Nonogram not loaded')
-        self.grid = pyNonogram.nonogram_grid.NonogramGrid((self.height, self.width))
+        if self.row_colors is None:
+            self.grid = GRID_BACKENDS[self.backend]((self.height, self.width))
+        elif self.backend == 'numpy':
+            self.grid = pyNonogram.nonogram_grid.NonogramGrid((self.height, self.width), colors=self.colors)
+        else:
+            raise ValueError('Colored nonograms need the numpy grid backend (got {})'.format(self.backend))
+        if self.checked:
+            self.grid.enable_checks(self._row_tuples(), self._col_tuples())
     
     def save_solution(self) -> None:
         """Saves current grid state as solution in nonogram file at self.path.
+
+        The file is rewritten atomically through a temporary file, an existing solution line is replaced.
         
         :raises PathException: When path and self.path are None.
         :raises PathException: Invalid path type when path is not a file.
         :raises NotSolved: Nonogram is not solved.
         """
+        solution = self._solution_to_save()
+        _replace_field_line(self.path, 'solution', _solution_string(solution))
+        self._store_solution(solution)
+
+    def _solution_to_save(self) -> np.ndarray:
+        """Returns the grid as solution array, checking that it can be saved at self.path."""
         if self.path is None:
             raise pyNonogram.errors.PathException('Path not specified')
 
         if self.path_type != 'file':
             raise pyNonogram.errors.PathException('Invalid path type. (Expected file got {})'.format(self.path_type))
-        #iterate over grid and save solution
-        self.solution = ""
-        for y in range(self.height):
-            for x in range(self.width):
-                if self.grid.get_cell(x,y) == 0:
-                    raise pyNonogram.errors.NotSolved('Nonogram is not solved')
-                elif self.grid.get_cell(x,y) == 1:
-                    self.solution += "1"
-                elif self.grid.get_cell(x,y) == -1:
-                    self.solution += "0"
-        if self.solved == False:
-            self.solved = True
-            with open(self.path, 'a') as f:
-                f.write(f"{self.solution}")
+        cells = np.asarray(self.grid)
+        if np.any(cells == 0):
+            raise pyNonogram.errors.NotSolved('Nonogram is not solved')
+        #filled cells keep their color, 1 in black and white nonograms
+        return np.maximum(cells, 0).astype(np.int8)
+
+    def _store_solution(self, solution: np.ndarray) -> None:
+        """Keeps a saved solution array as the solution of the nonogram."""
+        self._solution_cells = solution
+        self.solution = self._solution_cells.tolist()
+        self.solved = True
     
     def load_solution(self) -> None:
         """Loads solution from nonogram file at self.path.
@@ -207,13 +449,27 @@ class Nonogram:
             raise pyNonogram.errors.NotLoaded('Nonogram not loaded')
         if self.solution is None or self.solved == False:
             raise pyNonogram.errors.NotSolved('Nonogram has no solution')
-        #iterate over solution and load it into grid
-        for y in range(self.height):
-            for x in range(self.width):
-                if self.solution[y][x] == 1:
-                    self.grid.set_cell(x, y, 1)
-                elif self.solution[y][x] == 0:
-                    self.grid.set_cell(x, y, -1)
+        if self.grid is None:
+            self.load_grid()
+        #masked writes keep dirty tracking and undo journal of the grid working, one per color
+        for color in range(1, self.colors+1):
+            self.grid.apply_mask(self._solution_cells == color, color, overwrite=True)
+        self.grid.apply_mask(self._solution_cells == 0, -1, overwrite=True)
+    
+    def check_solution(self) -> bool:
+        """Checks if the stored solution satisfies the row and column hints, without touching the grid.
+
+        :raises NotLoaded: Nonogram not loaded.
+        :raises NotSolved: Nonogram has no solution.
+        :return: True if the solution satisfies all hints, False otherwise.
+        :rtype: bool
+        """
+        if not self.is_loaded:
+            raise pyNonogram.errors.NotLoaded('Nonogram not loaded')
+        if self._solution_cells is None:
+            raise pyNonogram.errors.NotSolved('Nonogram has no solution')
+        return _solution_matches(self._solution_cells, (self._row_hint_counts, self._row_hint_lengths),
+                                 (self._col_hint_counts, self._col_hint_lengths), self.row_colors is not None)
     
     def check_row(self, y: int) -> bool:
         """Checks if a row is solved.
@@ -223,15 +479,12 @@ class Nonogram:
         :return: True if row is solved, False otherwise.
         :rtype: bool
         """        
+        line = self.row_clues[y]
+        if self.row_colors is not None:
+            return tuple(self.grid.get_row_color_segments(y)) == tuple(zip(line.clues, line.colors))
         segments = self.grid.get_row_segments(y)
-        #if number of segments is not equal to number of hints, row is not solved
-        if len(segments) != len(self.rows[y]):
-            return False
-        #if all segments are equal to their corresponding hint, row is solved
-        if np.all(segments == self.rows[y]):
-            return True
-        #otherwise row is not solved
-        return False
+        #row is solved when its segments are exactly its hints (a 0 hint means no segments)
+        return tuple(segments) == line.clues
     
     def check_col(self, x: int) -> bool:
         """Checks if a column is solved.
@@ -241,81 +494,370 @@ class Nonogram:
         :return: True if column is solved, False otherwise.
         :rtype: bool
         """        
+        line = self.col_clues[x]
+        if self.col_colors is not None:
+            return tuple(self.grid.get_col_color_segments(x)) == tuple(zip(line.clues, line.colors))
         segments = self.grid.get_col_segments(x)
-        if len(segments) != len(self.columns[x]):
-            return False
-        if np.all(segments == self.columns[x]):
-            return True
-        return False
+        return tuple(segments) == line.clues
     
+    @pyNonogram.stats.timed('check_all')
     def check_all(self) -> bool:
         """Checks if all rows and columns are solved.
 
         :return: True if all rows and columns are solved, False otherwise.
         :rtype: bool
         """
-        #if any row or column is not solved, nonogram is not solved
-        for y in range(self.height):
-            res = self.check_row(y)
-            if not res:
-                return False
-        for x in range(self.width):
-            res = self.check_col(x)
-            if not res:
-                return False
-        return True
+        #segments of the whole grid are compared with flattened hints in a few array passes
+        row_idx, row_lengths = self._row_runs()
+        if not _runs_match(row_idx, row_lengths, self._row_hint_counts, self._row_hint_lengths):
+            return False
+        col_idx, col_lengths = self._col_runs()
+        return _runs_match(col_idx, col_lengths, self._col_hint_counts, self._col_hint_lengths)
     
     def is_solved(self) -> bool:
         """Is nonogram solved.
 
+        Keeps the solved state of every row and column between calls and only rechecks
+        lines the grid reports as changed since the last call.
+
         :return: True if nonogram is solved, False otherwise.
         :rtype: bool
         """        
-        return self.check_all()
+        dirty_rows, dirty_cols = self.grid.pop_dirty()
+        #new grid or most lines changed, check every line in one vectorized pass
+        if self._tracked_grid is not self.grid or 4*(len(dirty_rows)+len(dirty_cols)) > self.height+self.width:
+            self._rows_ok = _line_status(*self._row_runs(), self._row_hint_counts, self._row_hint_lengths)
+            self._cols_ok = _line_status(*self._col_runs(), self._col_hint_counts, self._col_hint_lengths)
+            self._unsatisfied = int(self.height - self._rows_ok.sum() + self.width - self._cols_ok.sum())
+            self._tracked_grid = self.grid
+            return self._unsatisfied == 0
+        
+        for y in dirty_rows:
+            ok = self.check_row(y)
+            if ok != self._rows_ok[y]:
+                self._rows_ok[y] = ok
+                self._unsatisfied += -1 if ok else 1
+        for x in dirty_cols:
+            ok = self.check_col(x)
+            if ok != self._cols_ok[x]:
+                self._cols_ok[x] = ok
+                self._unsatisfied += -1 if ok else 1
+        return self._unsatisfied == 0
+
+    @pyNonogram.stats.timed('solve')
+    def solve(self, search: Optional[bool] = False) -> bool:
+        """Solves the nonogram in place with line logic.
+
+        Deductions are written to self.grid, cells that can't be deduced by line logic stay 0
+        unless search is enabled.
+
+        :param search: guess and backtrack when line logic gets stuck, defaults to False
+        :type search: bool, optional
+        :raises NotLoaded: Nonogram not loaded.
+        :raises Contradiction: Grid can't be completed with the hints.
+        :return: True if the grid was fully solved, False otherwise.
+        :rtype: bool
+        """
+        if not self.is_loaded:
+            raise pyNonogram.errors.NotLoaded('Nonogram not loaded')
+        if self.grid is None:
+            self.load_grid()
+        pyNonogram.solver.propagate(self.grid, self._row_tuples(), self._col_tuples(), stats=self.stats)
+        self.grid.mark_dirty()
+        if search and np.any(np.asarray(self.grid) == 0):
+            #search works on array indexing, other backends search on an array copy
+            grid = self.grid
+            if not isinstance(grid, pyNonogram.nonogram_grid.NonogramGrid):
+                grid = pyNonogram.nonogram_grid.NonogramGrid((self.height, self.width))
+                grid[:] = np.asarray(self.grid)
+            solutions = []
+            if pyNonogram.solver.search(grid, self._row_tuples(), self._col_tuples(), limit=1, solutions=solutions,
+                                        stats=self.stats) == 0:
+                raise pyNonogram.errors.Contradiction('Nonogram has no solution')
+            for y in range(self.height):
+                self.grid.set_row(y, solutions[0][y])
+        return bool(np.all(np.asarray(self.grid) != 0))
+    
+    def hint(self) -> Optional['pyNonogram.hint.Hint']:
+        """Returns the next cell deducible from one row or column of self.grid, without changing the grid.
+
+        Solver state is kept between calls, only lines crossing cells changed since the previous
+        hint are solved again. Hints follow from the cells already set, including wrong ones.
+
+        :raises NotLoaded: Nonogram not loaded.
+        :raises Contradiction: A line can't be completed with the cells already set.
+        :return: Hint with the cell, its value and the line forcing it, None if no line allows a deduction.
+        :rtype: Optional[Hint]
+        """
+        if not self.is_loaded:
+            raise pyNonogram.errors.NotLoaded('Nonogram not loaded')
+        if self.grid is None:
+            self.load_grid()
+        if self._hint_engine is None:
+            self._hint_engine = pyNonogram.hint.HintEngine(self._row_tuples(), self._col_tuples())
+        return self._hint_engine.next(self.grid)
+
+    def count_solutions(self, limit: Optional[int] = 2) -> int:
+        """Counts solutions of the nonogram hints, ignoring the current grid state.
+
+        With the default limit this checks if the nonogram has exactly one solution and
+        stops as soon as a second one is found. See :func:`pyNonogram.solver.search` for the
+        puzzles that still take long.
+
+        :param limit: Stop after this many solutions, None counts all solutions, defaults to 2
+        :type limit: int, optional
+        :raises NotLoaded: Nonogram not loaded.
+        :raises ValueError: Limit below 1.
+        :return: Number of solutions, at most limit.
+        :rtype: int
+        """
+        if not self.is_loaded:
+            raise pyNonogram.errors.NotLoaded('Nonogram not loaded')
+        grid = pyNonogram.nonogram_grid.NonogramGrid((self.height, self.width), colors=self.colors)
+        return pyNonogram.solver.search(grid, self._row_tuples(), self._col_tuples(), limit=limit)
 
     def print(self) -> None:
         """Prints the nonogram to the console.
 
         :raises NotLoaded: Nonogram not loaded.
         """        
+        print(self.renderer().frame())
+    
+    def renderer(self) -> 'pyNonogram.render.Renderer':
+        """Returns the renderer of the nonogram, hint gutters are computed once per loaded puzzle.
+
+        :raises NotLoaded: Nonogram not loaded.
+        :return: Renderer drawing self.grid.
+        :rtype: Renderer
+        """
+        if not self.is_loaded:
+            raise pyNonogram.errors.NotLoaded('Nonogram not loaded')
+        if self._renderer is None:
+            self._renderer = pyNonogram.render.Renderer(self)
+        return self._renderer
+    
+    def save_image(self, path: str, scale: Optional[int] = 1) -> None:
+        """Saves the current grid as a PGM (.pgm) or PPM (.ppm) image.
+
+        :param path: Path to image file.
+        :type path: str
+        :param scale: Pixels per cell side, defaults to 1
+        :type scale: int, optional
+        :raises NotLoaded: Nonogram not loaded.
+        :raises UnknownFormat: Path does not end with .pgm or .ppm
+        """
         if not self.is_loaded:
             raise pyNonogram.errors.NotLoaded('Nonogram not loaded')
         if self.grid is None:
             self.load_grid()
-        
-        #get max row and column length
-        max_row_len = max(list(map(len, self.rows)))
-        max_col_len = max(list(map(len, self.columns)))
-        
-        #get spacing between columns
-        col_space = len(str(np.max(list(map(np.max, self.columns)))))+1
-            
-        for i in range(max_col_len):
-            #print empty space in left upper corner
-            print('   '*max_row_len, end='')
-            
-            #print column hints
-            i = max_col_len - i - 1
-            col_str = ''
-            for x in range(self.width):
-                if i < len(self.columns[x]):
-                    col_str += str(self.columns[x][i]).rjust(col_space)
-                else:
-                    col_str += ' '*col_space
-            print(col_str)
-        
-        for y in range(self.height):
-            #print row hints
-            strs = list(map(lambda num: str(num).rjust(2), self.rows[y]))
-            while len(strs) < max_row_len:
-                strs.insert(0, '  ')
-            print(' '.join(strs), end=' ')
-            
-            #print board
-            row = self.grid.get_row(y)
-            row_str = ''.join(map(str, row))
-            row_str = row_str.replace('0', ' '*col_space)
-            row_str = row_str.replace('-1', '-'*col_space)
-            row_str = row_str.replace('1', u'\u2588'*col_space)
-            
-            print(row_str)
\ No newline at end of file
+        pyNonogram.render.write_image(path, self.grid, scale)
+
+def save_solutions(nonograms: Iterable[Nonogram], sync: Optional[bool] = True) -> int:
+    """Saves the grids of many solved nonograms as solutions in their files, see :meth:`Nonogram.save_solution`.
+
+    All files are written to temporary files first. They are then synced to disk together and renamed over
+    the originals, with one sync per directory for the renames, instead of a write, sync and rename per file.
+    Nothing is saved when a nonogram can not be saved.
+
+    :param nonograms: Solved nonograms loaded from files.
+    :type nonograms: Iterable[Nonogram]
+    :param sync: Sync files and directories to disk, defaults to True. Without it a crash can lose saved
+        solutions, but never leaves a partly written file.
+    :type sync: bool, optional
+    :raises NotSolved: A nonogram is not solved.
+    :raises PathException: A nonogram was not loaded from a file.
+    :return: Number of saved nonograms.
+    :rtype: int
+    """
+    written = []
+    try:
+        for nonogram in nonograms:
+            solution = nonogram._solution_to_save()
+            lines = _field_lines(nonogram.path, 'solution', _solution_string(solution))
+            written.append((nonogram, solution, _write_temporary(nonogram.path, lines)))
+        if sync:
+            #the kernel writes files back while later ones are written, most are on disk by now
+            for _, _, tmp_path in written:
+                _fsync_path(tmp_path)
+    except BaseException:
+        for _, _, tmp_path in written:
+            os.unlink(tmp_path)
+        raise
+    directories = set()
+    for idx, (nonogram, solution, tmp_path) in enumerate(written):
+        try:
+            _replace_temporary(tmp_path, nonogram.path)
+        except BaseException:
+            for _, _, rest in written[idx:]:
+                os.unlink(rest)
+            raise
+        nonogram._store_solution(solution)
+        directories.add(os.path.dirname(os.path.abspath(nonogram.path)))
+    if sync:
+        for directory in directories:
+            _fsync_directory(directory)
+    return len(written)
+
+def _solution_string(solution: np.ndarray) -> str:
+    """Returns a solution array (boolean or color codes) as the digits of a solution line."""
+    return (solution.astype(np.uint8) + ord('0')).tobytes().decode('ascii')
+
+def _field_lines(path: str, field: str, value: str) -> List[str]:
+    """Returns the lines of a nonogram file with the field line (e.g. solution) replaced, appended when missing."""
+    with open(path, 'r') as f:
+        lines = f.readlines()
+    prefix = field + ':'
+    for idx, line in enumerate(lines):
+        if line.startswith(prefix):
+            lines[idx] = '{}{}{}'.format(prefix, value, '\n' if line.endswith('\n') else '')
+            break
+    else:
+        if lines and not lines[-1].endswith('\n'):
+            lines[-1] += '\n'
+        lines.append(prefix + value)
+    return lines
+
+def _write_temporary(path: str, lines: List[str]) -> str:
+    """Writes lines to a new temporary file next to path and returns its path."""
+    #the temporary file is in the same directory, so the rename never crosses file systems
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w') as f:
+            f.writelines(lines)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+    return tmp_path
+
+def _replace_temporary(tmp_path: str, path: str) -> None:
+    """Renames a temporary file from :func:`_write_temporary` over path, keeping the permissions of path."""
+    os.chmod(tmp_path, stat.S_IMODE(os.stat(path).st_mode))
+    os.replace(tmp_path, path)
+
+def _fsync_path(path: str) -> None:
+    """Syncs a written file to disk, data must be on disk before a rename or a crash can leave an empty file."""
+    fd = os.open(path, os.O_RDWR)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+def _fsync_directory(directory: str) -> None:
+    """Syncs renames in a directory to disk, directories can not be opened on Windows."""
+    if os.name != 'posix':
+        return
+    fd = os.open(directory, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+def _replace_field_line(path: str, field: str, value: str) -> None:
+    """Atomically rewrites the field line (e.g. solution) of a nonogram file, appending it when missing."""
+    tmp_path = _write_temporary(path, _field_lines(path, field, value))
+    try:
+        _fsync_path(tmp_path)
+        _replace_temporary(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+    _fsync_directory(os.path.dirname(os.path.abspath(path)))
+
+def _decode_solution(solution: str, width: int, height: int, colors: Optional[int] = 1) -> Optional[np.ndarray]:
+    """Decodes the digits (0 to colors) of a solution line into a height x width int8 array, None if empty."""
+    digits = '0s and 1s' if colors == 1 else 'digits from 0 to {}'.format(colors)
+    if not solution:
+        return None
+    try:
+        cells = np.frombuffer(solution.encode('ascii'), dtype=np.int8) - ord('0')
+    except UnicodeEncodeError:
+        raise pyNonogram.errors.UnknownFormat('Invalid file format (Solution must be {})'.format(digits))
+    if len(cells) != width*height or np.any((cells < 0) | (cells > colors)):
+        raise pyNonogram.errors.UnknownFormat('Invalid file format (Solution must be {} {})'.format(width*height, digits))
+    return cells.reshape(height, width)
+
+def _parse_hints(text: str) -> Tuple[List[List[int]], Optional[List[List[int]]]]:
+    """Parses the hints of a rows or columns line into (hints, colors), colors is None unless a block is written as length.color."""
+    hints = []
+    colors = []
+    colored = False
+    for line in text.split(' '):
+        line_hints = []
+        line_colors = []
+        for token in line.split(','):
+            length, _, color = token.partition('.')
+            line_hints.append(int(length))
+            line_colors.append(int(color) if color else 1)
+            colored = colored or bool(color)
+        hints.append(line_hints)
+        colors.append(line_colors)
+    return hints, colors if colored else None
+
+def _format_hints(hints: List[List[int]], colors: Optional[List[List[int]]]) -> str:
+    """Formats hints as a rows or columns line, blocks of colored nonograms as length.color."""
+    if colors is None:
+        return ' '.join(','.join(map(str, line)) for line in hints)
+    return ' '.join(','.join('{}.{}'.format(hint, color) if hint else '0' for hint, color in zip(line, line_colors))
+                    for line, line_colors in zip(hints, colors))
+
+def _color_hints(idx: np.ndarray, lengths: np.ndarray, colors: np.ndarray, lines: int) -> Tuple[List[List[int]], List[List[int]]]:
+    """Groups flat colored runs into hints and block colors per line, lines without runs are hinted with 0."""
+    hints = [[] for _ in range(lines)]
+    block_colors = [[] for _ in range(lines)]
+    for line, length, color in zip(idx.tolist(), lengths.tolist(), colors.tolist()):
+        hints[line].append(length)
+        block_colors[line].append(color)
+    for line in range(lines):
+        if not hints[line]:
+            hints[line] = [0]
+            block_colors[line] = [1]
+    return hints, block_colors
+
+#run keys of colored nonograms, length*COLOR_KEY + color, COLOR_KEY is above every color code
+COLOR_KEY = 16
+
+def _run_key(lengths: np.ndarray, colors: np.ndarray) -> np.ndarray:
+    """Returns one comparable key per colored run, so colored runs are checked like black and white ones."""
+    return lengths.astype(np.int64)*COLOR_KEY + colors
+
+def _hint_keys(lines: List['pyNonogram.clues.LineClues']) -> List[Tuple[int, ...]]:
+    """Returns the clues of every line, as run keys for colored lines, see :func:`_run_key`."""
+    return [tuple(clue*COLOR_KEY + color for clue, color in zip(line.clues, line.colors)) if line.colors else line.clues
+            for line in lines]
+
+def _solution_matches(cells: np.ndarray, row_hints: Tuple[np.ndarray, np.ndarray],
+                      col_hints: Tuple[np.ndarray, np.ndarray], colored: Optional[bool] = False) -> bool:
+    """Checks if a solution array of 0s and 1s (or color codes when colored) satisfies flattened row and column hints."""
+    if colored:
+        row_idx, lengths, colors = pyNonogram.nonogram_grid._grid_color_runs(cells)
+        if not _runs_match(row_idx, _run_key(lengths, colors), *row_hints):
+            return False
+        col_idx, lengths, colors = pyNonogram.nonogram_grid._grid_color_runs(cells.T)
+        return _runs_match(col_idx, _run_key(lengths, colors), *col_hints)
+    if not _runs_match(*pyNonogram.nonogram_grid._grid_runs(cells), *row_hints):
+        return False
+    return _runs_match(*pyNonogram.nonogram_grid._grid_runs(cells.T), *col_hints)
+
+def _flatten_hints(hints: List[Tuple[int, ...]]) -> Tuple[np.ndarray, np.ndarray]:
+    """Returns number of segments per line and all segment lengths in one array, hints must not contain zeros."""
+    counts = np.fromiter(map(len, hints), dtype=np.int64, count=len(hints))
+    lengths = np.fromiter((hint for line in hints for hint in line), dtype=np.int64, count=int(counts.sum()))
+    return counts, lengths
+
+def _runs_match(idx: np.ndarray, lengths: np.ndarray, counts: np.ndarray, hint_lengths: np.ndarray) -> bool:
+    """Checks if segments from NonogramGrid.row_runs or col_runs match flattened hints."""
+    if len(lengths) != len(hint_lengths):
+        return False
+    if not np.array_equal(lengths, hint_lengths):
+        return False
+    return np.array_equal(np.bincount(idx, minlength=len(counts)), counts)
+
+def _line_status(idx: np.ndarray, lengths: np.ndarray, counts: np.ndarray, hint_lengths: np.ndarray) -> np.ndarray:
+    """Returns for every line if its segments match its flattened hints."""
+    lines = len(counts)
+    ok = np.bincount(idx, minlength=lines) == counts
+    #lines with the right number of segments line up segment by segment with their hints
+    hint_idx = np.repeat(np.arange(lines), counts)
+    wrong = lengths[ok[idx]] != hint_lengths[ok[hint_idx]]
+    ok[np.unique(idx[ok[idx]][wrong])] = False
+    return ok
\ No newline at end of file
@@ -1,5 +1,9 @@
+#Internal imports
+import pyNonogram.clues
+import pyNonogram.solver
+
 #Built-in imports
-from typing import Tuple, List, Optional
+from typing import Iterable, Sequence, Tuple, List, Optional, Set
 
 #External imports
 import numpy as np
@@ -7,6 +11,9 @@ import numpy as np
 class NonogramGrid(np.ndarray):
     """NonogramGrid class, used to store nonogram grid data.
 
+    Cells are 0 (unknown), -1 (crossed) or 1 (filled). Grids of colored nonograms hold the color
+    code (1 to colors) of filled cells instead of 1.
+
     .. note:: Inherits from :class:`numpy.ndarray`
     """    
     def __new__(cls, *args, **kwargs) -> np.ndarray:
@@ -15,20 +22,95 @@ class NonogramGrid(np.ndarray):
         :return: Returns 2D array of type np.int8
         :rtype: np.ndarray
         """
+        colors = kwargs.pop('colors', 1)
+        if not 1 <= colors <= pyNonogram.clues.MAX_COLORS:
+            raise ValueError('Colors must be between 1 and {}'.format(pyNonogram.clues.MAX_COLORS))
         #set dtype to np.int8
         kwargs['dtype'] = np.int8
-        return super().__new__(cls, *args, **kwargs)
+        obj = super().__new__(cls, *args, **kwargs)
+        obj.colors = colors
+        return obj
     
     def __init__(self, shape: Tuple[int, int], *args, **kwargs) -> None:
         """Creates a new NonogramGrid object.
 
         :param shape: (height, width)
         :type shape: Tuple[int, int]
+        :param colors: Number of colors, cells take values -1 to colors, defaults to 1
+        :type colors: int, optional
         """        
         args = (shape, *args)
         #initialize with zeros
         self.fill(0)
     
+    def __array_finalize__(self, obj) -> None:
+        """Initializes dirty line tracking for new arrays and views.
+        """
+        #views keep the colors of their base grid
+        self.colors = getattr(obj, 'colors', 1)
+        #rows and columns written since the last pop_dirty call
+        self.dirty_rows = set()
+        self.dirty_cols = set()
+        #undo journal of (flat indices, old values) and (id, journal length) of open checkpoints,
+        #None while no checkpoint is open so writes don't pay for it
+        self._journal = None
+        self._checkpoints = []
+        #ids are never reused, so ids of closed checkpoints stay invalid
+        self._next_checkpoint = 0
+        #(row clues, column clues) checked by set_cell, None while checked mode is off
+        self._check_clues = None
+    
+    def enable_checks(self, rows: Sequence[Sequence[int]], columns: Sequence[Sequence[int]]) -> None:
+        """Turns on checked mode, set_cell then tests if the row and column of the written cell can still be completed.
+
+        Only set_cell is checked, bulk writes are not.
+
+        :param rows: Row clues.
+        :type rows: Sequence[Sequence[int]]
+        :param columns: Column clues.
+        :type columns: Sequence[Sequence[int]]
+        :raises ValueError: Number of clues does not match the grid shape.
+        """
+        if len(rows) != self.shape[0] or len(columns) != self.shape[1]:
+            raise ValueError('Clues for {}x{} lines do not match the grid shape {}'.format(len(rows), len(columns), self.shape))
+        self._check_clues = ([pyNonogram.solver.normalize_clues(clues) for clues in rows],
+                             [pyNonogram.solver.normalize_clues(clues) for clues in columns])
+    
+    def disable_checks(self) -> None:
+        """Turns off checked mode.
+        """
+        self._check_clues = None
+    
+    def mark_dirty(self, rows: Optional[Iterable[int]] = None, cols: Optional[Iterable[int]] = None) -> None:
+        """Marks rows and columns as changed.
+
+        Writes that bypass the set_ and fill_ methods (e.g. numpy indexing) should be reported here.
+        When called without arguments all rows and columns are marked.
+
+        :param rows: y coordinates of changed rows, defaults to None
+        :type rows: Optional[Iterable[int]]
+        :param cols: x coordinates of changed columns, defaults to None
+        :type cols: Optional[Iterable[int]]
+        """
+        if rows is None and cols is None:
+            rows = range(self.shape[0])
+            cols = range(self.shape[1])
+        if rows is not None:
+            self.dirty_rows.update(rows)
+        if cols is not None:
+            self.dirty_cols.update(cols)
+    
+    def pop_dirty(self) -> Tuple[Set[int], Set[int]]:
+        """Returns rows and columns changed since the last call and clears them.
+
+        :return: (dirty rows, dirty columns)
+        :rtype: Tuple[Set[int], Set[int]]
+        """
+        rows, cols = self.dirty_rows, self.dirty_cols
+        self.dirty_rows = set()
+        self.dirty_cols = set()
+        return rows, cols
+    
     def set_cell(self, x: int, y: int, value: int) -> None:
         """Sets a cell value.
 
@@ -38,11 +120,22 @@ class NonogramGrid(np.ndarray):
         :type y: int
         :param value: value to set (0, 1 or -1)
         :type value: int
+        :raises Contradiction: In checked mode, when the row or column of the cell can't be completed anymore.
+            The cell is written anyway, lines that can't be completed are listed in the lines attribute.
         """
         #Swappped x and y because of numpy array indexing, y is row, x is column. Holds for all methods.
-        if value not in [-1,0,1]:
-            raise ValueError('Value must be -1, 0 or 1')
-        self[y,x] = value
+        if value not in range(-1, self.colors+1):
+            raise ValueError(_value_message(self.colors))
+        if self._journal is not None:
+            old = self[y,x]
+            self[y,x] = value
+            self._record((y % self.shape[0])*self.shape[1] + x % self.shape[1], old)
+        else:
+            self[y,x] = value
+        self.dirty_rows.add(y)
+        self.dirty_cols.add(x)
+        if self._check_clues is not None:
+            pyNonogram.solver.check_cell_lines(self, *self._check_clues, x, y)
     
     def get_cell(self, x: int, y: int) -> int:
         """Returns a cell value.
@@ -76,6 +169,44 @@ class NonogramGrid(np.ndarray):
         """        
         return self[:,x]
     
+    def set_row(self, y: int, values: np.ndarray) -> None:
+        """Sets all cell values in a row with a single array write.
+
+        :param y: y coordinate of row
+        :type y: int
+        :param values: values to set (0, 1 or -1), one per column
+        :type values: np.ndarray
+        :raises ValueError: Wrong number of values or values other than 0, 1 and -1.
+        """
+        values = _checked_values(values, self.colors)
+        if values.shape != (self.shape[1],):
+            raise ValueError('Row must have {} values'.format(self.shape[1]))
+        changed = np.flatnonzero(self[y] != values)
+        self._record_row(y, changed)
+        self[y] = values
+        if len(changed):
+            self.dirty_rows.add(y)
+            self.dirty_cols.update(changed.tolist())
+    
+    def set_col(self, x: int, values: np.ndarray) -> None:
+        """Sets all cell values in a column with a single array write.
+
+        :param x: x coordinate of column
+        :type x: int
+        :param values: values to set (0, 1 or -1), one per row
+        :type values: np.ndarray
+        :raises ValueError: Wrong number of values or values other than 0, 1 and -1.
+        """
+        values = _checked_values(values, self.colors)
+        if values.shape != (self.shape[0],):
+            raise ValueError('Column must have {} values'.format(self.shape[0]))
+        changed = np.flatnonzero(self[:,x] != values)
+        self._record_col(x, changed)
+        self[:,x] = values
+        if len(changed):
+            self.dirty_cols.add(x)
+            self.dirty_rows.update(changed.tolist())
+    
     def fill_row(self, y: int, value: int, with_overwritting: Optional[bool] = True) -> None:
         """Fills a row with a value.
 
@@ -86,9 +217,17 @@ class NonogramGrid(np.ndarray):
         :param with_overwritting: decides if existing non-zero values should be overwritten, defaults to True
         :type with_overwritting: bool, optional
         """        
-        for x in range(self.shape[1]):
-            if with_overwritting or self[y,x] == 0:
-                self.set_cell(x, y, value)
+        _checked_values(value, self.colors)
+        row = self[y]
+        if with_overwritting:
+            changed = np.flatnonzero(row != value)
+        else:
+            changed = np.flatnonzero(row == 0)
+        self._record_row(y, changed)
+        row[changed] = value
+        if len(changed):
+            self.dirty_rows.add(y)
+            self.dirty_cols.update(changed.tolist())
     
     def fill_col(self, x: int, value: int, with_overwritting: Optional[bool] = True) -> None:
         """Fills a column with a value.
@@ -100,9 +239,165 @@ class NonogramGrid(np.ndarray):
         :param with_overwritting: decides if existing non-zero values should be overwritten, defaults to True
         :type with_overwritting: bool, optional
         """        
-        for y in range(self.shape[0]):
-            if with_overwritting or self[y,x] == 0:
-                self.set_cell(x, y, value)
+        _checked_values(value, self.colors)
+        col = self[:,x]
+        if with_overwritting:
+            changed = np.flatnonzero(col != value)
+        else:
+            changed = np.flatnonzero(col == 0)
+        self._record_col(x, changed)
+        col[changed] = value
+        if len(changed):
+            self.dirty_cols.add(x)
+            self.dirty_rows.update(changed.tolist())
+    
+    def set_cells(self, xs: Iterable[int], ys: Iterable[int], values) -> None:
+        """Sets many cells with a single array write.
+
+        :param xs: x coordinates
+        :type xs: Iterable[int]
+        :param ys: y coordinates, one per x coordinate
+        :type ys: Iterable[int]
+        :param values: value to set (0, 1 or -1), one for all cells or one per cell
+        :type values: Union[int, Iterable[int]]
+        :raises ValueError: Coordinates and values of different lengths or values other than 0, 1 and -1.
+        :raises IndexError: Coordinates out of the grid.
+        """
+        xs = _checked_indices(xs, self.shape[1])
+        ys = _checked_indices(ys, self.shape[0])
+        values = _checked_values(values, self.colors)
+        if xs.shape != ys.shape or (values.ndim and values.shape != xs.shape):
+            raise ValueError('Coordinates and values must have the same length')
+        if self._journal is not None:
+            self._record(ys*self.shape[1] + xs, np.array(self[ys, xs]))
+        self[ys, xs] = values
+        self.dirty_rows.update(ys.tolist())
+        self.dirty_cols.update(xs.tolist())
+    
+    def fill_rect(self, x: int, y: int, width: int, height: int, value: int,
+                  with_overwritting: Optional[bool] = True) -> None:
+        """Fills a rectangle with a value.
+
+        :param x: x coordinate of the left column
+        :type x: int
+        :param y: y coordinate of the top row
+        :type y: int
+        :param width: number of columns
+        :type width: int
+        :param height: number of rows
+        :type height: int
+        :param value: value to fill with (0, 1 or -1)
+        :type value: int
+        :param with_overwritting: decides if existing non-zero values should be overwritten, defaults to True
+        :type with_overwritting: bool, optional
+        :raises ValueError: Value other than 0, 1 and -1.
+        :raises IndexError: Rectangle not inside the grid.
+        """
+        _checked_values(value, self.colors)
+        if width < 0 or height < 0 or x < 0 or y < 0 or x+width > self.shape[1] or y+height > self.shape[0]:
+            raise IndexError('Rectangle ({}, {}, {}, {}) is out of the grid'.format(x, y, width, height))
+        mask = np.zeros(self.shape, dtype=bool)
+        mask[y:y+height, x:x+width] = True
+        self.apply_mask(mask, value, overwrite=with_overwritting)
+    
+    def apply_mask(self, mask: np.ndarray, value: int, overwrite: Optional[bool] = False) -> None:
+        """Sets every cell where mask is True to a value.
+
+        :param mask: boolean array of the grid shape
+        :type mask: np.ndarray
+        :param value: value to set (0, 1 or -1)
+        :type value: int
+        :param overwrite: decides if existing non-zero values should be overwritten, defaults to False
+        :type overwrite: bool, optional
+        :raises ValueError: Mask of a different shape or value other than 0, 1 and -1.
+        """
+        _checked_values(value, self.colors)
+        mask = np.asarray(mask, dtype=bool)
+        if mask.shape != self.shape:
+            raise ValueError('Mask must have shape {}'.format(self.shape))
+        grid = np.asarray(self)
+        #only cells whose value actually changes make lines dirty
+        if overwrite:
+            target = mask & (grid != value)
+        else:
+            target = mask & (grid == 0)
+        if self._journal is not None:
+            flat = np.flatnonzero(target)
+            self._record(flat, grid.ravel()[flat])
+        grid[target] = value
+        self.dirty_rows.update(np.flatnonzero(target.any(axis=1)).tolist())
+        self.dirty_cols.update(np.flatnonzero(target.any(axis=0)).tolist())
+    
+    def checkpoint(self) -> int:
+        """Opens a checkpoint the grid can be rolled back to.
+
+        From the first open checkpoint on, writes through the set_ and fill_ methods record the old values of
+        the cells they change. Checkpoints and rollbacks cost as much as the number of changed cells, not the
+        grid size. Writes that bypass these methods (e.g. numpy indexing) are not recorded.
+
+        :return: Id of the checkpoint, pass it to :meth:`rollback`.
+        :rtype: int
+        """
+        if self._journal is None:
+            self._journal = []
+        token = self._next_checkpoint
+        self._next_checkpoint += 1
+        self._checkpoints.append((token, len(self._journal)))
+        return token
+    
+    def rollback(self, token: int) -> None:
+        """Restores the grid to its state at a checkpoint.
+
+        The checkpoint stays open, so the grid can be rolled back to it again. Checkpoints opened after it are
+        closed. Restored lines are marked dirty.
+
+        :param token: Id returned by :meth:`checkpoint`.
+        :type token: int
+        :raises ValueError: Id of no open checkpoint.
+        """
+        offsets = dict(self._checkpoints)
+        if token not in offsets:
+            raise ValueError('No open checkpoint {}'.format(token))
+        offset = offsets[token]
+        grid = np.asarray(self)
+        width = self.shape[1]
+        #undo newest writes first so every cell ends with its oldest recorded value
+        while len(self._journal) > offset:
+            idx, old = self._journal.pop()
+            ys, xs = np.divmod(np.atleast_1d(idx), width)
+            grid[ys, xs] = old
+            self.dirty_rows.update(ys.tolist())
+            self.dirty_cols.update(xs.tolist())
+        while self._checkpoints[-1][0] != token:
+            self._checkpoints.pop()
+    
+    def commit(self) -> None:
+        """Closes the newest checkpoint and keeps its changes.
+
+        Changes stay recorded while older checkpoints are open, the journal is dropped when the last one closes.
+
+        :raises ValueError: No open checkpoint.
+        """
+        if not self._checkpoints:
+            raise ValueError('No open checkpoint')
+        self._checkpoints.pop()
+        if not self._checkpoints:
+            self._journal = None
+    
+    def _record(self, idx, old) -> None:
+        """Records old values of cells at flat indices idx if a checkpoint is open."""
+        if self._journal is not None:
+            self._journal.append((idx, old))
+    
+    def _record_row(self, y: int, xs: np.ndarray) -> None:
+        """Records old values of cells xs of row y if a checkpoint is open."""
+        if self._journal is not None and len(xs):
+            self._journal.append(((y % self.shape[0])*self.shape[1] + xs, np.array(self[y, xs])))
+    
+    def _record_col(self, x: int, ys: np.ndarray) -> None:
+        """Records old values of cells ys of column x if a checkpoint is open."""
+        if self._journal is not None and len(ys):
+            self._journal.append((ys*self.shape[1] + x % self.shape[1], np.array(self[ys, x])))
     
     def get_row_segments(self, y: int) -> List[int]:
         """Returns lengths of segments of 1s in a row.
@@ -112,17 +407,7 @@ class NonogramGrid(np.ndarray):
         :return: Lengths of segments of 1s in a row.
         :rtype: List[int]
         """        
-        row = self.get_row(y)
-        #replace -1 with 0 as they are the same in this case
-        row = np.maximum(row,0)
-        row_str = ''.join(map(str, row))
-        #splits into segments of 1s
-        row_str = row_str.split('0')
-        #removes empty segments
-        segments = list(filter(lambda x: len(x) > 0, row_str))
-        #maps segments to their lengths
-        segments = list(map(len, segments))
-        return segments
+        return _line_runs(self.get_row(y))
     
     def get_col_segments(self, x: int) -> List[int]:
         """Returns lengths of segments of 1s in a column.
@@ -132,13 +417,79 @@ class NonogramGrid(np.ndarray):
         :return: Lengths of segments of 1s in a column.
         :rtype: List[int]
         """        
-        col = self.get_col(x)
-        col = np.maximum(col,0)
-        col_str = ''.join(map(str, col))
-        col_str = col_str.split('0')
-        segments = list(filter(lambda x: len(x) > 0, col_str))
-        segments = list(map(len, segments))
-        return segments
+        return _line_runs(self.get_col(x))
+    
+    def row_runs(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Returns segments of 1s of all rows as flat arrays.
+
+        Segments are ordered by row and then from left to right.
+
+        :return: (row index of each segment, length of each segment)
+        :rtype: Tuple[np.ndarray, np.ndarray]
+        """
+        return _grid_runs(np.asarray(self))
+    
+    def col_runs(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Returns segments of 1s of all columns as flat arrays.
+
+        Segments are ordered by column and then from top to bottom.
+
+        :return: (column index of each segment, length of each segment)
+        :rtype: Tuple[np.ndarray, np.ndarray]
+        """
+        return _grid_runs(np.asarray(self).T)
+    
+    def get_row_color_segments(self, y: int) -> List[Tuple[int, int]]:
+        """Returns (length, color) of segments of colored cells in a row, neighbouring colors are separate segments.
+
+        :param y: y coordinate of row
+        :type y: int
+        :rtype: List[Tuple[int, int]]
+        """
+        return _line_color_runs(self.get_row(y))
+    
+    def get_col_color_segments(self, x: int) -> List[Tuple[int, int]]:
+        """Returns (length, color) of segments of colored cells in a column, neighbouring colors are separate segments.
+
+        :param x: x coordinate of column
+        :type x: int
+        :rtype: List[Tuple[int, int]]
+        """
+        return _line_color_runs(self.get_col(x))
+    
+    def row_color_runs(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Returns segments of colored cells of all rows as flat arrays, see :meth:`row_runs`.
+
+        :return: (row index, length and color of each segment)
+        :rtype: Tuple[np.ndarray, np.ndarray, np.ndarray]
+        """
+        return _grid_color_runs(np.asarray(self))
+    
+    def col_color_runs(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Returns segments of colored cells of all columns as flat arrays, see :meth:`col_runs`.
+
+        :return: (column index, length and color of each segment)
+        :rtype: Tuple[np.ndarray, np.ndarray, np.ndarray]
+        """
+        return _grid_color_runs(np.asarray(self).T)
+    
+    def all_row_segments(self) -> List[List[int]]:
+        """Returns lengths of segments of 1s in every row.
+
+        :return: Lengths of segments of 1s, one list per row.
+        :rtype: List[List[int]]
+        """
+        idx, lengths = self.row_runs()
+        return _split_runs(idx, lengths, self.shape[0])
+    
+    def all_col_segments(self) -> List[List[int]]:
+        """Returns lengths of segments of 1s in every column.
+
+        :return: Lengths of segments of 1s, one list per column.
+        :rtype: List[List[int]]
+        """
+        idx, lengths = self.col_runs()
+        return _split_runs(idx, lengths, self.shape[1])
     
     def __str__(self) -> str:
         """Returns string representation of NonogramGrid.
@@ -146,4 +497,69 @@ class NonogramGrid(np.ndarray):
         :return: np.narray.__str__()
         :rtype: str
         """        
-        return super().__str__()
\ No newline at end of file
+        return super().__str__()
+
+def _value_message(colors: int) -> str:
+    """Returns the error message of values outside -1 to colors."""
+    if colors == 1:
+        return 'Value must be -1, 0 or 1'
+    return 'Value must be -1, 0 or a color from 1 to {}'.format(colors)
+
+def _checked_values(values, colors: Optional[int] = 1) -> np.ndarray:
+    """Returns values as an array, raising ValueError unless all of them are between -1 and colors."""
+    values = np.asarray(values)
+    if values.dtype.kind not in 'iub' or np.any((values < -1) | (values > colors)):
+        raise ValueError(_value_message(colors))
+    return values
+
+def _checked_indices(indices: Iterable[int], size: int) -> np.ndarray:
+    """Returns indices as a 1D array with negative values counted from the end, as in numpy indexing."""
+    indices = np.asarray(indices, dtype=np.int64).ravel()
+    if np.any((indices < -size) | (indices >= size)):
+        raise IndexError('index out of bounds for size {}'.format(size))
+    return np.where(indices < 0, indices + size, indices)
+
+def _line_runs(line: np.ndarray) -> List[int]:
+    """Returns lengths of segments of 1s in a single line."""
+    #pad with 0 so every segment has a start and an end
+    padded = np.zeros(len(line)+2, dtype=np.int8)
+    padded[1:-1] = np.asarray(line) == 1
+    edges = np.flatnonzero(np.diff(padded))
+    return (edges[1::2] - edges[::2]).tolist()
+
+def _grid_runs(grid: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Returns (line index, length) of all segments of 1s along the rows of grid."""
+    height, width = grid.shape
+    #pad every line with 0 on both sides so every segment has a start and an end
+    padded = np.zeros((height, width+2), dtype=np.int8)
+    padded[:, 1:-1] = grid == 1
+    diff = np.diff(padded, axis=1)
+    #np.nonzero walks in row-major order, so starts and ends pair up
+    start_idx, starts = np.nonzero(diff == 1)
+    _, ends = np.nonzero(diff == -1)
+    return start_idx, ends - starts
+
+def _line_color_runs(line: np.ndarray) -> List[Tuple[int, int]]:
+    """Returns (length, color) of segments of colored cells in a single line."""
+    idx, lengths, colors = _grid_color_runs(np.asarray(line).reshape(1, -1))
+    return list(zip(lengths.tolist(), colors.tolist()))
+
+def _grid_color_runs(grid: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Returns (line index, length, color) of all segments of equal colors along the rows of grid.
+
+    Crossed and unknown cells end segments, neighbouring cells of different colors belong to different segments.
+    """
+    height, width = grid.shape
+    #pad every line with 0 on both sides so every segment has a start and an end
+    padded = np.zeros((height, width+2), dtype=np.int8)
+    np.maximum(grid, 0, out=padded[:, 1:-1])
+    #boundary p lies between padded cells p and p+1, all colors are handled in the same passes
+    boundary = padded[:, 1:] != padded[:, :-1]
+    start_idx, starts = np.nonzero(boundary & (padded[:, 1:] > 0))
+    _, ends = np.nonzero(boundary & (padded[:, :-1] > 0))
+    return start_idx, ends - starts, padded[start_idx, starts+1]
+
+def _split_runs(idx: np.ndarray, lengths: np.ndarray, count: int) -> List[List[int]]:
+    """Splits flat segment lengths into one list per line."""
+    bounds = np.cumsum(np.bincount(idx, minlength=count))[:-1]
+    return [part.tolist() for part in np.split(lengths, bounds)]
\ No newline at end of file
@@ -0,0 +1,215 @@
+"""
+Difficulty rating from solver traces.
+
+A trace is what one propagation solve records in :class:`Stats` (rounds, lines, multi-block deductions)
+plus the guess depth the puzzle needs when line logic gets stuck. The depth comes from single cell
+probing, never from full search, so rating a large corpus costs little more than solving it.
+"""
+#Internal imports
+import pyNonogram.batch
+import pyNonogram.errors
+import pyNonogram.nonogram
+import pyNonogram.nonogram_grid
+import pyNonogram.solver
+import pyNonogram.stats
+import pyNonogram.stream
+
+#Built-in imports
+import os
+import stat
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable, Iterator, List, NamedTuple, Optional, Tuple, Union
+
+#External imports
+import numpy as np
+
+#depth of puzzles solved by line logic, by probing single cells and of puzzles probing does not finish
+LINE_DEPTH = 0
+PROBE_DEPTH = 1
+SEARCH_DEPTH = 2
+
+#score of a trace is 1 + round points + multi-block points + depth points, at most MAX_SCORE
+ROUNDS_PER_POINT = 2
+MAX_ROUND_POINTS = 3
+MAX_MULTI_BLOCK_POINTS = 3
+DEPTH_POINTS = (0, 2, 3)
+MAX_SCORE = 1 + MAX_ROUND_POINTS + MAX_MULTI_BLOCK_POINTS + DEPTH_POINTS[-1]
+
+class Trace(NamedTuple):
+    """Solver trace of a puzzle.
+
+    * *rounds* -- propagation rounds, including rounds after cells set by probing
+    * *lines* -- lines run through the line solver outside of probes
+    * *multi_block* -- deductions on lines with more than one block that already had known cells
+    * *probes* -- values assumed for single cells while probing, see :func:`pyNonogram.solver.probe`
+    * *depth* -- LINE_DEPTH, PROBE_DEPTH or SEARCH_DEPTH
+    """
+    rounds: int
+    lines: int
+    multi_block: int
+    probes: int
+    depth: int
+
+def _description(puzzle) -> Tuple[int, int, List[List[int]], List[List[int]]]:
+    """Returns the compact description of a path, raw .nonl record, nonogram or description."""
+    if isinstance(puzzle, tuple):
+        return puzzle
+    nonogram = puzzle
+    if isinstance(puzzle, (str, list)):
+        nonogram = pyNonogram.nonogram.Nonogram()
+        if isinstance(puzzle, str):
+            nonogram.load(puzzle)
+        else:
+            nonogram.load_lines(puzzle)
+    return pyNonogram.batch.describe(nonogram)
+
+def trace(puzzle) -> Trace:
+    """Solves a puzzle by propagation and probing and returns its trace.
+
+    :param puzzle: Path to nonogram file (.non), record from :func:`pyNonogram.stream.iter_records`,
+        loaded nonogram or description from :func:`pyNonogram.batch.describe`.
+    :type puzzle: Union[str, List[str], Nonogram, tuple]
+    :raises Contradiction: Puzzle has no solution.
+    :return: Trace of the solve.
+    :rtype: Trace
+    """
+    width, height, rows, columns = _description(puzzle)
+    rows = [pyNonogram.solver.normalize_clues(clues) for clues in rows]
+    columns = [pyNonogram.solver.normalize_clues(clues) for clues in columns]
+    colors = pyNonogram.solver.clue_colors(rows)
+    grid = pyNonogram.nonogram_grid.NonogramGrid((height, width), colors=colors[-1])
+    stats = pyNonogram.stats.Stats()
+    pyNonogram.solver.propagate(grid, rows, columns, stats=stats)
+    depth = LINE_DEPTH
+    if np.any(grid == pyNonogram.solver.UNKNOWN):
+        #cells are probed exactly as search probes them before branching
+        pyNonogram.solver.probe(grid, rows, columns, colors + [pyNonogram.solver.CROSSED], [], stats=stats)
+        depth = SEARCH_DEPTH if np.any(grid == pyNonogram.solver.UNKNOWN) else PROBE_DEPTH
+    return Trace(stats.rounds, stats.lines, stats.multi_block, stats.probes, depth)
+
+def score(trace: Trace) -> int:
+    """Returns the difficulty of a trace, from 1 to MAX_SCORE.
+
+    Every ROUNDS_PER_POINT rounds after the first one add a point (at most MAX_ROUND_POINTS), the share of
+    productive line solves that were multi-block deductions adds up to MAX_MULTI_BLOCK_POINTS and the depth
+    adds DEPTH_POINTS[depth].
+
+    :param trace: Trace from :func:`trace`.
+    :type trace: Trace
+    :rtype: int
+    """
+    round_points = min(MAX_ROUND_POINTS, max(0, trace.rounds - 1) // ROUNDS_PER_POINT)
+    multi_block_points = 0
+    if trace.lines:
+        multi_block_points = min(MAX_MULTI_BLOCK_POINTS, (2*MAX_MULTI_BLOCK_POINTS*trace.multi_block) // trace.lines)
+    return 1 + round_points + multi_block_points + DEPTH_POINTS[trace.depth]
+
+def _trace_chunk(chunk: List[Tuple[int, Union[str, List[str], tuple]]]) -> List[Tuple[int, Optional[Trace]]]:
+    """Traces a chunk of (id, puzzle) pairs in a worker process, None for puzzles that can't be rated."""
+    results = []
+    for idx, puzzle in chunk:
+        try:
+            results.append((idx, trace(puzzle)))
+        except (pyNonogram.errors.NonogramException, pyNonogram.errors.PathException,
+                pyNonogram.errors.UnknownFormat, ValueError, IndexError, OSError):
+            results.append((idx, None))
+    return results
+
+def _chunks(puzzles: Iterable, chunksize: int) -> Iterator[List[Tuple[int, Union[str, List[str], tuple]]]]:
+    """Groups puzzles into chunks of (id, puzzle) pairs, loaded nonograms are sent as descriptions."""
+    chunk = []
+    for idx, puzzle in enumerate(puzzles):
+        chunk.append((idx, puzzle if isinstance(puzzle, (str, list, tuple)) else pyNonogram.batch.describe(puzzle)))
+        if len(chunk) == chunksize:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+def rate_many(puzzles: Iterable, workers: Optional[int] = None,
+              chunksize: Optional[int] = 64) -> Iterator[Tuple[int, Optional[Trace]]]:
+    """Traces many puzzles across worker processes, in input order.
+
+    Puzzles are read lazily, at most two chunks per worker are in flight at a time.
+
+    :param puzzles: Paths to nonogram files (.non), records of .nonl files, loaded nonograms or descriptions.
+    :type puzzles: Iterable[Union[str, List[str], Nonogram, tuple]]
+    :param workers: Number of worker processes, defaults to number of CPUs. 0 rates in this process.
+    :type workers: int, optional
+    :param chunksize: Number of puzzles sent to a worker at once, defaults to 64
+    :type chunksize: int, optional
+    :return: (id, trace) for every puzzle, trace is None when the puzzle can't be loaded or has no solution.
+    :rtype: Iterator[Tuple[int, Optional[Trace]]]
+    """
+    if chunksize < 1:
+        raise ValueError('Chunksize must be positive')
+    chunks = _chunks(puzzles, chunksize)
+    if workers == 0:
+        for chunk in chunks:
+            yield from _trace_chunk(chunk)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for results in pyNonogram.batch._bounded_map(executor, _trace_chunk, chunks, pyNonogram.batch._window(workers)):
+            yield from results
+
+def write_ratings(path: str, workers: Optional[int] = None, chunksize: Optional[int] = 64) -> int:
+    """Rates puzzles and writes their scores into the difficulty field.
+
+    .non files are rewritten one by one, a .nonl file is rewritten once through a temporary file.
+    Puzzles that can't be rated keep their difficulty.
+
+    :param path: Nonogram file (.non), directory of .non files or multi-puzzle file (.nonl).
+    :type path: str
+    :param workers: Number of worker processes, defaults to number of CPUs. 0 rates in this process.
+    :type workers: int, optional
+    :param chunksize: Number of puzzles sent to a worker at once, defaults to 64
+    :type chunksize: int, optional
+    :raises PathException: Invalid path when path is neither a file nor a directory.
+    :raises UnknownFormat: Invalid file format when a file does not end with (.non) or (.nonl).
+    :return: Number of rated puzzles.
+    :rtype: int
+    """
+    if path.endswith('.nonl'):
+        return _write_nonl_ratings(path, workers, chunksize)
+    if os.path.isdir(path):
+        with os.scandir(path) as it:
+            paths = sorted(entry.path for entry in it if entry.name.endswith('.non') and entry.is_file())
+    elif os.path.isfile(path):
+        if not path.endswith('.non'):
+            raise pyNonogram.errors.UnknownFormat('Invalid file format (Expected .non or .nonl got {})'.format(path.split('.')[-1]))
+        paths = [path]
+    else:
+        raise pyNonogram.errors.PathException('Invalid path')
+    count = 0
+    for idx, result in rate_many(paths, workers, chunksize):
+        if result is not None:
+            pyNonogram.nonogram._replace_field_line(paths[idx], 'difficulty', str(score(result)))
+            count += 1
+    return count
+
+def _write_nonl_ratings(path: str, workers: Optional[int], chunksize: int) -> int:
+    """Rewrites the difficulty lines of a multi-puzzle file (.nonl), reading it twice instead of keeping it in memory."""
+    rated = 0
+    def records() -> Iterator[List[str]]:
+        nonlocal rated
+        results = rate_many(pyNonogram.stream.iter_records(path), workers, chunksize)
+        for record, (_, result) in zip(pyNonogram.stream.iter_records(path), results):
+            if result is not None:
+                for idx, line in enumerate(record):
+                    if line.startswith('difficulty:'):
+                        record[idx] = 'difficulty:{}'.format(score(result))
+                        rated += 1
+                        break
+            yield record
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), suffix='.nonl')
+    os.close(fd)
+    try:
+        #write_nonograms syncs the file to disk before it is renamed
+        pyNonogram.stream.write_nonograms(tmp_path, records())
+        os.chmod(tmp_path, stat.S_IMODE(os.stat(path).st_mode))
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+    return rated
@@ -0,0 +1,154 @@
+#Internal imports
+import pyNonogram.errors
+
+#Built-in imports
+from typing import List, Optional, Tuple
+
+#External imports
+import numpy as np
+
+#ANSI escape sequences
+CLEAR = '\x1b[H\x1b[2J'
+MOVE = '\x1b[{};{}H'
+
+#gray level of crossed (-1), unknown (0) and filled (1) cells in raster exports, then colors 2 to 9
+GRAY_LEVELS = (255, 191, 0, 76, 150, 29, 105, 179, 125, 90, 165)
+#RGB color of crossed (-1), unknown (0) and filled (1) cells in raster exports, then colors 2 to 9
+COLORS = ((255, 255, 255), (191, 191, 191), (0, 0, 0), (255, 0, 0), (0, 160, 0), (0, 0, 255),
+          (255, 160, 0), (160, 0, 160), (0, 160, 160), (140, 90, 40), (255, 105, 180))
+
+class Renderer:
+    """Text renderer of a loaded nonogram.
+
+    Hint gutters and cell symbols are computed once, every frame is built into a single string.
+    :meth:`ansi` redraws only cells changed since the previous ANSI frame.
+
+    :param nonogram: Loaded nonogram.
+    :type nonogram: Nonogram
+    :raises NotLoaded: Nonogram not loaded.
+    """
+    def __init__(self, nonogram) -> None:
+        """Creates a new Renderer object and precomputes hint gutters.
+        """
+        if not nonogram.is_loaded:
+            raise pyNonogram.errors.NotLoaded('Nonogram not loaded')
+        self.nonogram = nonogram
+        #blocks of colored nonograms are shown as length.color
+        rows = [_hint_tokens(line) for line in nonogram.row_clues]
+        columns = [_hint_tokens(line) for line in nonogram.col_clues]
+        #row hints are right aligned in fields of at least 2 characters
+        hint_space = max(2, max(len(hint) for hints in rows for hint in hints))
+        max_row_len = max(map(len, rows))
+        self.row_gutters = [' '.join(hint.rjust(hint_space) for hint in hints).rjust(max_row_len*(hint_space+1)-1) + ' '
+                            for hints in rows]
+        self.gutter_width = max_row_len*(hint_space+1)
+        #column hints are bottom aligned, each cell is col_space characters wide
+        self.col_space = max(len(hint) for hints in columns for hint in hints) + 1
+        max_col_len = max(map(len, columns))
+        self.header = []
+        for i in range(max_col_len):
+            line = ''
+            for hints in columns:
+                idx = i - (max_col_len - len(hints))
+                line += hints[idx].rjust(self.col_space) if idx >= 0 else ' '*self.col_space
+            self.header.append(' '*self.gutter_width + line)
+        #symbols indexed by cell value + 1, colors above 1 are drawn with their code
+        self.symbols = ('-'*self.col_space, ' '*self.col_space, u'█'*self.col_space) + tuple(
+            str(color)*self.col_space for color in range(2, nonogram.colors+1))
+        self._last = None
+
+    def _cells(self) -> np.ndarray:
+        """Returns the grid of the nonogram as an array."""
+        if self.nonogram.grid is None:
+            self.nonogram.load_grid()
+        return np.asarray(self.nonogram.grid)
+
+    def _row(self, values: List[int]) -> str:
+        """Returns cell symbols of a row of values shifted by 1."""
+        return ''.join(map(self.symbols.__getitem__, values))
+
+    def frame(self) -> str:
+        """Returns the whole board with hints as one string.
+
+        :return: Lines of the board separated by newlines.
+        :rtype: str
+        """
+        cells = (self._cells() + 1).tolist()
+        lines = self.header + [gutter + self._row(row) for gutter, row in zip(self.row_gutters, cells)]
+        return '\n'.join(lines)
+
+    def ansi(self, full: Optional[bool] = False) -> str:
+        """Returns ANSI escape sequences drawing the board in a terminal.
+
+        The first call (or a call with full=True) clears the screen and draws the whole board. Later calls
+        only move the cursor to and redraw the part of each row between its first and last changed cell.
+
+        :param full: redraw the whole board, defaults to False
+        :type full: bool, optional
+        :return: Text to write to the terminal, empty if nothing changed.
+        :rtype: str
+        """
+        cells = self._cells()
+        last, self._last = self._last, cells.copy()
+        if full or last is None or last.shape != cells.shape:
+            return CLEAR + self.frame()
+        changed = cells != last
+        parts = []
+        top = len(self.header) + 1
+        for y in np.flatnonzero(changed.any(axis=1)).tolist():
+            xs = np.flatnonzero(changed[y])
+            start, end = int(xs[0]), int(xs[-1]) + 1
+            parts.append(MOVE.format(top + y, self.gutter_width + start*self.col_space + 1))
+            parts.append(self._row((cells[y, start:end] + 1).tolist()))
+        if parts:
+            #leave the cursor below the board
+            parts.append(MOVE.format(top + cells.shape[0], 1))
+        return ''.join(parts)
+
+def _hint_tokens(line) -> Tuple[str, ...]:
+    """Returns the hints of a line as strings, length.color for colored lines and 0 for empty lines."""
+    if not line.clues:
+        return ('0',)
+    if line.colors:
+        return tuple('{}.{}'.format(clue, color) for clue, color in zip(line.clues, line.colors))
+    return tuple(map(str, line.clues))
+
+def raster(grid, scale: Optional[int] = 1, color: Optional[bool] = False) -> np.ndarray:
+    """Returns the grid as an image array, every cell is scale x scale pixels.
+
+    :param grid: Grid to draw.
+    :type grid: Union[NonogramGrid, BitsetGrid, np.ndarray]
+    :param scale: Pixels per cell side, defaults to 1
+    :type scale: int, optional
+    :param color: return RGB pixels instead of gray levels, defaults to False
+    :type color: bool, optional
+    :return: uint8 array of shape (height*scale, width*scale) or (height*scale, width*scale, 3)
+    :rtype: np.ndarray
+    """
+    if scale < 1:
+        raise ValueError('Scale must be positive')
+    palette = np.array(COLORS if color else GRAY_LEVELS, dtype=np.uint8)
+    pixels = palette[np.asarray(grid).astype(np.intp) + 1]
+    return pixels.repeat(scale, axis=0).repeat(scale, axis=1)
+
+def write_image(path: str, grid, scale: Optional[int] = 1) -> None:
+    """Writes the grid as a binary PGM (.pgm) or PPM (.ppm) image.
+
+    :param path: Path to image file, the extension picks the format.
+    :type path: str
+    :param grid: Grid to draw.
+    :type grid: Union[NonogramGrid, BitsetGrid, np.ndarray]
+    :param scale: Pixels per cell side, defaults to 1
+    :type scale: int, optional
+    :raises UnknownFormat: Path does not end with .pgm or .ppm
+    """
+    if path.endswith('.pgm'):
+        magic, pixels = b'P5', raster(grid, scale)
+    elif path.endswith('.ppm'):
+        magic, pixels = b'P6', raster(grid, scale, color=True)
+    else:
+        raise pyNonogram.errors.UnknownFormat('Invalid image format (Expected .pgm or .ppm got {})'.format(path.split('.')[-1]))
+    height, width = pixels.shape[:2]
+    with open(path, 'wb') as f:
+        f.write(b'%s\n%d %d\n255\n' % (magic, width, height))
+        f.write(np.ascontiguousarray(pixels).tobytes())
@@ -0,0 +1,322 @@
+"""
+Asyncio solving service speaking newline-delimited JSON.
+
+Every request is one JSON object on one line, every response is one JSON object on one line. Responses carry the
+id of their request and are written as soon as they are ready, not necessarily in request order.
+
+Request fields:
+    * *id* -- any JSON value, echoed in the response
+    * *puzzle* -- text of a .non record (9 lines), or
+    * *width*, *height*, *rows*, *columns* -- parsed puzzle
+    * *deadline* -- optional seconds the client is willing to wait
+
+Response fields:
+    * *id* -- id of the request
+    * *status* -- solved, partial, contradiction, error or timeout
+    * *solution* -- string of 0s and 1s as in .non files, null unless solved
+    * *message* -- reason of an error status
+"""
+#Internal imports
+import pyNonogram.batch
+import pyNonogram.errors
+import pyNonogram.nonogram
+
+#Built-in imports
+import asyncio
+import json
+import multiprocessing
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+TIMEOUT = 'timeout'
+
+#longest accepted request line in bytes
+LINE_LIMIT = 1 << 24
+
+def parse_request(request: Dict[str, Any]) -> Tuple[int, int, List[List[int]], List[List[int]]]:
+    """Returns the compact description of the puzzle of a request, see :func:`pyNonogram.batch.describe`.
+
+    Puzzle text is parsed and checked exactly like a .non file by :meth:`Nonogram.load_lines`.
+
+    :param request: Decoded request.
+    :type request: Dict[str, Any]
+    :raises UnknownFormat: Request has neither puzzle text nor width, height, rows and columns.
+    :raises LoadingException: Hints that no grid can satisfy.
+    :return: (width, height, rows, columns)
+    :rtype: Tuple[int, int, List[List[int]], List[List[int]]]
+    """
+    nonogram = pyNonogram.nonogram.Nonogram()
+    if isinstance(request.get('puzzle'), str):
+        nonogram.load_lines(request['puzzle'].rstrip('\n').split('\n'))
+    elif all(key in request for key in ('width', 'height', 'rows', 'columns')):
+        nonogram.load_data('', '', 0, 0, int(request['width']), int(request['height']),
+                           request['rows'], request['columns'])
+    else:
+        raise pyNonogram.errors.UnknownFormat('Request needs puzzle or width, height, rows and columns')
+    return pyNonogram.batch.describe(nonogram)
+
+class _Job:
+    """Pending request waiting for its batch."""
+    __slots__ = ('description', 'deadline', 'future')
+
+    def __init__(self, description: tuple, deadline: Optional[float], future: asyncio.Future) -> None:
+        self.description = description
+        self.deadline = deadline
+        self.future = future
+
+class SolverServer:
+    """Asyncio front-end solving puzzles in micro-batches on a worker pool.
+
+    Requests are parsed on the event loop and queued. A batcher takes up to batch_size queued requests,
+    waiting at most batch_delay seconds for a batch to fill, and hands each batch to the pool. At most
+    max_batches batches run at once. When the queue holds max_pending requests, connections are not read
+    until it drains, so clients are slowed down by TCP instead of growing server memory.
+
+    :param workers: Number of worker processes, defaults to number of CPUs
+    :type workers: int, optional
+    :param batch_size: Most requests per batch, defaults to 32
+    :type batch_size: int, optional
+    :param batch_delay: Most seconds the first request of a batch waits for more, defaults to 0.002
+    :type batch_delay: float, optional
+    :param max_pending: Most queued requests before reading stops, defaults to 1024
+    :type max_pending: int, optional
+    :param max_batches: Most batches solved at once, defaults to workers (or 4)
+    :type max_batches: int, optional
+    :param deadline: Seconds a request may wait when it sets no deadline, defaults to None (no limit)
+    :type deadline: float, optional
+    :param executor: Pool to solve batches on instead of a new process pool, defaults to None
+    :type executor: Optional[Executor]
+    """
+    def __init__(self, workers: Optional[int] = None, batch_size: Optional[int] = 32,
+                 batch_delay: Optional[float] = 0.002, max_pending: Optional[int] = 1024,
+                 max_batches: Optional[int] = None, deadline: Optional[float] = None,
+                 executor: Optional[Executor] = None) -> None:
+        """Creates a new SolverServer object, the pool is started by :meth:`start`.
+        """
+        if batch_size < 1 or max_pending < 1:
+            raise ValueError('Batch size and max pending must be positive')
+        self.workers = workers
+        self.batch_size = batch_size
+        self.batch_delay = batch_delay
+        self.max_pending = max_pending
+        self.max_batches = max_batches or workers or 4
+        self.deadline = deadline
+        self.executor = executor
+        self._own_executor = executor is None
+        self._queue = None
+        self._slots = None
+        self._batcher = None
+        self._server = None
+        self._tasks = set()
+        self._writers = set()
+
+    @property
+    def port(self) -> int:
+        """Port the server listens on, useful after starting on port 0."""
+        return self._server.sockets[0].getsockname()[1]
+
+    async def start(self, host: Optional[str] = '127.0.0.1', port: Optional[int] = 0) -> None:
+        """Starts the worker pool, the batcher and listening on host:port.
+
+        :param host: Address to listen on, defaults to '127.0.0.1'
+        :type host: str, optional
+        :param port: Port to listen on, defaults to 0 (any free port)
+        :type port: int, optional
+        """
+        if self.executor is None:
+            #forked workers would inherit client sockets and keep connections open after the server closes them
+            method = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+            self.executor = ProcessPoolExecutor(max_workers=self.workers, mp_context=multiprocessing.get_context(method))
+        self._queue = asyncio.Queue(maxsize=self.max_pending)
+        self._slots = asyncio.Semaphore(self.max_batches)
+        self._batcher = asyncio.ensure_future(self._run_batcher())
+        self._server = await asyncio.start_server(self._handle, host, port, limit=LINE_LIMIT)
+
+    async def close(self) -> None:
+        """Stops listening, cancels pending requests and shuts the worker pool down.
+        """
+        if self._server is not None:
+            self._server.close()
+            for writer in list(self._writers):
+                writer.close()
+            await self._server.wait_closed()
+        if self._batcher is not None:
+            self._batcher.cancel()
+            await asyncio.gather(self._batcher, return_exceptions=True)
+        for task in list(self._tasks):
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        if self._own_executor and self.executor is not None:
+            self.executor.shutdown(wait=True)
+            self.executor = None
+
+    async def serve_forever(self) -> None:
+        """Serves until cancelled.
+        """
+        await self._server.serve_forever()
+
+    async def solve(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """Solves one request without a socket, used by in-process callers.
+
+        :param request: Decoded request.
+        :type request: Dict[str, Any]
+        :return: Response.
+        :rtype: Dict[str, Any]
+        """
+        return await self._result(*await self._submit(request))
+
+    async def _submit(self, request: Dict[str, Any]) -> Tuple[Dict[str, Any], Optional[_Job]]:
+        """Parses and queues a request, waiting while the queue is full.
+
+        Returns the response to fill and the queued job, None if the response is already final.
+        """
+        response = {'id': request.get('id'), 'status': None, 'solution': None}
+        loop = asyncio.get_running_loop()
+        try:
+            timeout = request.get('deadline', self.deadline)
+            deadline = None if timeout is None else loop.time() + float(timeout)
+            description = parse_request(request)
+        except (pyNonogram.errors.NonogramException, pyNonogram.errors.UnknownFormat,
+                ValueError, TypeError, IndexError) as e:
+            response['status'] = pyNonogram.batch.ERROR
+            response['message'] = str(e)
+            return response, None
+        job = _Job(description, deadline, loop.create_future())
+        try:
+            await asyncio.wait_for(self._queue.put(job), _remaining(deadline, loop))
+        except asyncio.TimeoutError:
+            response['status'] = TIMEOUT
+            return response, None
+        return response, job
+
+    async def _result(self, response: Dict[str, Any], job: Optional[_Job]) -> Dict[str, Any]:
+        """Waits for the job of a submitted request until its deadline and fills the response."""
+        if job is None:
+            return response
+        try:
+            status, solution = await asyncio.wait_for(asyncio.shield(job.future),
+                                                      _remaining(job.deadline, asyncio.get_running_loop()))
+        except asyncio.TimeoutError:
+            #the batcher skips cancelled jobs that were not sent yet
+            job.future.cancel()
+            status, solution = TIMEOUT, None
+        response['status'] = status
+        response['solution'] = solution
+        return response
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Serves one connection, requests of a connection are solved concurrently."""
+        pending = set()
+        self._writers.add(writer)
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except (asyncio.LimitOverrunError, ValueError):
+                    self._write(writer, {'id': None, 'status': pyNonogram.batch.ERROR, 'solution': None,
+                                         'message': 'Request line too long'})
+                    break
+                if not line:
+                    break
+                if not line.strip():
+                    continue
+                try:
+                    request = json.loads(line)
+                    if not isinstance(request, dict):
+                        raise ValueError('Request must be a JSON object')
+                except ValueError as e:
+                    self._write(writer, {'id': None, 'status': pyNonogram.batch.ERROR, 'solution': None,
+                                         'message': str(e)})
+                    continue
+                #the next line is read only after this one is queued, a full queue stops reading
+                submitted = await self._submit(request)
+                task = asyncio.ensure_future(self._respond(submitted, writer))
+                pending.add(task)
+                task.add_done_callback(pending.discard)
+                self._tasks.add(task)
+                task.add_done_callback(self._tasks.discard)
+                await writer.drain()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+            await writer.drain()
+        except (ConnectionError, asyncio.CancelledError):
+            pass
+        finally:
+            self._writers.discard(writer)
+            writer.close()
+
+    async def _respond(self, submitted: Tuple[Dict[str, Any], Optional[_Job]], writer: asyncio.StreamWriter) -> None:
+        """Waits for a submitted request and writes its response."""
+        self._write(writer, await self._result(*submitted))
+
+    def _write(self, writer: asyncio.StreamWriter, response: Dict[str, Any]) -> None:
+        """Writes a response line unless the connection is gone."""
+        if not writer.is_closing():
+            writer.write(json.dumps(response, separators=(',', ':')).encode('utf-8') + b'\n')
+
+    async def _run_batcher(self) -> None:
+        """Collects queued jobs into batches and sends them to the pool."""
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            flush_at = loop.time() + self.batch_delay
+            while len(batch) < self.batch_size:
+                remaining = flush_at - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+            now = loop.time()
+            live = [job for job in batch if not job.future.done() and (job.deadline is None or job.deadline > now)]
+            for job in batch:
+                if not job.future.done() and job not in live:
+                    job.future.set_result((TIMEOUT, None))
+            if not live:
+                continue
+            await self._slots.acquire()
+            task = asyncio.ensure_future(self._run_batch(live))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run_batch(self, jobs: List[_Job]) -> None:
+        """Solves a batch on the pool and resolves the futures of its jobs."""
+        loop = asyncio.get_running_loop()
+        try:
+            chunk = [(idx, job.description) for idx, job in enumerate(jobs)]
+            try:
+                results = await loop.run_in_executor(self.executor, pyNonogram.batch._solve_chunk, chunk)
+            except Exception:
+                #broken pool, every job of the batch fails
+                results = [(idx, pyNonogram.batch.ERROR, None) for idx in range(len(jobs))]
+            for idx, status, solution in results:
+                if not jobs[idx].future.done():
+                    jobs[idx].future.set_result((status, solution))
+        finally:
+            self._slots.release()
+
+def _remaining(deadline: Optional[float], loop: asyncio.AbstractEventLoop) -> Optional[float]:
+    """Returns seconds left until deadline, None without deadline."""
+    return None if deadline is None else max(deadline - loop.time(), 0)
+
+def serve(host: Optional[str] = '127.0.0.1', port: Optional[int] = 8765, **kwargs) -> None:
+    """Runs a :class:`SolverServer` until interrupted.
+
+    :param host: Address to listen on, defaults to '127.0.0.1'
+    :type host: str, optional
+    :param port: Port to listen on, defaults to 8765
+    :type port: int, optional
+    :param \\**kwargs: Options of :class:`SolverServer`.
+    """
+    async def run() -> None:
+        server = SolverServer(**kwargs)
+        await server.start(host, port)
+        try:
+            await server.serve_forever()
+        finally:
+            await server.close()
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,901 @@
+#Internal imports
+import pyNonogram.errors
+import pyNonogram.line_cache
+
+#Built-in imports
+from collections import deque
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+#External imports
+import numpy as np
+
+FILLED = 1
+CROSSED = -1
+UNKNOWN = 0
+
+def normalize_clues(clues: Sequence[int]) -> Tuple[int, ...]:
+    """Returns clues as a tuple without zero-length blocks.
+
+    A line hinted with ``0`` is an empty line, so ``[0]`` becomes ``()``. Clues of colored lines are
+    (length, color) pairs, they are returned as a tuple of pairs.
+
+    :param clues: Block lengths of a line, or (length, color) pairs.
+    :type clues: Sequence[Union[int, Tuple[int, int]]]
+    :return: Block lengths without zeros.
+    :rtype: Tuple[int, ...]
+    """
+    if len(clues) == 0:
+        return ()
+    if isinstance(clues[0], (tuple, list)):
+        return tuple(tuple(clue) for clue in clues if clue[0] > 0)
+    #already normalized clues are passed on every propagate call, return them as they are
+    if isinstance(clues, tuple) and min(clues) > 0:
+        return clues
+    return tuple(clue for clue in clues if clue > 0)
+
+def is_colored(clues: Sequence) -> bool:
+    """Checks if normalized clues are (length, color) pairs of a colored line."""
+    return len(clues) > 0 and isinstance(clues[0], tuple)
+
+def clue_colors(lines: Sequence[Sequence]) -> List[int]:
+    """Returns the sorted colors used by normalized clues of all lines, [FILLED] for black and white clues.
+
+    :param lines: Normalized clues of every line.
+    :type lines: Sequence[Sequence]
+    :rtype: List[int]
+    """
+    colors = {color for clues in lines if is_colored(clues) for _, color in clues}
+    return sorted(colors) if colors else [FILLED]
+
+def color_line_segments(line: Sequence[int]) -> Tuple[Tuple[int, int], ...]:
+    """Returns (length, color) of segments of colored cells in a line, neighbouring colors are separate segments.
+
+    :param line: Cell values (-1, 0 or a color).
+    :type line: Sequence[int]
+    :rtype: Tuple[Tuple[int, int], ...]
+    """
+    segments = []
+    run = 0
+    color = 0
+    for value in line:
+        if value == color and run:
+            run += 1
+            continue
+        if run:
+            segments.append((run, color))
+        run, color = (1, value) if value > 0 else (0, 0)
+    if run:
+        segments.append((run, color))
+    return tuple(segments)
+
+def line_segments(line: Sequence[int]) -> Tuple[int, ...]:
+    """Returns lengths of segments of filled cells in a line.
+
+    :param line: Cell values (0, 1 or -1).
+    :type line: Sequence[int]
+    :return: Lengths of segments of filled cells.
+    :rtype: Tuple[int, ...]
+    """
+    segments = []
+    run = 0
+    for value in line:
+        if value == FILLED:
+            run += 1
+        elif run:
+            segments.append(run)
+            run = 0
+    if run:
+        segments.append(run)
+    return tuple(segments)
+
+def _prefix_tables(clues: Sequence[int], line: Sequence[int]) -> Tuple[List[int], List[bool], List[List[bool]]]:
+    """Returns (free, not_filled, forward) tables of the line solver, see :func:`solve_line`."""
+    n = len(line)
+    k = len(clues)
+    #free[i] is the number of cells from i on that are not crossed, a block of length l fits at i if free[i] >= l
+    free = [0]*(n+1)
+    for i in range(n-1, -1, -1):
+        free[i] = free[i+1] + 1 if line[i] != CROSSED else 0
+    #not_filled[i] is True if cell i may be empty, index n stands for the end of the line
+    not_filled = [value != FILLED for value in line]
+    not_filled.append(True)
+
+    #forward[j][i]: line[0:i] holds blocks 0..j-1 and the rest of the prefix is empty
+    forward = [[False]*(n+1) for _ in range(k+1)]
+    row = forward[0]
+    row[0] = True
+    for i in range(1, n+1):
+        if not not_filled[i-1]:
+            break
+        row[i] = True
+    for j in range(1, k+1):
+        length = clues[j-1]
+        row = forward[j]
+        prev = forward[j-1]
+        for i in range(length, n+1):
+            if row[i-1] and not_filled[i-1]:
+                row[i] = True
+                continue
+            start = i - length
+            if free[start] < length:
+                continue
+            if start == 0:
+                row[i] = j == 1
+            else:
+                row[i] = not_filled[start-1] and prev[start-1]
+    return free, not_filled, forward
+
+def line_feasible(clues: Sequence[int], line: Sequence[int]) -> bool:
+    """Checks if a line can still be completed with its clues.
+
+    Runs only the prefix pass of :func:`solve_line`, O(line length x clue count).
+
+    :param clues: Block lengths of the line (without zeros).
+    :type clues: Sequence[int]
+    :param line: Current cell values (0, 1 or -1).
+    :type line: Sequence[int]
+    :return: True if some placement of the clues agrees with every known cell.
+    :rtype: bool
+    """
+    if is_colored(clues):
+        return solve_color_line(clues, line) is not None
+    if UNKNOWN not in line:
+        return line_segments(line) == tuple(clues)
+    return _prefix_tables(clues, line)[2][len(clues)][len(line)]
+
+def check_cell_lines(grid, rows: Sequence[Tuple[int, ...]], columns: Sequence[Tuple[int, ...]], x: int, y: int) -> None:
+    """Checks that the row and column through cell (x, y) can still be completed.
+
+    :param grid: Grid to check.
+    :type grid: NonogramGrid or BitsetGrid
+    :param rows: Row clues without zeros.
+    :type rows: Sequence[Tuple[int, ...]]
+    :param columns: Column clues without zeros.
+    :type columns: Sequence[Tuple[int, ...]]
+    :param x: x coordinate
+    :type x: int
+    :param y: y coordinate
+    :type y: int
+    :raises Contradiction: Row or column can't be completed, listed in its lines attribute.
+    """
+    height, width = grid.shape
+    y %= height
+    x %= width
+    lines = []
+    if hasattr(grid, 'get_row_masks'):
+        row_ok = line_feasible_masks(rows[y], *grid.get_row_masks(y), width)
+        col_ok = line_feasible_masks(columns[x], *grid.get_col_masks(x), height)
+    else:
+        row_ok = line_feasible(rows[y], grid.get_row(y).tolist())
+        col_ok = line_feasible(columns[x], grid.get_col(x).tolist())
+    if not row_ok:
+        lines.append(('row', y))
+    if not col_ok:
+        lines.append(('column', x))
+    if lines:
+        message = ' and '.join('{} {}'.format(line, idx) for line, idx in lines)
+        raise pyNonogram.errors.Contradiction(message[0].upper() + message[1:] + ' can not be completed', lines)
+
+def solve_line(clues: Sequence[int], line: Sequence[int]) -> Optional[List[int]]:
+    """Deduces every cell of a line that is the same in all placements of its clues.
+
+    Uses dynamic programming over prefixes and suffixes of the line, so it runs in
+    O(line length x clue count).
+
+    :param clues: Block lengths of the line (without zeros).
+    :type clues: Sequence[int]
+    :param line: Current cell values (0, 1 or -1).
+    :type line: Sequence[int]
+    :return: Line with all deducible cells set, or None if the line can't be completed.
+    :rtype: Optional[List[int]]
+    """
+    n = len(line)
+    k = len(clues)
+    #a complete line only has to match its clues
+    if UNKNOWN not in line:
+        return list(line) if line_segments(line) == tuple(clues) else None
+    free, not_filled, forward = _prefix_tables(clues, line)
+    if not forward[k][n]:
+        return None
+
+    #backward[j][i]: line[i:n] holds blocks j..k-1 and the rest of the suffix is empty
+    backward = [[False]*(n+2) for _ in range(k+1)]
+    row = backward[k]
+    row[n] = True
+    for i in range(n-1, -1, -1):
+        if not not_filled[i]:
+            break
+        row[i] = True
+    for j in range(k-1, -1, -1):
+        length = clues[j]
+        row = backward[j]
+        nxt = backward[j+1]
+        last = j == k-1
+        for i in range(n-length, -1, -1):
+            if row[i+1] and not_filled[i]:
+                row[i] = True
+                continue
+            if free[i] < length:
+                continue
+            end = i + length
+            if end == n:
+                row[i] = last
+            else:
+                row[i] = not_filled[end] and nxt[end+1]
+
+    can_empty = [False]*n
+    for j in range(k+1):
+        fwd = forward[j]
+        bwd = backward[j]
+        for i in range(n):
+            if fwd[i] and bwd[i+1] and not_filled[i]:
+                can_empty[i] = True
+
+    #difference array of cells covered by at least one valid block placement
+    cover = [0]*(n+1)
+    for j in range(k):
+        length = clues[j]
+        fwd = forward[j]
+        bwd = backward[j+1]
+        last = j == k-1
+        for start in range(n-length+1):
+            if free[start] < length:
+                continue
+            if start == 0:
+                if j != 0:
+                    continue
+            elif not (not_filled[start-1] and fwd[start-1]):
+                continue
+            end = start + length
+            if end == n:
+                if not last:
+                    continue
+            elif not (not_filled[end] and bwd[end+1]):
+                continue
+            cover[start] += 1
+            cover[end] -= 1
+
+    result = list(line)
+    covered = 0
+    for i in range(n):
+        covered += cover[i]
+        if covered > 0:
+            if not can_empty[i]:
+                result[i] = FILLED
+        elif can_empty[i]:
+            result[i] = CROSSED
+        else:
+            return None
+    return result
+
+def solve_color_line(clues: Sequence[Tuple[int, int]], line: Sequence[int]) -> Optional[List[int]]:
+    """Deduces every cell of a colored line that is the same in all placements of its clues.
+
+    Same prefix and suffix dynamic programming as :func:`solve_line`, with free cells counted per color.
+    Neighbouring blocks of different colors need no crossed cell between them. Cells are only set when a
+    single value (a color or crossed) is left.
+
+    :param clues: (length, color) of the blocks of the line (without zero lengths).
+    :type clues: Sequence[Tuple[int, int]]
+    :param line: Current cell values (-1, 0 or a color).
+    :type line: Sequence[int]
+    :return: Line with all deducible cells set, or None if the line can't be completed.
+    :rtype: Optional[List[int]]
+    """
+    n = len(line)
+    k = len(clues)
+    if UNKNOWN not in line:
+        return list(line) if color_line_segments(line) == tuple(clues) else None
+    can_cross = [value == CROSSED or value == UNKNOWN for value in line]
+    #free[c][i] is the number of cells from i on that can have color c
+    free = {}
+    for _, color in clues:
+        if color not in free:
+            counts = [0]*(n+1)
+            for i in range(n-1, -1, -1):
+                counts[i] = counts[i+1] + 1 if line[i] == color or line[i] == UNKNOWN else 0
+            free[color] = counts
+    #gap[j] is 1 when block j and block j-1 have the same color and need a crossed cell between them
+    gap = [0] + [int(clues[j][1] == clues[j-1][1]) for j in range(1, k)]
+
+    #forward[j][i]: line[0:i] holds blocks 0..j-1 and the rest of the prefix is crossed
+    forward = [[False]*(n+1) for _ in range(k+1)]
+    row = forward[0]
+    row[0] = True
+    for i in range(1, n+1):
+        if not can_cross[i-1]:
+            break
+        row[i] = True
+    for j in range(1, k+1):
+        length, color = clues[j-1]
+        counts = free[color]
+        row = forward[j]
+        prev = forward[j-1]
+        before = gap[j-1]
+        for i in range(length, n+1):
+            if row[i-1] and can_cross[i-1]:
+                row[i] = True
+                continue
+            start = i - length
+            if counts[start] < length:
+                continue
+            if before:
+                row[i] = start > 0 and can_cross[start-1] and prev[start-1]
+            else:
+                row[i] = prev[start]
+    if not forward[k][n]:
+        return None
+
+    #backward[j][i]: line[i:n] holds blocks j..k-1 and the rest of the suffix is crossed
+    backward = [[False]*(n+2) for _ in range(k+1)]
+    row = backward[k]
+    row[n] = True
+    for i in range(n-1, -1, -1):
+        if not can_cross[i]:
+            break
+        row[i] = True
+    for j in range(k-1, -1, -1):
+        length, color = clues[j]
+        counts = free[color]
+        row = backward[j]
+        nxt = backward[j+1]
+        after = gap[j+1] if j+1 < k else 0
+        for i in range(n-length, -1, -1):
+            if row[i+1] and can_cross[i]:
+                row[i] = True
+                continue
+            if counts[i] < length:
+                continue
+            end = i + length
+            if after:
+                row[i] = end < n and can_cross[end] and nxt[end+1]
+            else:
+                row[i] = nxt[end]
+
+    crossable = [False]*n
+    for j in range(k+1):
+        fwd = forward[j]
+        bwd = backward[j]
+        for i in range(n):
+            if fwd[i] and bwd[i+1] and can_cross[i]:
+                crossable[i] = True
+
+    #difference arrays of cells covered by a valid placement of a block, one per color
+    cover = {color: [0]*(n+1) for color in free}
+    for j in range(k):
+        length, color = clues[j]
+        counts = free[color]
+        fwd = forward[j]
+        bwd = backward[j+1]
+        before = gap[j]
+        after = gap[j+1] if j+1 < k else 0
+        diff = cover[color]
+        for start in range(n-length+1):
+            if counts[start] < length:
+                continue
+            if before:
+                if not (start > 0 and can_cross[start-1] and fwd[start-1]):
+                    continue
+            elif not fwd[start]:
+                continue
+            end = start + length
+            if after:
+                if not (end < n and can_cross[end] and bwd[end+1]):
+                    continue
+            elif not bwd[end]:
+                continue
+            diff[start] += 1
+            diff[end] -= 1
+
+    result = list(line)
+    covered = {color: 0 for color in cover}
+    for i in range(n):
+        options = 1 if crossable[i] else 0
+        value = CROSSED
+        for color, diff in cover.items():
+            covered[color] += diff[i]
+            if covered[color] > 0:
+                options += 1
+                value = color
+        if options == 0:
+            return None
+        if options == 1:
+            result[i] = value
+    return result
+
+def solve_line_cached(clues: Tuple[int, ...], line: List[int],
+                      cache: pyNonogram.line_cache.LineCache) -> Optional[List[int]]:
+    """Same as :func:`solve_line` (:func:`solve_color_line` for colored clues), looking the result up in cache first.
+
+    :param clues: Block lengths of the line (without zeros), or (length, color) pairs.
+    :type clues: Tuple[int, ...]
+    :param line: Current cell values (0, 1 or -1, or colors).
+    :type line: List[int]
+    :param cache: Line solver memo.
+    :type cache: LineCache
+    :return: Line with all deducible cells set, or None if the line can't be completed.
+    :rtype: Optional[List[int]]
+    """
+    solve = solve_color_line if is_colored(clues) else solve_line
+    if cache.maxsize == 0:
+        return solve(clues, line)
+    key = (clues, pyNonogram.line_cache.pack_line(line))
+    packed = cache.get(key)
+    if packed is not None:
+        if packed == pyNonogram.line_cache.CONTRADICTION:
+            return None
+        return pyNonogram.line_cache.unpack_line(packed)
+    result = solve(clues, line)
+    cache.put(key, pyNonogram.line_cache.CONTRADICTION if result is None else pyNonogram.line_cache.pack_line(result))
+    return result
+
+def _fill(seeds: int, through: int) -> int:
+    """Returns seeds grown towards higher bits over consecutive set bits of through (Kogge-Stone fill)."""
+    shift = 1
+    while through:
+        seeds |= through & (seeds << shift)
+        through &= through << shift
+        shift <<= 1
+    return seeds
+
+def _runs_of(free: int, length: int) -> int:
+    """Returns a mask of positions s where bits s to s+length-1 of free are all set."""
+    starts = free
+    done = 1
+    while done < length:
+        step = min(done, length - done)
+        starts &= starts >> step
+        done += step
+    return starts
+
+def _smear(starts: int, length: int) -> int:
+    """Returns a mask of bits s to s+length-1 for every set bit s of starts."""
+    cover = starts
+    done = 1
+    while done < length:
+        step = min(done, length - done)
+        cover |= cover << step
+        done += step
+    return cover
+
+def _reverse(mask: int, size: int) -> int:
+    """Returns the lowest size bits of mask in reverse order."""
+    if size == 0:
+        return 0
+    return int(format(mask & ((1 << size) - 1), '0{}b'.format(size))[::-1], 2)
+
+def _mask_bits(mask: int) -> Iterable[int]:
+    """Yields positions of set bits in mask."""
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+def _mask_prefixes(clues: Sequence[int], can_fill: int, can_cross: int,
+                   size: int) -> Optional[Tuple[List[int], List[int]]]:
+    """Prefix pass of :func:`solve_line_masks`, the mask counterpart of :func:`_prefix_tables`.
+
+    starts[j] has bit s set when block j can start at s after blocks 0..j-1, prefixes[j] has bit q set
+    when cells 0..q-1 can hold blocks 0..j-1 with every other cell crossed.
+
+    :return: (starts, prefixes), None if the line can't be completed.
+    """
+    #bit q of gap is set when cell q-1 can be crossed, prefixes grow over it
+    gap = can_cross << 1
+    prefix = _fill(1, gap)
+    starts = []
+    prefixes = [prefix]
+    for j, length in enumerate(clues):
+        #a block after another one needs a crossed cell before it
+        start = prefix if j == 0 else (prefix & can_cross) << 1
+        start &= _runs_of(can_fill, length)
+        if not start:
+            return None
+        prefix = _fill(start << length, gap)
+        starts.append(start)
+        prefixes.append(prefix)
+    if not prefix >> size & 1:
+        return None
+    return starts, prefixes
+
+def line_feasible_masks(clues: Sequence[int], filled: int, crossed: int, size: int) -> bool:
+    """Same as :func:`line_feasible` for a line given as masks, bit i is cell i.
+
+    :param clues: Block lengths of the line (without zeros).
+    :type clues: Sequence[int]
+    :param filled: Mask of filled cells.
+    :type filled: int
+    :param crossed: Mask of crossed cells.
+    :type crossed: int
+    :param size: Number of cells in the line.
+    :type size: int
+    :rtype: bool
+    """
+    full = (1 << size) - 1
+    return _mask_prefixes(clues, full & ~crossed, full & ~filled, size) is not None
+
+def solve_line_masks(clues: Sequence[int], filled: int, crossed: int, size: int) -> Optional[Tuple[int, int]]:
+    """Same as :func:`solve_line` for a line given as masks, bit i is cell i.
+
+    The prefix and suffix passes work on whole lines with shifts and ANDs, O(clue count x log of line
+    length) big int operations instead of O(line length x clue count) list steps.
+
+    :param clues: Block lengths of the line (without zeros).
+    :type clues: Sequence[int]
+    :param filled: Mask of filled cells.
+    :type filled: int
+    :param crossed: Mask of crossed cells.
+    :type crossed: int
+    :param size: Number of cells in the line.
+    :type size: int
+    :return: (filled mask, crossed mask) with all deducible cells set, or None if the line can't be completed.
+    :rtype: Optional[Tuple[int, int]]
+    """
+    full = (1 << size) - 1
+    can_fill = full & ~crossed
+    can_cross = full & ~filled
+    forward = _mask_prefixes(clues, can_fill, can_cross, size)
+    if forward is None:
+        return None
+    #the suffix pass is the prefix pass of the reversed line
+    backward = _mask_prefixes(clues[::-1], _reverse(can_fill, size), _reverse(can_cross, size), size)
+    starts, prefixes = forward
+    back_starts, back_prefixes = backward
+    k = len(clues)
+    cover = 0
+    for j, length in enumerate(clues):
+        #block j starting at s in the reversed line starts at size-s-length in the line
+        valid = starts[j] & (_reverse(back_starts[k-1-j], size) >> (length - 1))
+        cover |= _smear(valid, length)
+    crossable = 0
+    for j in range(k+1):
+        #cell c is crossed between blocks j-1 and j when cells before it hold blocks 0..j-1 and cells after it blocks j..k-1
+        crossable |= prefixes[j] & _reverse(back_prefixes[k-j], size)
+    crossable &= can_cross
+    return full & ~crossable, full & ~cover
+
+def solve_line_masks_cached(clues: Tuple[int, ...], filled: int, crossed: int, size: int,
+                            cache: pyNonogram.line_cache.LineCache) -> Optional[Tuple[int, int]]:
+    """Same as :func:`solve_line_masks`, looking the result up in cache first.
+
+    :param clues: Block lengths of the line (without zeros).
+    :type clues: Tuple[int, ...]
+    :param filled: Mask of filled cells.
+    :type filled: int
+    :param crossed: Mask of crossed cells.
+    :type crossed: int
+    :param size: Number of cells in the line.
+    :type size: int
+    :param cache: Line solver memo.
+    :type cache: LineCache
+    :return: (filled mask, crossed mask) with all deducible cells set, or None if the line can't be completed.
+    :rtype: Optional[Tuple[int, int]]
+    """
+    if cache.maxsize == 0:
+        return solve_line_masks(clues, filled, crossed, size)
+    key = (clues, size, filled, crossed)
+    result = cache.get(key)
+    if result is not None:
+        if result == pyNonogram.line_cache.CONTRADICTION:
+            return None
+        return result
+    result = solve_line_masks(clues, filled, crossed, size)
+    cache.put(key, pyNonogram.line_cache.CONTRADICTION if result is None else result)
+    return result
+
+def propagate(grid, rows: Sequence[Sequence[int]], columns: Sequence[Sequence[int]],
+              dirty_rows: Optional[Sequence[int]] = None, dirty_cols: Optional[Sequence[int]] = None,
+              trail: Optional[List[Tuple[int, int]]] = None,
+              cache: Optional[pyNonogram.line_cache.LineCache] = None, stats=None) -> int:
+    """Runs the line solver over rows and columns until nothing more can be deduced.
+
+    Only lines touched by the last deduction are put back on the work queue.
+
+    :param grid: Grid that is updated in place.
+    :type grid: NonogramGrid or BitsetGrid
+    :param rows: Row clues.
+    :type rows: Sequence[Sequence[int]]
+    :param columns: Column clues.
+    :type columns: Sequence[Sequence[int]]
+    :param dirty_rows: Rows to start with, defaults to all rows.
+    :type dirty_rows: Optional[Sequence[int]]
+    :param dirty_cols: Columns to start with, defaults to all columns.
+    :type dirty_cols: Optional[Sequence[int]]
+    :param trail: List (y, x) of every deduced cell is appended to, used to undo deductions, defaults to None
+    :type trail: Optional[List[Tuple[int, int]]]
+    :param cache: Line solver memo, defaults to the cache shared by the process
+    :type cache: Optional[LineCache]
+    :param stats: Counters lines, cells, rounds, multi_block and cache lookups are added to, defaults to None
+    :type stats: Optional[Stats]
+    :raises Contradiction: When a line can't be completed.
+    :return: Number of cells deduced.
+    :rtype: int
+    """
+    height, width = grid.shape
+    if cache is None:
+        cache = pyNonogram.line_cache.shared_cache
+    #bitset grids are solved on their masks, other grids on lists of values
+    masks = hasattr(grid, 'get_row_masks')
+    row_clues = [normalize_clues(clues) for clues in rows]
+    col_clues = [normalize_clues(clues) for clues in columns]
+    if dirty_rows is None:
+        dirty_rows = range(height)
+    if dirty_cols is None:
+        dirty_cols = range(width)
+
+    #work queue of (is_row, index), queued marks lines already waiting in the queue
+    queue = deque()
+    row_queued = [False]*height
+    col_queued = [False]*width
+    for y in dirty_rows:
+        if not row_queued[y]:
+            row_queued[y] = True
+            queue.append((True, y))
+    for x in dirty_cols:
+        if not col_queued[x]:
+            col_queued[x] = True
+            queue.append((False, x))
+
+    deduced = 0
+    #lines queued when a round starts are solved in it, lines they queue belong to the next round
+    processed = 0
+    rounds = 0
+    round_end = 0
+    multi_block = 0
+    if stats is not None:
+        hits, misses = cache.hits, cache.misses
+    try:
+        while queue:
+            if processed == round_end:
+                rounds += 1
+                round_end = processed + len(queue)
+            processed += 1
+            is_row, idx = queue.popleft()
+            if is_row:
+                row_queued[idx] = False
+                clues = row_clues[idx]
+            else:
+                col_queued[idx] = False
+                clues = col_clues[idx]
+            if masks:
+                filled, crossed = grid.get_row_masks(idx) if is_row else grid.get_col_masks(idx)
+                result = solve_line_masks_cached(clues, filled, crossed, width if is_row else height, cache)
+            else:
+                line = (grid.get_row(idx) if is_row else grid.get_col(idx)).tolist()
+                result = solve_line_cached(clues, line, cache)
+            if result is None:
+                raise pyNonogram.errors.Contradiction('{} {} can not be completed'.format('Row' if is_row else 'Column', idx),
+                                                      [('row' if is_row else 'column', idx)])
+            if masks:
+                changed = list(_mask_bits((result[0] ^ filled) | (result[1] ^ crossed)))
+            else:
+                changed = [i for i in range(len(line)) if line[i] != result[i]]
+            if not changed:
+                continue
+            deduced += len(changed)
+            if stats is not None and len(clues) > 1:
+                #only deductions on lines that already had known cells count
+                known = (filled | crossed) != 0 if masks else line.count(UNKNOWN) != len(line)
+                if known:
+                    multi_block += 1
+            if is_row:
+                if masks:
+                    grid.set_row_masks(idx, *result)
+                else:
+                    grid.set_row(idx, result)
+                if trail is not None:
+                    trail.extend((idx, x) for x in changed)
+                for x in changed:
+                    if not col_queued[x]:
+                        col_queued[x] = True
+                        queue.append((False, x))
+            else:
+                if masks:
+                    grid.set_col_masks(idx, *result)
+                else:
+                    grid.set_col(idx, result)
+                if trail is not None:
+                    trail.extend((y, idx) for y in changed)
+                for y in changed:
+                    if not row_queued[y]:
+                        row_queued[y] = True
+                        queue.append((True, y))
+    finally:
+        if stats is not None:
+            stats.lines += processed
+            stats.cells += deduced
+            stats.rounds += rounds
+            stats.multi_block += multi_block
+            stats.cache_hits += cache.hits - hits
+            stats.cache_misses += cache.misses - misses
+    return deduced
+
+def undo(grid, trail: List[Tuple[int, int]], mark: int) -> None:
+    """Resets cells recorded in trail after position mark to unknown and shortens the trail.
+
+    :param grid: Grid the trail was recorded on.
+    :type grid: NonogramGrid
+    :param trail: Cells (y, x) set since the search started.
+    :type trail: List[Tuple[int, int]]
+    :param mark: Length of the trail to go back to.
+    :type mark: int
+    """
+    if len(trail) > mark:
+        ys, xs = zip(*trail[mark:])
+        grid[ys, xs] = UNKNOWN
+        del trail[mark:]
+
+def pick_cell(grid) -> Optional[Tuple[int, int]]:
+    """Returns an unknown cell of the most constrained line, the line with the fewest unknown cells.
+
+    :param grid: Grid to pick from.
+    :type grid: NonogramGrid
+    :return: (y, x) of the cell, None if the grid has no unknown cells.
+    :rtype: Optional[Tuple[int, int]]
+    """
+    unknown = np.asarray(grid) == UNKNOWN
+    row_counts = unknown.sum(axis=1)
+    col_counts = unknown.sum(axis=0)
+    #lines without unknown cells can't be branched on
+    row_counts[row_counts == 0] = unknown.shape[1] + 1
+    col_counts[col_counts == 0] = unknown.shape[0] + 1
+    y = int(np.argmin(row_counts))
+    x = int(np.argmin(col_counts))
+    if row_counts[y] > unknown.shape[1]:
+        return None
+    if row_counts[y] <= col_counts[x]:
+        return y, int(np.argmax(unknown[y]))
+    return int(np.argmax(unknown[:, x])), x
+
+def probe(grid, rows: Sequence[Sequence[int]], columns: Sequence[Sequence[int]], values: Sequence[int],
+          trail: List[Tuple[int, int]], stats=None) -> Optional[Tuple[int, int]]:
+    """Sets unknown cells whose values all but one propagate into a contradiction, until none is left.
+
+    Only unknown cells on the border or next to a known cell are probed, cells inside unknown areas
+    rarely lead to a contradiction. Every probe is undone, forced cells are recorded on the trail.
+
+    :param grid: Grid that is updated in place.
+    :type grid: NonogramGrid
+    :param rows: Normalized row clues.
+    :type rows: Sequence[Sequence[int]]
+    :param columns: Normalized column clues.
+    :type columns: Sequence[Sequence[int]]
+    :param values: Values a cell can take, colors and CROSSED.
+    :type values: Sequence[int]
+    :param trail: List (y, x) of every set cell is appended to.
+    :type trail: List[Tuple[int, int]]
+    :param stats: Counters probes and :func:`propagate` of forced cells are added to, defaults to None
+    :type stats: Optional[Stats]
+    :raises Contradiction: Every value of a cell propagates into a contradiction.
+    :return: (y, x) of the cell to branch on, the probed cell whose weakest value deduced the most cells.
+        None if the grid has no unknown cells.
+    :rtype: Optional[Tuple[int, int]]
+    """
+    while True:
+        unknown = np.asarray(grid) == UNKNOWN
+        if not unknown.any():
+            return None
+        near = ~unknown
+        near[1:] |= ~unknown[:-1]
+        near[:-1] |= ~unknown[1:]
+        near[:, 1:] |= ~unknown[:, :-1]
+        near[:, :-1] |= ~unknown[:, 1:]
+        near[[0, -1], :] = True
+        near[:, [0, -1]] = True
+        ys, xs = np.nonzero(unknown & near)
+        best = None
+        best_score = -1
+        forced = False
+        for y, x in zip(ys.tolist(), xs.tolist()):
+            #cells may be set by a cell forced earlier in this pass
+            if grid[y, x] != UNKNOWN:
+                continue
+            possible = []
+            score = None
+            if stats is not None:
+                stats.probes += len(values)
+            for value in values:
+                mark = len(trail)
+                grid[y, x] = value
+                trail.append((y, x))
+                try:
+                    deduced = propagate(grid, rows, columns, dirty_rows=[y], dirty_cols=[x], trail=trail)
+                    possible.append(value)
+                    score = deduced if score is None else min(score, deduced)
+                except pyNonogram.errors.Contradiction:
+                    pass
+                undo(grid, trail, mark)
+            if not possible:
+                raise pyNonogram.errors.Contradiction('Cell ({}, {}) can not be set'.format(x, y))
+            if len(possible) == 1:
+                grid[y, x] = possible[0]
+                trail.append((y, x))
+                propagate(grid, rows, columns, dirty_rows=[y], dirty_cols=[x], trail=trail, stats=stats)
+                forced = True
+            elif score > best_score:
+                best = (y, x)
+                best_score = score
+        #cells forced in this pass may force cells probed before them
+        if not forced:
+            return best
+
+def search(grid, rows: Sequence[Sequence[int]], columns: Sequence[Sequence[int]], limit: Optional[int] = 2,
+           solutions: Optional[List[np.ndarray]] = None, stats=None) -> int:
+    """Counts solutions by guessing cells, propagating and backtracking.
+
+    Cells set while searching are recorded on a trail and reset on backtrack, the grid is only copied
+    when a solution is stored. The grid is restored to its state before the search when done.
+    Every node is probed with :func:`probe` before guessing, the search branches on the cell whose
+    values deduce the most.
+
+    .. note:: Puzzles with wide open areas are still exponential. Random 50x50 puzzles at density
+        0.65 or above take well under a second, at density 0.5 they can take minutes.
+
+    :param grid: Grid to search from.
+    :type grid: NonogramGrid
+    :param rows: Row clues.
+    :type rows: Sequence[Sequence[int]]
+    :param columns: Column clues.
+    :type columns: Sequence[Sequence[int]]
+    :param limit: Stop after this many solutions, None counts all solutions, defaults to 2
+    :type limit: int, optional
+    :param solutions: List found solutions are appended to, defaults to None
+    :type solutions: Optional[List[np.ndarray]]
+    :param stats: Counters guesses, backtracks and those of :func:`propagate` are added to, defaults to None
+    :type stats: Optional[Stats]
+    :raises ValueError: Limit below 1.
+    :return: Number of solutions found, at most limit.
+    :rtype: int
+    """
+    if limit is not None and limit < 1:
+        raise ValueError('Limit must be positive (got {})'.format(limit))
+    rows = [normalize_clues(clues) for clues in rows]
+    columns = [normalize_clues(clues) for clues in columns]
+    trail = []
+    count = 0
+    #colors of colored puzzles are guessed before crossed, as filled is in black and white ones
+    guesses = clue_colors(rows) + [CROSSED]
+    try:
+        propagate(grid, rows, columns, trail=trail, stats=stats)
+    except pyNonogram.errors.Contradiction:
+        undo(grid, trail, 0)
+        return 0
+    #frames of (trail length before guess, y, x, values left to try)
+    stack = []
+    while True:
+        try:
+            cell = probe(grid, rows, columns, guesses, trail, stats)
+        except pyNonogram.errors.Contradiction:
+            if stats is not None:
+                stats.backtracks += 1
+        else:
+            if cell is None:
+                count += 1
+                if solutions is not None:
+                    solutions.append(np.array(grid))
+                if limit is not None and count >= limit:
+                    break
+            else:
+                stack.append((len(trail), cell[0], cell[1], list(guesses)))
+        #try the next value of the deepest guess that has one left
+        while stack:
+            mark, y, x, values = stack[-1]
+            undo(grid, trail, mark)
+            if not values:
+                stack.pop()
+                continue
+            grid[y, x] = values.pop(0)
+            trail.append((y, x))
+            if stats is not None:
+                stats.guesses += 1
+            try:
+                propagate(grid, rows, columns, dirty_rows=[y], dirty_cols=[x], trail=trail, stats=stats)
+                break
+            except pyNonogram.errors.Contradiction:
+                if stats is not None:
+                    stats.backtracks += 1
+                continue
+        else:
+            break
+    undo(grid, trail, 0)
+    return count
\ No newline at end of file
@@ -0,0 +1,100 @@
+#Built-in imports
+import functools
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, Optional
+
+#counters recorded by the solver
+COUNTERS = ('lines', 'cells', 'rounds', 'multi_block', 'cache_hits', 'cache_misses', 'probes', 'guesses', 'backtracks')
+
+class Stats:
+    """Opt-in counters and phase timings of loading, checking and solving.
+
+    Pass an instance as ``stats`` to :class:`Nonogram` (or set ``nonogram.stats``) to record:
+
+    * *lines* -- lines run through the line solver
+    * *cells* -- cells deduced by propagation
+    * *rounds* -- propagation rounds, lines queued by one round are solved in the next one
+    * *multi_block* -- deductions on lines with more than one block that already had known cells
+    * *cache_hits*, *cache_misses* -- line cache lookups
+    * *probes* -- values assumed for single cells while probing
+    * *guesses*, *backtracks* -- cells guessed by search and guesses undone
+    * *times*, *calls* -- seconds spent in and number of calls of load, check_all and solve
+
+    Without stats, instrumented methods only check that ``nonogram.stats`` is None.
+
+    :param callback: Called as callback(phase, seconds, stats) after every timed phase, defaults to None
+    :type callback: Optional[Callable[[str, float, Stats], None]]
+    """
+    def __init__(self, callback: Optional[Callable[[str, float, 'Stats'], None]] = None) -> None:
+        """Creates a new Stats object with all counters at 0.
+        """
+        self.callback = callback
+        self.reset()
+
+    def reset(self) -> None:
+        """Sets all counters and timings back to 0.
+        """
+        for name in COUNTERS:
+            setattr(self, name, 0)
+        self.times = {}
+        self.calls = {}
+
+    def add_time(self, phase: str, seconds: float) -> None:
+        """Adds a call of a phase that took seconds.
+
+        :param phase: Name of the phase.
+        :type phase: str
+        :param seconds: Duration of the call.
+        :type seconds: float
+        """
+        self.times[phase] = self.times.get(phase, 0.0) + seconds
+        self.calls[phase] = self.calls.get(phase, 0) + 1
+        if self.callback is not None:
+            self.callback(phase, seconds, self)
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Times the body of a with statement as a call of a phase.
+
+        :param name: Name of the phase.
+        :type name: str
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_time(name, time.perf_counter() - start)
+
+    def as_dict(self) -> Dict[str, object]:
+        """Returns counters and timings as a dict.
+
+        :rtype: Dict[str, object]
+        """
+        result = {name: getattr(self, name) for name in COUNTERS}
+        result['times'] = dict(self.times)
+        result['calls'] = dict(self.calls)
+        return result
+
+    def __repr__(self) -> str:
+        return 'Stats({})'.format(', '.join('{}={}'.format(name, getattr(self, name)) for name in COUNTERS))
+
+def timed(phase: str) -> Callable:
+    """Decorator timing a method as a phase in ``self.stats`` when it is set.
+
+    :param phase: Name of the phase.
+    :type phase: str
+    """
+    def decorator(method: Callable) -> Callable:
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            stats = self.stats
+            if stats is None:
+                return method(self, *args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return method(self, *args, **kwargs)
+            finally:
+                stats.add_time(phase, time.perf_counter() - start)
+        return wrapper
+    return decorator
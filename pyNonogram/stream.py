@@ -0,0 +1,124 @@
+#Internal imports
+import pyNonogram.errors
+
+#Built-in imports
+import os
+from typing import Iterable, Iterator, List, Optional, Union
+
+#lines of a single nonogram record (author, date, picture, difficulty, width, height, rows, columns, solution)
+RECORD_LINES = 9
+
+def iter_records(path: str) -> Iterator[List[str]]:
+    """Streams raw records from a multi-puzzle file (.nonl).
+
+    A .nonl file holds .non records separated by blank lines. Only one record is kept in memory.
+
+    :param path: Path to multi-puzzle file (.nonl)
+    :type path: str
+    :raises PathException: Invalid path when path is not a file.
+    :raises UnknownFormat: Invalid file format when file does not end with (.nonl) or a record does not have 9 lines.
+    :return: Lines of each record, without trailing newlines.
+    :rtype: Iterator[List[str]]
+    """
+    if not os.path.isfile(path):
+        raise pyNonogram.errors.PathException('Invalid path')
+    if not path.endswith('.nonl'):
+        raise pyNonogram.errors.UnknownFormat('Invalid file format (Expected .nonl got {})'.format(path.split('.')[-1]))
+    record = []
+    with open(path, 'r') as f:
+        for line in f:
+            line = line.rstrip('\n')
+            if line:
+                record.append(line)
+                continue
+            if record:
+                yield _checked(record, path)
+                record = []
+    if record:
+        yield _checked(record, path)
+
+def iter_nonograms(path: str) -> Iterator:
+    """Streams loaded nonograms from a multi-puzzle file (.nonl), see :func:`iter_records`.
+
+    :param path: Path to multi-puzzle file (.nonl)
+    :type path: str
+    :return: Loaded nonograms.
+    :rtype: Iterator[Nonogram]
+    """
+    #imported here so raw record streaming does not import numpy
+    import pyNonogram.nonogram
+    for record in iter_records(path):
+        nonogram = pyNonogram.nonogram.Nonogram()
+        nonogram.load_lines(record)
+        yield nonogram
+
+def write_nonograms(path: str, nonograms: Iterable[Union[List[str], object]]) -> int:
+    """Writes nonograms or raw records to a multi-puzzle file (.nonl).
+
+    :param path: Path to multi-puzzle file (.nonl)
+    :type path: str
+    :param nonograms: Loaded Nonogram objects or records as returned by :func:`iter_records`.
+    :type nonograms: Iterable[Union[List[str], Nonogram]]
+    :raises UnknownFormat: Invalid file format when file does not end with (.nonl) or a record does not have 9 lines.
+    :return: Number of records written.
+    :rtype: int
+    """
+    if not path.endswith('.nonl'):
+        raise pyNonogram.errors.UnknownFormat('Invalid file format (Expected .nonl got {})'.format(path.split('.')[-1]))
+    count = 0
+    with open(path, 'w') as f:
+        for nonogram in nonograms:
+            record = nonogram if isinstance(nonogram, list) else nonogram.to_lines()
+            if count:
+                f.write('\n')
+            f.write('\n'.join(_checked(record, path)))
+            f.write('\n')
+            count += 1
+        #callers replace files with the written one, data must be on disk before the rename
+        f.flush()
+        os.fsync(f.fileno())
+    return count
+
+def pack(paths: Iterable[str], path: str) -> int:
+    """Packs nonogram files (.non) into a multi-puzzle file (.nonl) without parsing them.
+
+    :param paths: Paths to nonogram files (.non)
+    :type paths: Iterable[str]
+    :param path: Path to multi-puzzle file (.nonl)
+    :type path: str
+    :return: Number of records written.
+    :rtype: int
+    """
+    def records() -> Iterator[List[str]]:
+        for non_path in paths:
+            with open(non_path, 'r') as f:
+                #records never hold blank lines, they would split the record in a .nonl file
+                yield _checked([line.rstrip('\n') for line in f if line.strip()], non_path)
+    return write_nonograms(path, records())
+
+def unpack(path: str, directory: str, name_format: Optional[str] = '{:06d}.non') -> List[str]:
+    """Unpacks a multi-puzzle file (.nonl) into one nonogram file (.non) per record.
+
+    :param path: Path to multi-puzzle file (.nonl)
+    :type path: str
+    :param directory: Directory to write nonogram files to, created if missing.
+    :type directory: str
+    :param name_format: File name format, formatted with the record number, defaults to '{:06d}.non'
+    :type name_format: str, optional
+    :return: Paths of written files.
+    :rtype: List[str]
+    """
+    os.makedirs(directory, exist_ok=True)
+    written = []
+    for idx, record in enumerate(iter_records(path)):
+        non_path = os.path.join(directory, name_format.format(idx))
+        with open(non_path, 'w') as f:
+            f.write('\n'.join(record))
+        written.append(non_path)
+    return written
+
+def _checked(record: List[str], path: str) -> List[str]:
+    """Returns record if it has the number of lines of a nonogram record."""
+    if len(record) != RECORD_LINES:
+        raise pyNonogram.errors.UnknownFormat('Invalid file format (Record with {} lines in {})'.format(len(record), path))
+    return record
@@ -91,6 +91,7 @@ setup(name='pyNonogram',
       keywords='nonogram nonograms griddlers picross pic-a-pix paintbynumbers puzzle puzzles',
       packages=['pyNonogram'],
       install_requires=requirements,
+      entry_points={'console_scripts': ['pynonogram=pyNonogram.cli:main']},
       cmdclass={'test': PyTest, 'publish': Publish},
       tests_require=test_requirements,
       include_package_data=True
@@ -0,0 +1,67 @@
+import pytest
+import pyNonogram.archive as archive
+import pyNonogram.nonogram as nonogram
+import pyNonogram.errors as errors
+
+test_paths = ["tests/test_nonograms/test1.non", "tests/test_nonograms/test2.non", "examples/house.non"]
+
+def load_all():
+    nonograms = []
+    for path in test_paths:
+        nonogram_object = nonogram.Nonogram()
+        nonogram_object.load(path)
+        nonograms.append(nonogram_object)
+    return nonograms
+
+def test_varint_roundtrip():
+    for value in [0, 1, 127, 128, 300, 2**40]:
+        out = bytearray()
+        archive._write_varint(out, value)
+        assert archive._read_varint(out, 0) == (value, len(out))
+
+def test_encode_decode():
+    for nonogram_object in load_all():
+        decoded = archive.decode(archive.encode(nonogram_object))
+        assert decoded.to_lines() == nonogram_object.to_lines()
+
+def test_write_and_read_archive(tmp_path):
+    path = str(tmp_path / "corpus.nona")
+    nonograms = load_all()
+    assert archive.write_archive(path, nonograms) == 3
+    with archive.NonogramArchive(path) as nonogram_archive:
+        assert len(nonogram_archive) == 3
+        assert nonogram_archive[2].to_lines() == nonograms[2].to_lines()
+        assert nonogram_archive[-3].author == "Test Author"
+        assert [item.to_lines() for item in nonogram_archive] == [item.to_lines() for item in nonograms]
+
+def test_archive_index_error(tmp_path):
+    path = str(tmp_path / "corpus.nona")
+    archive.write_archive(path, load_all())
+    with archive.NonogramArchive(path) as nonogram_archive:
+        with pytest.raises(IndexError):
+            nonogram_archive[3]
+
+def test_archive_solution(tmp_path):
+    path = str(tmp_path / "corpus.nona")
+    archive.write_archive(path, load_all())
+    with archive.NonogramArchive(path) as nonogram_archive:
+        nonogram_object = nonogram_archive[0]
+        nonogram_object.load_solution()
+        assert nonogram_object.is_solved()
+        assert nonogram_archive[2].solution is None
+
+def test_write_archive_invalid_extension(tmp_path):
+    with pytest.raises(errors.UnknownFormat):
+        archive.write_archive(str(tmp_path / "corpus.non"), load_all())
+
+def test_archive_invalid_file():
+    with pytest.raises(errors.UnknownFormat):
+        archive.NonogramArchive(test_paths[0])
+
+def test_archive_invalid_path():
+    with pytest.raises(errors.PathException):
+        archive.NonogramArchive("tests/test_nonograms/missing.nona")
+
+def test_encode_colored():
+    with pytest.raises(errors.UnknownFormat):
+        archive.encode(nonogram.Nonogram.from_solution([[1,2],[0,2]]))
@@ -0,0 +1,63 @@
+import pytest
+import pyNonogram.batch as batch
+import pyNonogram.nonogram as nonogram
+
+test_path = "tests/test_nonograms/test1.non"
+solution = "001000111011011011100010000100"
+
+def test_describe():
+    nonogram_object = nonogram.Nonogram(path=test_path)
+    nonogram_object.load()
+    assert batch.describe(nonogram_object) == (5, 6, nonogram_object.rows, nonogram_object.columns)
+
+def test_solve_description_path():
+    assert batch.solve_description(test_path) == (batch.SOLVED, solution)
+
+def test_solve_description_partial():
+    assert batch.solve_description((2, 2, [[1],[1]], [[1],[1]])) == (batch.PARTIAL, None)
+
+def test_solve_description_contradiction():
+    assert batch.solve_description((2, 2, [[2],[2]], [[1],[1]])) == (batch.CONTRADICTION, None)
+
+def test_solve_description_colored():
+    nonogram_object = nonogram.Nonogram.from_solution([[1,1,2],[0,0,2]])
+    description = batch.describe(nonogram_object)
+    assert description == (3, 2, [((2,1), (1,2)), ((1,2),)], [((1,1),), ((1,1),), ((2,2),)])
+    assert batch.solve_description(description) == (batch.SOLVED, "112002")
+
+def test_solve_description_error():
+    assert batch.solve_description("tests/test_nonograms/missing.non") == (batch.ERROR, None)
+
+def test_solve_many_in_process():
+    nonogram_object = nonogram.Nonogram(path=test_path)
+    nonogram_object.load()
+    results = list(batch.solve_many([test_path, nonogram_object, (2, 2, [[1],[1]], [[1],[1]])], workers=0, chunksize=2))
+    assert results == [(0, batch.SOLVED, solution), (1, batch.SOLVED, solution), (2, batch.PARTIAL, None)]
+
+def test_solve_many_pool():
+    paths = [test_path]*10
+    results = list(batch.solve_many(paths, workers=2, chunksize=3))
+    assert [idx for idx, _, _ in results] == list(range(10))
+    assert all(status == batch.SOLVED for _, status, _ in results)
+
+def test_solve_many_unordered():
+    results = list(batch.solve_many([test_path]*10, workers=2, chunksize=3, ordered=False))
+    assert sorted(idx for idx, _, _ in results) == list(range(10))
+
+def test_solve_many_invalid_chunksize():
+    with pytest.raises(ValueError):
+        list(batch.solve_many([test_path], chunksize=0))
+
+def test_solve_many_streams_input():
+    taken = []
+    def puzzles():
+        for i in range(100):
+            taken.append(i)
+            yield test_path
+    for ordered in (True, False):
+        taken.clear()
+        results = batch.solve_many(puzzles(), workers=2, chunksize=3, ordered=ordered)
+        next(results)
+        #two chunks per worker are in flight when the first result comes back
+        assert len(taken) <= 4*3
+        results.close()
@@ -0,0 +1,133 @@
+import pytest
+import numpy as np
+import pyNonogram.bitset_grid as bitset_grid
+import pyNonogram.nonogram_grid as nonogram_grid
+import pyNonogram.errors as errors
+
+shape = (5,5)
+
+def test_object_init_values():
+    bitset_grid_object = bitset_grid.BitsetGrid(shape)
+    assert np.all(bitset_grid_object.to_array() == 0)
+
+def test_mask_runs():
+    assert bitset_grid._mask_runs(0b0110111) == [3, 2]
+    assert bitset_grid._mask_runs(0) == []
+
+def test_set_cell():
+    bitset_grid_object = bitset_grid.BitsetGrid(shape)
+    bitset_grid_object.set_cell(1,3,1)
+    bitset_grid_object.set_cell(2,3,-1)
+    assert bitset_grid_object.get_row_masks(3) == (0b10, 0b100)
+    assert bitset_grid_object.get_col_masks(1) == (0b1000, 0)
+    assert bitset_grid_object.get_cell(1,3) == 1
+    assert bitset_grid_object.get_cell(2,3) == -1
+    bitset_grid_object.set_cell(1,3,0)
+    assert bitset_grid_object.get_cell(1,3) == 0
+
+def test_set_cell_invalid_value():
+    bitset_grid_object = bitset_grid.BitsetGrid(shape)
+    with pytest.raises(ValueError):
+        bitset_grid_object.set_cell(0,0,2)
+
+def test_get_cell_invalid_index():
+    bitset_grid_object = bitset_grid.BitsetGrid(shape)
+    with pytest.raises(IndexError):
+        bitset_grid_object.get_cell(20,0)
+
+def test_get_row_and_col():
+    bitset_grid_object = bitset_grid.BitsetGrid(shape)
+    bitset_grid_object.set_cell(0,0,1)
+    bitset_grid_object.set_cell(0,2,-1)
+    assert np.all(bitset_grid_object.get_row(0) == [1,0,0,0,0])
+    assert np.all(bitset_grid_object.get_col(0) == [1,0,-1,0,0])
+    assert bitset_grid_object.get_row(0).dtype == np.int8
+
+def test_fill_row():
+    bitset_grid_object = bitset_grid.BitsetGrid(shape)
+    bitset_grid_object.set_cell(1,0,-1)
+    bitset_grid_object.fill_row(0,1,with_overwritting=False)
+    assert np.all(bitset_grid_object.get_row(0) == [1,-1,1,1,1])
+    assert np.all(bitset_grid_object.get_col(2) == [1,0,0,0,0])
+    bitset_grid_object.fill_row(0,-1)
+    assert np.all(bitset_grid_object.get_row(0) == [-1,-1,-1,-1,-1])
+
+def test_fill_col():
+    bitset_grid_object = bitset_grid.BitsetGrid(shape)
+    bitset_grid_object.fill_col(3,1)
+    assert np.all(bitset_grid_object.get_col(3) == [1,1,1,1,1])
+    assert np.all(bitset_grid_object.get_row(4) == [0,0,0,1,0])
+
+def test_fill_invalid_value():
+    bitset_grid_object = bitset_grid.BitsetGrid(shape)
+    with pytest.raises(ValueError):
+        bitset_grid_object.fill_row(0,2)
+    with pytest.raises(IndexError):
+        bitset_grid_object.fill_col(20,1)
+
+def test_set_row():
+    bitset_grid_object = bitset_grid.BitsetGrid(shape)
+    bitset_grid_object.set_row(2, [1,-1,0,1,1])
+    assert np.all(bitset_grid_object.get_row(2) == [1,-1,0,1,1])
+    assert bitset_grid_object.get_col(1)[2] == -1
+    assert bitset_grid_object.pop_dirty() == ({2}, {0,1,3,4})
+
+def test_set_row_invalid():
+    bitset_grid_object = bitset_grid.BitsetGrid(shape)
+    with pytest.raises(ValueError):
+        bitset_grid_object.set_row(0, [1,2,0,0,0])
+    with pytest.raises(ValueError):
+        bitset_grid_object.set_row(0, [1])
+
+def test_segments_match_nonogram_grid():
+    values = np.random.default_rng(0).integers(-1, 2, (6,7))
+    bitset_grid_object = bitset_grid.BitsetGrid((6,7))
+    nonogram_grid_object = nonogram_grid.NonogramGrid((6,7))
+    nonogram_grid_object[:] = values
+    for y in range(6):
+        bitset_grid_object.set_row(y, values[y])
+    assert np.all(bitset_grid_object.to_array() == values)
+    assert bitset_grid_object.all_row_segments() == nonogram_grid_object.all_row_segments()
+    assert bitset_grid_object.all_col_segments() == nonogram_grid_object.all_col_segments()
+    for name in ['row_runs', 'col_runs']:
+        for mine, other in zip(getattr(bitset_grid_object, name)(), getattr(nonogram_grid_object, name)()):
+            assert np.array_equal(mine, other)
+
+def test_array_and_copy():
+    bitset_grid_object = bitset_grid.BitsetGrid(shape)
+    bitset_grid_object.fill(1)
+    copy = bitset_grid_object.copy()
+    copy.set_cell(0,0,0)
+    assert np.all(np.asarray(bitset_grid_object) == 1)
+    assert np.asarray(copy)[0,0] == 0
+
+def test_str():
+    bitset_grid_object = bitset_grid.BitsetGrid(shape)
+    assert str(bitset_grid_object) == np.zeros(shape, dtype=np.int8).__str__()
+
+def test_bulk_mutators_match_nonogram_grid():
+    bitset_grid_object = bitset_grid.BitsetGrid(shape)
+    nonogram_grid_object = nonogram_grid.NonogramGrid(shape)
+    mask = np.eye(5, dtype=bool)
+    for grid in [bitset_grid_object, nonogram_grid_object]:
+        grid.set_cells([0,4,2], [1,3,2], [1,-1,1])
+        grid.fill_rect(1, 0, 3, 2, -1, False)
+        grid.apply_mask(mask, 1)
+    assert np.all(bitset_grid_object.to_array() == nonogram_grid_object)
+    assert bitset_grid_object.pop_dirty() == nonogram_grid_object.pop_dirty()
+
+def test_set_cells_invalid():
+    bitset_grid_object = bitset_grid.BitsetGrid(shape)
+    with pytest.raises(ValueError):
+        bitset_grid_object.set_cells([0], [0], 2)
+    with pytest.raises(IndexError):
+        bitset_grid_object.set_cells([0], [5], 1)
+
+def test_checked_set_cell():
+    bitset_grid_object = bitset_grid.BitsetGrid((2,3))
+    bitset_grid_object.enable_checks([[1],[2]], [[1],[1],[1]])
+    bitset_grid_object.set_cell(1, 1, 1)
+    bitset_grid_object.set_cell(0, 1, -1)
+    with pytest.raises(errors.Contradiction) as info:
+        bitset_grid_object.set_cell(-1, -1, -1)
+    assert info.value.lines == [('row', 1)]
@@ -0,0 +1,90 @@
+import os
+import shutil
+import subprocess
+import sys
+import pytest
+import pyNonogram.cli as cli
+
+test_dir = "tests/test_nonograms"
+solution = "001000111011011011100010000100"
+
+@pytest.fixture
+def puzzles(tmp_path):
+    directory = tmp_path / "puzzles"
+    shutil.copytree(test_dir, str(directory))
+    return str(directory)
+
+def test_solve(puzzles, capsys):
+    assert cli.main(['solve', puzzles, '--solution']) == 0
+    lines = capsys.readouterr().out.splitlines()
+    assert len(lines) == 2
+    assert lines[0].split('\t') == [os.path.join(puzzles, 'test1.non'), 'solved', solution]
+
+def test_solve_search(puzzles, capsys):
+    assert cli.main(['solve', os.path.join(puzzles, 'test1.non'), '--search', '--solution']) == 0
+    assert capsys.readouterr().out.split('\t')[-1].strip() == solution
+
+def test_solve_missing_file(capsys):
+    assert cli.main(['solve', 'tests/test_nonograms/missing.non']) == 1
+    assert capsys.readouterr().out.split('\t')[1].strip() == 'error'
+
+def test_check(puzzles, capsys):
+    assert cli.main(['check', puzzles]) == 0
+    assert capsys.readouterr().out.count('\tok') == 2
+
+def test_check_mismatch(puzzles, capsys):
+    path = os.path.join(puzzles, 'test1.non')
+    with open(path) as f:
+        lines = f.read().split('\n')
+    lines[-1] = 'solution:' + '1'*30
+    with open(path, 'w') as f:
+        f.write('\n'.join(lines))
+    assert cli.main(['check', path]) == 1
+    assert capsys.readouterr().out.strip().endswith('mismatch')
+
+def test_index(puzzles, capsys):
+    assert cli.main(['index', puzzles, '--where', 'author=Test Author 2']) == 0
+    lines = capsys.readouterr().out.splitlines()
+    assert len(lines) == 1 and lines[0].split('\t')[1] == 'Test Author 2'
+
+def test_index_count(puzzles, capsys):
+    assert cli.main(['index', puzzles, '--where', 'width=5:6', '--count']) == 0
+    assert capsys.readouterr().out.strip() == '2'
+
+def test_index_invalid_filter(puzzles, capsys):
+    assert cli.main(['index', puzzles, '--where', 'colour=red']) == 2
+    assert 'Invalid filter' in capsys.readouterr().err
+
+def test_convert_round_trip(puzzles, tmp_path, capsys):
+    nonl = str(tmp_path / "corpus.nonl")
+    nona = str(tmp_path / "corpus.nona")
+    out = str(tmp_path / "out")
+    assert cli.main(['convert', puzzles, nonl]) == 0
+    assert cli.main(['convert', nonl, nona]) == 0
+    assert cli.main(['convert', nona, out]) == 0
+    assert sorted(os.listdir(out)) == ['000000.non', '000001.non']
+    with open(os.path.join(out, '000000.non')) as f, open(os.path.join(test_dir, 'test1.non')) as g:
+        assert f.read() == g.read()
+
+def test_bench(puzzles, capsys):
+    assert cli.main(['bench', puzzles, '--repeat', '2']) == 0
+    lines = capsys.readouterr().out.splitlines()
+    assert lines[0].startswith('puzzle\t') and len(lines) == 3
+
+def test_bench_invalid_repeat(puzzles, capsys):
+    for repeat in ('0', '-1'):
+        with pytest.raises(SystemExit) as info:
+            cli.main(['bench', puzzles, '--repeat', repeat])
+        assert info.value.code == 2
+        assert '--repeat: must be positive' in capsys.readouterr().err
+
+def test_index_does_not_import_numpy(puzzles):
+    code = "import sys; import pyNonogram.cli as cli; cli.main(['index', sys.argv[1]]); assert 'numpy' not in sys.modules"
+    subprocess.run([sys.executable, '-c', code, puzzles], check=True, stdout=subprocess.DEVNULL)
+
+def test_package_exports():
+    import pyNonogram
+    from pyNonogram import Nonogram, NonogramGrid, NotLoaded
+    assert Nonogram.__module__ == 'pyNonogram.nonogram'
+    with pytest.raises(AttributeError):
+        pyNonogram.Missing
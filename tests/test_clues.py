@@ -0,0 +1,63 @@
+import pytest
+import pyNonogram.clues as clues
+import pyNonogram.errors as errors
+
+def test_line_clues():
+    line = clues.line_clues([2,1], 6)
+    assert line.clues == (2,1)
+    assert line.min_span == 4
+    assert line.slack == 2
+    assert line.earliest == (0,3)
+    assert line.latest == (2,5)
+
+def test_line_clues_empty_line():
+    line = clues.line_clues([0], 4)
+    assert line.clues == () and line.min_span == 0 and line.slack == 4
+
+def test_line_clues_exact_fit():
+    line = clues.line_clues([2,2], 5)
+    assert line.slack == 0 and line.earliest == line.latest
+
+def test_line_clues_negative():
+    with pytest.raises(ValueError):
+        clues.line_clues([-1], 3)
+
+def test_line_clues_immutable():
+    line = clues.line_clues([1], 3)
+    with pytest.raises(AttributeError):
+        line.slack = 0
+
+def test_puzzle_clues():
+    rows, columns = clues.puzzle_clues(2, 2, [[2],[1]], [[2],[1]])
+    assert clues.clue_tuples(rows) == [(2,), (1,)]
+    assert columns[1].slack == 1
+
+def test_puzzle_clues_wrong_line_count():
+    with pytest.raises(errors.InvalidHints):
+        clues.puzzle_clues(2, 3, [[1],[1]], [[1],[1]])
+
+def test_puzzle_clues_line_too_short():
+    with pytest.raises(errors.InvalidHints):
+        clues.puzzle_clues(2, 2, [[1,1],[0]], [[1],[1]])
+
+def test_puzzle_clues_totals_differ():
+    with pytest.raises(errors.InvalidHints):
+        clues.puzzle_clues(2, 2, [[2],[1]], [[1],[1]])
+
+def test_line_clues_colored():
+    line = clues.line_clues([2,1,1], 6, [1,2,2])
+    assert line.colors == (1,2,2)
+    assert line.min_span == 5
+    assert line.earliest == (0,2,4)
+
+def test_line_clues_invalid_colors():
+    with pytest.raises(ValueError):
+        clues.line_clues([2,1], 6, [1])
+    with pytest.raises(ValueError):
+        clues.line_clues([2], 6, [10])
+
+def test_puzzle_clues_color_totals():
+    with pytest.raises(errors.InvalidHints):
+        clues.puzzle_clues(2, 1, [[1,1]], [[1],[1]], [[1,2]], [[1],[1]])
+    rows, _ = clues.puzzle_clues(2, 1, [[1,1]], [[1],[1]], [[1,2]], [[1],[2]])
+    assert clues.clue_tuples(rows) == [((1,1), (1,2))]
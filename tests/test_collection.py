@@ -0,0 +1,104 @@
+import os
+import shutil
+import pytest
+import pyNonogram.collection as collection
+import pyNonogram.errors as errors
+
+test_path = "tests/test_nonograms/test1.non"
+
+def make_dir(tmp_path, count=3):
+    for i in range(count):
+        with open(test_path, 'r') as f:
+            data = f.read()
+        data = data.replace("width:5", "width:{}".format(5+i)).replace("difficulty:1", "difficulty:{}".format(i))
+        with open(os.path.join(tmp_path, "puzzle{}.non".format(i)), 'w') as f:
+            f.write(data)
+    with open(os.path.join(tmp_path, "notes.txt"), 'w') as f:
+        f.write("not a nonogram")
+    return str(tmp_path)
+
+def test_read_header():
+    info = collection.read_header(test_path)
+    assert info == collection.PuzzleInfo(test_path, "Test Author", "2.1.24", 1, 1, 5, 6)
+
+def test_read_header_invalid(tmp_path):
+    path = os.path.join(tmp_path, "broken.non")
+    with open(path, 'w') as f:
+        f.write("author:A\nwidth:5\n")
+    with pytest.raises(errors.UnknownFormat):
+        collection.read_header(path)
+
+def test_collection_invalid_path():
+    with pytest.raises(errors.PathException):
+        collection.NonogramCollection(test_path)
+
+def test_collection_entries(tmp_path):
+    nonogram_collection = collection.NonogramCollection(make_dir(tmp_path))
+    assert len(nonogram_collection) == 3
+    assert [info.width for info in nonogram_collection] == [5, 6, 7]
+    assert os.path.isfile(nonogram_collection.index_path)
+
+def test_collection_uses_index(tmp_path, monkeypatch):
+    path = make_dir(tmp_path)
+    collection.NonogramCollection(path)
+    def fail(path):
+        raise AssertionError("header read instead of index")
+    monkeypatch.setattr(collection, "read_header", fail)
+    assert len(collection.NonogramCollection(path)) == 3
+
+def test_collection_index_invalidated(tmp_path):
+    path = make_dir(tmp_path)
+    collection.NonogramCollection(path)
+    shutil.copy(test_path, os.path.join(path, "extra.non"))
+    assert len(collection.NonogramCollection(path)) == 4
+
+def test_collection_refresh_force(tmp_path):
+    path = make_dir(tmp_path)
+    nonogram_collection = collection.NonogramCollection(path)
+    puzzle_path = os.path.join(path, "puzzle0.non")
+    with open(puzzle_path, 'r') as f:
+        data = f.read().replace("Test Author", "New Author")
+    with open(puzzle_path, 'w') as f:
+        f.write(data)
+    stat = os.stat(puzzle_path)
+    os.utime(puzzle_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    nonogram_collection.refresh(force=True)
+    assert nonogram_collection.query(author="New Author")[0].path == puzzle_path
+
+def test_query(tmp_path):
+    nonogram_collection = collection.NonogramCollection(make_dir(tmp_path))
+    assert [info.width for info in nonogram_collection.query(difficulty=1)] == [6]
+    assert [info.width for info in nonogram_collection.query(width=(6, 10))] == [6, 7]
+    assert nonogram_collection.query(width=5, difficulty=2) == []
+
+def test_query_unknown_field(tmp_path):
+    nonogram_collection = collection.NonogramCollection(make_dir(tmp_path))
+    with pytest.raises(ValueError):
+        nonogram_collection.query(colour=1)
+
+def test_random(tmp_path):
+    nonogram_collection = collection.NonogramCollection(make_dir(tmp_path))
+    assert nonogram_collection.random(width=(6, 7)).width in [6, 7]
+
+def test_random_no_match(tmp_path):
+    nonogram_collection = collection.NonogramCollection(make_dir(tmp_path))
+    with pytest.raises(errors.LoadingException):
+        nonogram_collection.random(width=50)
+
+def test_load_random(tmp_path):
+    nonogram_collection = collection.NonogramCollection(make_dir(tmp_path))
+    nonogram_object = nonogram_collection.load_random(difficulty=0)
+    assert nonogram_object.is_loaded and nonogram_object.width == 5
+
+def test_collection_file_added_during_scan(tmp_path, monkeypatch):
+    path = make_dir(tmp_path)
+    write_index = collection.NonogramCollection._write_index
+    def add_file(self, dir_mtime, files):
+        shutil.copy(test_path, os.path.join(path, "extra.non"))
+        #mtime of the directory may not move within one clock tick
+        os.utime(path, ns=(dir_mtime, dir_mtime + 10**9))
+        write_index(self, dir_mtime, files)
+    monkeypatch.setattr(collection.NonogramCollection, "_write_index", add_file)
+    assert len(collection.NonogramCollection(path)) == 3
+    monkeypatch.undo()
+    assert len(collection.NonogramCollection(path)) == 4
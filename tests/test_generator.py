@@ -0,0 +1,50 @@
+import pytest
+import numpy as np
+import pyNonogram.generator as generator
+import pyNonogram.nonogram as nonogram
+import pyNonogram.stream as stream
+import pyNonogram.archive as archive
+
+def test_random_solution():
+    solution = generator.random_solution(7, 4, density=0.5, rng=np.random.default_rng(0))
+    assert solution.shape == (4, 7)
+    assert set(np.unique(solution)) <= {0, 1}
+
+def test_random_solution_density():
+    assert np.all(generator.random_solution(5, 5, density=1) == 1)
+    assert np.all(generator.random_solution(5, 5, density=0) == 0)
+
+def test_random_solution_invalid_density():
+    with pytest.raises(ValueError):
+        generator.random_solution(5, 5, density=2)
+
+def test_is_unique():
+    nonogram_object = nonogram.Nonogram()
+    nonogram_object.load("tests/test_nonograms/test1.non")
+    assert generator.is_unique(nonogram_object)
+    assert not generator.is_unique(nonogram.Nonogram.from_solution(np.eye(3)))
+    assert not generator.is_unique(nonogram.Nonogram.from_solution(np.eye(3)), line_solvable=True)
+
+def test_generate():
+    nonograms = list(generator.generate(8, 6, 5, seed=1))
+    assert len(nonograms) == 5
+    for nonogram_object in nonograms:
+        assert (nonogram_object.width, nonogram_object.height) == (8, 6)
+        assert nonogram_object.count_solutions() == 1
+
+def test_generate_reproducible():
+    first = [item.to_lines() for item in generator.generate(6, 6, 3, seed=4)]
+    second = [item.to_lines() for item in generator.generate(6, 6, 3, seed=4)]
+    assert first == second
+
+def test_write_all(tmp_path):
+    nonograms = list(generator.generate(5, 5, 3, seed=2, line_solvable=True))
+    assert generator.write_all(str(tmp_path / "corpus.nonl"), nonograms) == 3
+    assert len(list(stream.iter_records(str(tmp_path / "corpus.nonl")))) == 3
+    assert generator.write_all(str(tmp_path / "corpus.nona"), nonograms) == 3
+    with archive.NonogramArchive(str(tmp_path / "corpus.nona")) as nonogram_archive:
+        assert nonogram_archive[1].to_lines() == nonograms[1].to_lines()
+    assert generator.write_all(str(tmp_path / "corpus"), nonograms) == 3
+    loaded = nonogram.Nonogram()
+    loaded.load(str(tmp_path / "corpus" / "000002.non"))
+    assert loaded.to_lines() == nonograms[2].to_lines()
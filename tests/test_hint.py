@@ -0,0 +1,72 @@
+import pytest
+import numpy as np
+import pyNonogram.hint as hint
+import pyNonogram.nonogram as nonogram
+import pyNonogram.line_cache as line_cache
+import pyNonogram.errors as errors
+
+test_path = "tests/test_nonograms/test1.non"
+
+@pytest.fixture
+def nonogram_object():
+    nonogram_object = nonogram.Nonogram(path=test_path)
+    nonogram_object.load()
+    return nonogram_object
+
+def test_hint_matches_solution(nonogram_object):
+    solution = np.where(np.array(nonogram_object.solution) == 1, 1, -1)
+    result = nonogram_object.hint()
+    assert result.value == solution[result.y, result.x]
+    assert result.line in ('row', 'column')
+    assert result.index == (result.y if result.line == 'row' else result.x)
+
+def test_hint_does_not_change_grid(nonogram_object):
+    nonogram_object.hint()
+    assert not np.any(np.asarray(nonogram_object.grid))
+
+def test_hint_repeats_until_played(nonogram_object):
+    assert nonogram_object.hint() == nonogram_object.hint()
+
+def test_play_hints_to_solution(nonogram_object):
+    moves = 0
+    while True:
+        result = nonogram_object.hint()
+        if result is None:
+            break
+        nonogram_object.grid.set_cell(result.x, result.y, result.value)
+        moves += 1
+    assert moves == 30
+    assert nonogram_object.is_solved()
+
+def test_hint_stuck():
+    nonogram_object = nonogram.Nonogram()
+    nonogram_object.load_data('', '', 0, 0, 2, 2, [[1],[1]], [[1],[1]])
+    assert nonogram_object.hint() is None
+
+def test_hint_contradiction(nonogram_object):
+    nonogram_object.grid.fill_row(0, 1)
+    with pytest.raises(errors.Contradiction):
+        nonogram_object.hint()
+
+def test_hint_not_loaded():
+    with pytest.raises(errors.NotLoaded):
+        nonogram.Nonogram().hint()
+
+def test_engine_solves_only_changed_lines():
+    cache = line_cache.LineCache()
+    engine = hint.HintEngine([[1]]*3, [[1]]*3, cache=cache)
+    cells = np.zeros((3, 3), dtype=np.int8)
+    assert engine.next(cells) is None
+    solved = cache.hits + cache.misses
+    assert solved == 6
+    assert engine.next(cells) is None
+    assert cache.hits + cache.misses == solved
+    cells[1, 1] = 1
+    result = engine.next(cells)
+    assert result.value == -1 and (result.line, result.index) == ('row', 1)
+    assert cache.hits + cache.misses == solved + 1
+
+def test_engine_shape():
+    engine = hint.HintEngine([[1]]*3, [[1]]*3)
+    with pytest.raises(ValueError):
+        engine.next(np.zeros((2, 3), dtype=np.int8))
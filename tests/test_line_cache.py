@@ -0,0 +1,89 @@
+import pytest
+import numpy as np
+import pyNonogram.line_cache as line_cache
+import pyNonogram.solver as solver
+import pyNonogram.nonogram_grid as nonogram_grid
+import pyNonogram.errors as errors
+
+def test_pack_unpack_line():
+    packed = line_cache.pack_line([1,0,-1])
+    assert packed == b'\x02\x01\x00'
+    assert line_cache.unpack_line(packed) == [1,0,-1]
+
+def test_get_miss_and_hit():
+    cache = line_cache.LineCache(4)
+    assert cache.get('a') is None
+    cache.put('a', b'\x01')
+    assert cache.get('a') == b'\x01'
+    assert cache.hits == 1 and cache.misses == 1
+
+def test_eviction_least_recently_used():
+    cache = line_cache.LineCache(2)
+    cache.put('a', b'\x01')
+    cache.put('b', b'\x01')
+    cache.get('a')
+    cache.put('c', b'\x01')
+    assert cache.get('b') is None
+    assert cache.get('a') is not None
+    assert cache.evictions == 1
+
+def test_contradiction_is_cached():
+    cache = line_cache.LineCache(2)
+    cache.put('a', line_cache.CONTRADICTION)
+    assert cache.get('a') == line_cache.CONTRADICTION
+    assert cache.hits == 1
+
+def test_resize():
+    cache = line_cache.LineCache(3)
+    for key in 'abc':
+        cache.put(key, b'\x01')
+    cache.resize(1)
+    assert len(cache) == 1 and cache.evictions == 2
+
+def test_negative_maxsize():
+    with pytest.raises(ValueError):
+        line_cache.LineCache(-1)
+
+def test_disabled():
+    cache = line_cache.LineCache(0)
+    cache.put('a', b'\x01')
+    assert len(cache) == 0
+
+def test_clear_and_stats():
+    cache = line_cache.LineCache(2)
+    cache.put('a', b'\x01')
+    cache.get('a')
+    cache.get('b')
+    stats = cache.stats()
+    assert stats['hits'] == 1 and stats['misses'] == 1 and stats['hit_rate'] == 0.5
+    cache.clear()
+    assert cache.stats() == {'size': 0, 'maxsize': 2, 'hits': 0, 'misses': 0, 'evictions': 0, 'hit_rate': 0.0}
+
+def test_solve_line_cached():
+    cache = line_cache.LineCache()
+    assert solver.solve_line_cached((2,2), [0,0,0,0,0], cache) == [1,1,-1,1,1]
+    assert solver.solve_line_cached((2,2), [0,0,0,0,0], cache) == [1,1,-1,1,1]
+    assert cache.hits == 1 and cache.misses == 1
+
+def test_solve_line_cached_contradiction():
+    cache = line_cache.LineCache()
+    assert solver.solve_line_cached((2,), [1,-1,1], cache) is None
+    assert solver.solve_line_cached((2,), [1,-1,1], cache) is None
+    assert cache.hits == 1
+
+def test_propagate_shares_cache():
+    cache = line_cache.LineCache()
+    first = nonogram_grid.NonogramGrid((2,2))
+    solver.propagate(first, [[2],[1]], [[2],[1]], cache=cache)
+    misses = cache.misses
+    second = nonogram_grid.NonogramGrid((2,2))
+    solver.propagate(second, [[2],[1]], [[2],[1]], cache=cache)
+    assert cache.misses == misses and cache.hits > 0
+    assert np.all(first == second)
+
+def test_propagate_cached_contradiction():
+    cache = line_cache.LineCache()
+    for _ in range(2):
+        grid = nonogram_grid.NonogramGrid((2,2))
+        with pytest.raises(errors.Contradiction):
+            solver.propagate(grid, [[2],[2]], [[1],[1]], cache=cache)
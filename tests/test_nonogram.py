@@ -1,3 +1,4 @@
+import os
 import pytest
 import pyNonogram.nonogram as nonogram
 import pyNonogram.nonogram_grid as nonogram_grid
@@ -116,4 +117,326 @@ def test_is_solved():
 def test_is_solved_with_empty_grid():
     nonogram_object = nonogram.Nonogram(path=test_path)
     nonogram_object.load()
-    assert nonogram_object.is_solved() == False
\ No newline at end of file
+    assert nonogram_object.is_solved() == False
+
+def test_solve():
+    nonogram_object = nonogram.Nonogram(path=test_path)
+    nonogram_object.load()
+    assert nonogram_object.solve() == True
+    assert nonogram_object.check_all() == True
+    assert np.all((nonogram_object.grid == 1) == (np.array(nonogram_object.solution) == 1))
+
+def test_solve_not_loaded():
+    nonogram_object = nonogram.Nonogram()
+    with pytest.raises(errors.NotLoaded):
+        nonogram_object.solve()
+
+def test_check_all_partial_grid():
+    nonogram_object = nonogram.Nonogram(path=test_path)
+    nonogram_object.load()
+    nonogram_object.load_solution()
+    nonogram_object.grid.set_cell(2, 5, -1)
+    assert nonogram_object.check_all() == False
+
+def test_is_solved_incremental():
+    nonogram_object = nonogram.Nonogram(path=test_path)
+    nonogram_object.load()
+    assert nonogram_object.is_solved() == False
+    for y in range(nonogram_object.height):
+        for x in range(nonogram_object.width):
+            nonogram_object.grid.set_cell(x, y, 1 if nonogram_object.solution[y][x] == 1 else -1)
+            assert nonogram_object.is_solved() == nonogram_object.check_all()
+    assert nonogram_object.is_solved() == True
+    nonogram_object.grid.set_cell(2, 0, 0)
+    assert nonogram_object.is_solved() == False
+    nonogram_object.grid.set_cell(2, 0, 1)
+    assert nonogram_object.is_solved() == True
+
+def test_is_solved_after_load_grid():
+    nonogram_object = nonogram.Nonogram(path=test_path)
+    nonogram_object.load()
+    nonogram_object.load_solution()
+    assert nonogram_object.is_solved() == True
+    nonogram_object.load_grid()
+    assert nonogram_object.is_solved() == False
+
+def test_load_random_ignores_other_files(tmp_path):
+    with open(tmp_path / "notes.txt", 'w') as f:
+        f.write("not a nonogram")
+    with pytest.raises(errors.LoadingException):
+        nonogram.Nonogram().load_random(str(tmp_path))
+
+def test_to_lines():
+    nonogram_object = nonogram.Nonogram(path=test_path)
+    nonogram_object.load()
+    with open(test_path) as f:
+        assert nonogram_object.to_lines() == f.read().split('\n')
+
+def test_load_lines():
+    nonogram_object = nonogram.Nonogram()
+    with open(test_path) as f:
+        nonogram_object.load_lines(f.read().split('\n'))
+    assert nonogram_object.rows == [[1], [3], [2,2], [3], [1], [1]]
+    assert nonogram_object.path is None
+
+def test_count_solutions():
+    nonogram_object = nonogram.Nonogram(path=test_path)
+    nonogram_object.load()
+    assert nonogram_object.count_solutions() == 1
+    assert np.all(nonogram_object.grid == 0)
+
+def test_count_solutions_limit():
+    nonogram_object = nonogram.Nonogram()
+    nonogram_object.load_data('', '', 0, 0, 3, 3, [[1]]*3, [[1]]*3)
+    assert nonogram_object.count_solutions(limit=None) == 6
+    with pytest.raises(ValueError):
+        nonogram_object.count_solutions(limit=0)
+
+def test_solve_with_search():
+    nonogram_object = nonogram.Nonogram()
+    nonogram_object.load_data('', '', 0, 0, 5, 6, [[1]]*5 + [[0]], [[1]]*5)
+    assert nonogram_object.solve() == False
+    assert nonogram_object.count_solutions(limit=200) == 120
+    assert nonogram_object.solve(search=True) == True
+    assert nonogram_object.check_all() == True
+
+def test_from_solution():
+    nonogram_object = nonogram.Nonogram(path=test_path)
+    nonogram_object.load()
+    derived = nonogram.Nonogram.from_solution(np.array(nonogram_object.solution))
+    assert derived.rows == nonogram_object.rows
+    assert derived.columns == nonogram_object.columns
+    assert derived.solution == nonogram_object.solution
+    derived.load_solution()
+    assert derived.is_solved()
+
+def test_from_solution_empty_line():
+    derived = nonogram.Nonogram.from_solution([[1,0],[0,0]])
+    assert derived.rows == [[1], [0]]
+    assert derived.columns == [[1], [0]]
+
+def test_from_solution_invalid():
+    with pytest.raises(ValueError):
+        nonogram.Nonogram.from_solution([1,0])
+
+def test_bitset_backend():
+    nonogram_object = nonogram.Nonogram(path=test_path, backend='bitset')
+    nonogram_object.load()
+    assert nonogram_object.is_solved() == False
+    nonogram_object.load_solution()
+    assert nonogram_object.check_all() == True
+    assert nonogram_object.is_solved() == True
+    nonogram_object.load_grid()
+    assert nonogram_object.solve() == True
+    assert nonogram_object.check_all() == True
+
+def test_invalid_backend():
+    with pytest.raises(ValueError):
+        nonogram.Nonogram(backend='sparse')
+
+def test_load_clue_metadata():
+    nonogram_object = nonogram.Nonogram(path=test_path)
+    nonogram_object.load()
+    assert nonogram_object.row_clues[2].clues == (2,2)
+    assert nonogram_object.row_clues[2].slack == 0
+    assert nonogram_object.col_clues[2].earliest == (0,3)
+
+def test_load_invalid_hints(tmp_path):
+    with open(test_path) as f:
+        lines = f.read().split('\n')
+    lines[6] = 'rows:1 3 2,2 3 1 2'
+    path = tmp_path / "invalid.non"
+    with open(path, 'w') as f:
+        f.write('\n'.join(lines))
+    nonogram_object = nonogram.Nonogram()
+    with pytest.raises(errors.InvalidHints):
+        nonogram_object.load(str(path))
+    assert nonogram_object.is_loaded == False
+
+def unsolved_copy(tmp_path, name="unsolved.non"):
+    with open(test_path) as f:
+        lines = f.read().split('\n')
+    lines[-1] = 'solution:'
+    path = tmp_path / name
+    with open(path, 'w') as f:
+        f.write('\n'.join(lines))
+    return str(path)
+
+def test_save_solution(tmp_path):
+    path = unsolved_copy(tmp_path)
+    nonogram_object = nonogram.Nonogram(path=path)
+    nonogram_object.load()
+    nonogram_object.solve()
+    nonogram_object.save_solution()
+    with open(path) as f, open(test_path) as g:
+        assert f.read() == g.read()
+    assert nonogram_object.solved == True
+    assert nonogram_object.solution == [[0,0,1,0,0], [0,1,1,1,0], [1,1,0,1,1], [0,1,1,1,0], [0,0,1,0,0], [0,0,1,0,0]]
+
+def test_save_solution_replaces_existing(tmp_path):
+    path = unsolved_copy(tmp_path)
+    nonogram_object = nonogram.Nonogram(path=path)
+    nonogram_object.load()
+    nonogram_object.grid.fill(1)
+    nonogram_object.save_solution()
+    nonogram_object.grid.fill(-1)
+    nonogram_object.save_solution()
+    with open(path) as f:
+        lines = f.read().split('\n')
+    assert len(lines) == 9
+    assert lines[-1] == 'solution:' + '0'*30
+    assert [name for name in tmp_path.iterdir() if name.suffix == '.tmp'] == []
+
+def test_save_solution_not_solved(tmp_path):
+    path = unsolved_copy(tmp_path)
+    nonogram_object = nonogram.Nonogram(path=path)
+    nonogram_object.load()
+    with pytest.raises(errors.NotSolved):
+        nonogram_object.save_solution()
+    with open(path) as f:
+        assert f.read().endswith('solution:')
+
+def test_save_solutions(tmp_path):
+    nonograms = []
+    for idx in range(3):
+        nonogram_object = nonogram.Nonogram(path=unsolved_copy(tmp_path, "{}.non".format(idx)))
+        nonogram_object.load()
+        nonogram_object.solve()
+        nonograms.append(nonogram_object)
+    assert nonogram.save_solutions(nonograms) == 3
+    for nonogram_object in nonograms:
+        reloaded = nonogram.Nonogram(path=nonogram_object.path)
+        reloaded.load()
+        assert reloaded.solution == nonogram_object.solution
+
+def test_save_solutions_unsolved(tmp_path):
+    solved = nonogram.Nonogram(path=unsolved_copy(tmp_path, "0.non"))
+    solved.load()
+    solved.solve()
+    unsolved = nonogram.Nonogram(path=unsolved_copy(tmp_path, "1.non"))
+    unsolved.load()
+    unsolved.load_grid()
+    with pytest.raises(errors.NotSolved):
+        nonogram.save_solutions([solved, unsolved])
+    #nothing is saved and no temporary files are left
+    assert sorted(os.listdir(tmp_path)) == ["0.non", "1.non"]
+    with open(solved.path) as f:
+        assert f.read().endswith('solution:')
+
+def test_save_solutions_without_sync(tmp_path):
+    nonogram_object = nonogram.Nonogram(path=unsolved_copy(tmp_path))
+    nonogram_object.load()
+    nonogram_object.solve()
+    assert nonogram.save_solutions([nonogram_object], sync=False) == 1
+    reloaded = nonogram.Nonogram(path=nonogram_object.path)
+    reloaded.load()
+    assert reloaded.solution == nonogram_object.solution
+
+def copy_with_solution(tmp_path, solution):
+    with open(test_path) as f:
+        lines = f.read().split('\n')
+    lines[-1] = 'solution:' + solution
+    path = tmp_path / "copy.non"
+    with open(path, 'w') as f:
+        f.write('\n'.join(lines))
+    return str(path)
+
+def test_load_solution_marks_dirty():
+    nonogram_object = nonogram.Nonogram(path=test_path)
+    nonogram_object.load()
+    nonogram_object.load_solution()
+    assert nonogram_object.grid.pop_dirty() == ({0,1,2,3,4,5}, {0,1,2,3,4})
+
+def test_load_solution_bitset_backend():
+    nonogram_object = nonogram.Nonogram(path=test_path, backend='bitset')
+    nonogram_object.load()
+    nonogram_object.load_solution()
+    assert nonogram_object.check_all() == True
+
+def test_load_invalid_solution_length(tmp_path):
+    nonogram_object = nonogram.Nonogram()
+    with pytest.raises(errors.UnknownFormat):
+        nonogram_object.load(copy_with_solution(tmp_path, '0'*29))
+
+def test_load_invalid_solution_characters(tmp_path):
+    nonogram_object = nonogram.Nonogram()
+    with pytest.raises(errors.UnknownFormat):
+        nonogram_object.load(copy_with_solution(tmp_path, '2'*30))
+
+def test_check_solution(tmp_path):
+    nonogram_object = nonogram.Nonogram(path=test_path)
+    nonogram_object.load(verify=True)
+    assert nonogram_object.check_solution() == True
+    nonogram_object.load(copy_with_solution(tmp_path, '1'*30))
+    assert nonogram_object.check_solution() == False
+
+def test_load_verify_wrong_solution(tmp_path):
+    nonogram_object = nonogram.Nonogram()
+    with pytest.raises(errors.LoadingException):
+        nonogram_object.load(copy_with_solution(tmp_path, '1'*30), verify=True)
+    assert nonogram_object.is_loaded == False
+
+def test_check_solution_without_solution():
+    nonogram_object = nonogram.Nonogram()
+    nonogram_object.load("examples/house.non")
+    with pytest.raises(errors.NotSolved):
+        nonogram_object.check_solution()
+
+def test_checked_mode():
+    nonogram_object = nonogram.Nonogram(path=test_path, checked=True)
+    nonogram_object.load()
+    nonogram_object.grid.set_cell(2, 0, 1)
+    with pytest.raises(errors.Contradiction) as info:
+        nonogram_object.grid.set_cell(0, 0, 1)
+    assert info.value.lines == [('row', 0)]
+
+color_lines = ['author:test', 'date:01.01.24', 'picture:0', 'difficulty:0', 'width:3', 'height:2',
+               'rows:2.1,1.2 1.2', 'columns:1.1 1.1 2.2', 'solution:112002']
+
+def test_load_colored():
+    nonogram_object = nonogram.Nonogram()
+    nonogram_object.load_lines(color_lines, verify=True)
+    assert nonogram_object.rows == [[2,1], [1]]
+    assert nonogram_object.row_colors == [[1,2], [2]]
+    assert nonogram_object.colors == 2
+    assert nonogram_object.grid.colors == 2
+    assert nonogram_object.check_solution() == True
+    assert nonogram_object.to_lines() == color_lines
+
+def test_load_colored_invalid_solution():
+    nonogram_object = nonogram.Nonogram()
+    with pytest.raises(errors.UnknownFormat):
+        nonogram_object.load_lines(color_lines[:8] + ['solution:113002'])
+
+def test_solve_colored():
+    nonogram_object = nonogram.Nonogram()
+    nonogram_object.load_lines(color_lines)
+    assert nonogram_object.check_all() == False
+    assert nonogram_object.solve() == True
+    assert np.all(nonogram_object.grid == [[1,1,2],[-1,-1,2]])
+    assert nonogram_object.check_all() == True and nonogram_object.is_solved() == True
+    nonogram_object.grid.set_cell(1, 0, 2)
+    assert nonogram_object.check_row(0) == False and nonogram_object.is_solved() == False
+
+def test_from_colored_solution():
+    solution = np.array([[1,1,2,0],[0,2,2,0],[3,3,0,1]])
+    nonogram_object = nonogram.Nonogram.from_solution(solution)
+    assert nonogram_object.rows == [[2,1], [2], [2,1]]
+    assert nonogram_object.row_colors == [[1,2], [2], [3,1]]
+    assert nonogram_object.columns == [[1,1], [1,1,1], [2], [1]]
+    assert nonogram_object.col_colors == [[1,3], [1,2,3], [2], [1]]
+    assert nonogram_object.count_solutions() == 1
+    nonogram_object.load_solution()
+    assert nonogram_object.check_all() == True
+
+def test_from_colored_solution_invalid_color():
+    #261 and 128 wrap around to 5 and -128 in int8
+    for color in (10, 128, 261):
+        with pytest.raises(ValueError):
+            nonogram.Nonogram.from_solution(np.array([[1,2],[color,0]]))
+
+def test_colored_needs_numpy_backend():
+    nonogram_object = nonogram.Nonogram(backend='bitset')
+    with pytest.raises(ValueError):
+        nonogram_object.load_lines(color_lines)
+    assert nonogram_object.is_loaded == False
@@ -1,6 +1,7 @@
 import pytest
 import numpy as np
 import pyNonogram.nonogram_grid as nonogram_grid
+import pyNonogram.errors as errors
 
 shape = (5,5)
 
@@ -162,4 +163,257 @@ def test_both_get_segments():
 
 def test_str():
     nonogram_grid_object = nonogram_grid.NonogramGrid(shape)
-    assert str(nonogram_grid_object) == np.zeros(shape, dtype=np.int8).__str__()
\ No newline at end of file
+    assert str(nonogram_grid_object) == np.zeros(shape, dtype=np.int8).__str__()
+
+def test_all_row_segments():
+    nonogram_grid_object = nonogram_grid.NonogramGrid(shape)
+    nonogram_grid_object.fill_row(0,1)
+    nonogram_grid_object.set_cell(2,0,-1)
+    nonogram_grid_object.set_cell(4,3,1)
+    assert nonogram_grid_object.all_row_segments() == [[2,2], [], [], [1], []]
+
+def test_all_col_segments():
+    nonogram_grid_object = nonogram_grid.NonogramGrid(shape)
+    nonogram_grid_object.fill_col(1,1)
+    nonogram_grid_object.set_cell(1,1,0)
+    assert nonogram_grid_object.all_col_segments() == [[], [1,3], [], [], []]
+
+def test_all_segments_match_single_line():
+    nonogram_grid_object = nonogram_grid.NonogramGrid(shape)
+    nonogram_grid_object[:] = np.random.default_rng(0).integers(-1, 2, shape)
+    for y in range(shape[0]):
+        assert nonogram_grid_object.all_row_segments()[y] == nonogram_grid_object.get_row_segments(y)
+    for x in range(shape[1]):
+        assert nonogram_grid_object.all_col_segments()[x] == nonogram_grid_object.get_col_segments(x)
+
+def test_set_cell_marks_dirty():
+    nonogram_grid_object = nonogram_grid.NonogramGrid(shape)
+    nonogram_grid_object.set_cell(1,3,1)
+    assert nonogram_grid_object.pop_dirty() == ({3}, {1})
+    assert nonogram_grid_object.pop_dirty() == (set(), set())
+
+def test_fill_row_marks_dirty():
+    nonogram_grid_object = nonogram_grid.NonogramGrid(shape)
+    nonogram_grid_object.fill_row(2,1)
+    assert nonogram_grid_object.pop_dirty() == ({2}, {0,1,2,3,4})
+
+def test_mark_dirty_all():
+    nonogram_grid_object = nonogram_grid.NonogramGrid(shape)
+    nonogram_grid_object.mark_dirty()
+    assert nonogram_grid_object.pop_dirty() == ({0,1,2,3,4}, {0,1,2,3,4})
+
+def test_copy_has_own_dirty_lines():
+    nonogram_grid_object = nonogram_grid.NonogramGrid(shape)
+    nonogram_grid_object.set_cell(0,0,1)
+    copy = nonogram_grid_object.copy()
+    assert copy.pop_dirty() == (set(), set())
+    assert nonogram_grid_object.pop_dirty() == ({0}, {0})
+
+def test_set_row():
+    nonogram_grid_object = nonogram_grid.NonogramGrid(shape)
+    nonogram_grid_object.set_row(1, [1,-1,0,0,1])
+    assert np.all(nonogram_grid_object.get_row(1) == [1,-1,0,0,1])
+    assert nonogram_grid_object.pop_dirty() == ({1}, {0,1,4})
+
+def test_set_col_invalid_length():
+    nonogram_grid_object = nonogram_grid.NonogramGrid(shape)
+    with pytest.raises(ValueError):
+        nonogram_grid_object.set_col(1, [1,-1])
+
+def test_set_row_invalid_value():
+    nonogram_grid_object = nonogram_grid.NonogramGrid(shape)
+    with pytest.raises(ValueError):
+        nonogram_grid_object.set_row(1, [1,2,0,0,1])
+
+def test_fill_row_without_overwritting():
+    nonogram_grid_object = nonogram_grid.NonogramGrid(shape)
+    nonogram_grid_object.set_cell(1,2,-1)
+    nonogram_grid_object.pop_dirty()
+    nonogram_grid_object.fill_row(2,1,False)
+    assert np.all(nonogram_grid_object.get_row(2) == [1,-1,1,1,1])
+    assert nonogram_grid_object.pop_dirty() == ({2}, {0,2,3,4})
+
+def test_fill_col_invalid_value():
+    nonogram_grid_object = nonogram_grid.NonogramGrid(shape)
+    with pytest.raises(ValueError):
+        nonogram_grid_object.fill_col(0,2)
+
+def test_set_cells():
+    nonogram_grid_object = nonogram_grid.NonogramGrid(shape)
+    nonogram_grid_object.set_cells([0,4], [1,3], [1,-1])
+    assert nonogram_grid_object.get_cell(0,1) == 1
+    assert nonogram_grid_object.get_cell(4,3) == -1
+    assert nonogram_grid_object.pop_dirty() == ({1,3}, {0,4})
+
+def test_set_cells_scalar_value():
+    nonogram_grid_object = nonogram_grid.NonogramGrid(shape)
+    nonogram_grid_object.set_cells([0,1,2], [0,1,2], 1)
+    assert np.all(np.diag(nonogram_grid_object)[:3] == 1)
+
+def test_set_cells_invalid():
+    nonogram_grid_object = nonogram_grid.NonogramGrid(shape)
+    with pytest.raises(ValueError):
+        nonogram_grid_object.set_cells([0,1], [0], 1)
+    with pytest.raises(ValueError):
+        nonogram_grid_object.set_cells([0], [0], 3)
+    with pytest.raises(IndexError):
+        nonogram_grid_object.set_cells([5], [0], 1)
+    assert np.all(nonogram_grid_object == 0)
+
+def test_fill_rect():
+    nonogram_grid_object = nonogram_grid.NonogramGrid(shape)
+    nonogram_grid_object.fill_rect(1, 2, 3, 2, -1)
+    assert np.all(nonogram_grid_object[2:4, 1:4] == -1)
+    assert np.sum(nonogram_grid_object != 0) == 6
+    assert nonogram_grid_object.pop_dirty() == ({2,3}, {1,2,3})
+
+def test_fill_rect_out_of_grid():
+    nonogram_grid_object = nonogram_grid.NonogramGrid(shape)
+    with pytest.raises(IndexError):
+        nonogram_grid_object.fill_rect(3, 0, 3, 1, 1)
+
+def test_apply_mask():
+    nonogram_grid_object = nonogram_grid.NonogramGrid(shape)
+    nonogram_grid_object.set_cell(0,0,-1)
+    nonogram_grid_object.pop_dirty()
+    mask = np.zeros(shape, dtype=bool)
+    mask[0,:2] = True
+    nonogram_grid_object.apply_mask(mask, 1)
+    assert np.all(nonogram_grid_object.get_row(0) == [-1,1,0,0,0])
+    assert nonogram_grid_object.pop_dirty() == ({0}, {1})
+    nonogram_grid_object.apply_mask(mask, 1, overwrite=True)
+    assert np.all(nonogram_grid_object.get_row(0) == [1,1,0,0,0])
+
+def test_apply_mask_invalid_shape():
+    nonogram_grid_object = nonogram_grid.NonogramGrid(shape)
+    with pytest.raises(ValueError):
+        nonogram_grid_object.apply_mask(np.ones((2,2), dtype=bool), 1)
+
+def test_checkpoint_rollback():
+    nonogram_grid_object = nonogram_grid.NonogramGrid(shape)
+    nonogram_grid_object.set_cell(0,0,1)
+    token = nonogram_grid_object.checkpoint()
+    nonogram_grid_object.set_cell(0,0,-1)
+    nonogram_grid_object.set_row(1, [1,1,1,0,0])
+    nonogram_grid_object.fill_col(4, -1)
+    nonogram_grid_object.set_cells([2,3], [3,3], 1)
+    nonogram_grid_object.fill_rect(0, 4, 2, 1, 1)
+    nonogram_grid_object.pop_dirty()
+    nonogram_grid_object.rollback(token)
+    expected = np.zeros(shape)
+    expected[0,0] = 1
+    assert np.all(nonogram_grid_object == expected)
+    assert nonogram_grid_object.pop_dirty() == ({0,1,2,3,4}, {0,1,2,3,4})
+
+def test_rollback_twice():
+    nonogram_grid_object = nonogram_grid.NonogramGrid(shape)
+    token = nonogram_grid_object.checkpoint()
+    nonogram_grid_object.set_cell(1,1,1)
+    nonogram_grid_object.rollback(token)
+    nonogram_grid_object.set_cell(2,2,-1)
+    nonogram_grid_object.rollback(token)
+    assert np.all(nonogram_grid_object == 0)
+
+def test_nested_checkpoints():
+    nonogram_grid_object = nonogram_grid.NonogramGrid(shape)
+    outer = nonogram_grid_object.checkpoint()
+    nonogram_grid_object.set_cell(0,0,1)
+    inner = nonogram_grid_object.checkpoint()
+    nonogram_grid_object.set_cell(0,0,-1)
+    nonogram_grid_object.rollback(inner)
+    assert nonogram_grid_object.get_cell(0,0) == 1
+    nonogram_grid_object.set_cell(1,0,1)
+    nonogram_grid_object.commit()
+    nonogram_grid_object.rollback(outer)
+    assert np.all(nonogram_grid_object == 0)
+
+def test_rollback_closes_later_checkpoints():
+    nonogram_grid_object = nonogram_grid.NonogramGrid(shape)
+    outer = nonogram_grid_object.checkpoint()
+    nonogram_grid_object.set_cell(0,0,1)
+    inner = nonogram_grid_object.checkpoint()
+    nonogram_grid_object.rollback(outer)
+    with pytest.raises(ValueError):
+        nonogram_grid_object.rollback(inner)
+
+def test_checkpoint_ids_unique():
+    nonogram_grid_object = nonogram_grid.NonogramGrid(shape)
+    outer = nonogram_grid_object.checkpoint()
+    inner = nonogram_grid_object.checkpoint()
+    assert outer != inner
+    nonogram_grid_object.commit()
+    with pytest.raises(ValueError):
+        nonogram_grid_object.rollback(inner)
+    nonogram_grid_object.set_cell(0,0,1)
+    nonogram_grid_object.rollback(outer)
+    assert np.all(nonogram_grid_object == 0)
+
+def test_commit_drops_journal():
+    nonogram_grid_object = nonogram_grid.NonogramGrid(shape)
+    token = nonogram_grid_object.checkpoint()
+    nonogram_grid_object.set_cell(0,0,1)
+    nonogram_grid_object.commit()
+    assert nonogram_grid_object.get_cell(0,0) == 1
+    with pytest.raises(ValueError):
+        nonogram_grid_object.rollback(token)
+    with pytest.raises(ValueError):
+        nonogram_grid_object.commit()
+
+def test_journal_records_only_changes():
+    nonogram_grid_object = nonogram_grid.NonogramGrid(shape)
+    nonogram_grid_object.fill_row(0, 1)
+    nonogram_grid_object.checkpoint()
+    nonogram_grid_object.fill_row(0, 1)
+    nonogram_grid_object.set_row(0, [1,1,1,1,-1])
+    assert len(nonogram_grid_object._journal) == 1
+
+def test_checked_set_cell():
+    nonogram_grid_object = nonogram_grid.NonogramGrid((2,3))
+    nonogram_grid_object.enable_checks([[1],[2]], [[1],[1],[1]])
+    nonogram_grid_object.set_cell(0, 0, 1)
+    with pytest.raises(errors.Contradiction) as info:
+        nonogram_grid_object.set_cell(0, 1, 1)
+    assert info.value.lines == [('column', 0)]
+    assert nonogram_grid_object.get_cell(0, 1) == 1
+    nonogram_grid_object.set_cell(0, 1, 0)
+    with pytest.raises(errors.Contradiction) as info:
+        nonogram_grid_object.set_cell(2, 0, 1)
+    assert info.value.lines == [('row', 0)]
+
+def test_checked_mode_off():
+    nonogram_grid_object = nonogram_grid.NonogramGrid((2,3))
+    nonogram_grid_object.enable_checks([[1],[2]], [[1],[1],[1]])
+    nonogram_grid_object.disable_checks()
+    nonogram_grid_object.set_cell(0, 0, 1)
+    nonogram_grid_object.set_cell(0, 1, 1)
+
+def test_enable_checks_shape():
+    nonogram_grid_object = nonogram_grid.NonogramGrid((2,3))
+    with pytest.raises(ValueError):
+        nonogram_grid_object.enable_checks([[1]], [[1],[1],[1]])
+
+def test_colors():
+    nonogram_grid_object = nonogram_grid.NonogramGrid(shape, colors=3)
+    nonogram_grid_object.set_cell(0, 0, 3)
+    assert nonogram_grid_object.get_cell(0, 0) == 3
+    assert nonogram_grid_object[1:].colors == 3
+    with pytest.raises(ValueError):
+        nonogram_grid_object.set_cell(0, 0, 4)
+    with pytest.raises(ValueError):
+        nonogram_grid_object.set_row(0, [1,2,3,4,0])
+    with pytest.raises(ValueError):
+        nonogram_grid.NonogramGrid(shape, colors=10)
+
+def test_color_segments():
+    nonogram_grid_object = nonogram_grid.NonogramGrid((2,5), colors=2)
+    nonogram_grid_object[0] = [1,1,2,-1,2]
+    nonogram_grid_object[1] = [0,2,2,1,0]
+    assert nonogram_grid_object.get_row_color_segments(0) == [(2,1), (1,2), (1,2)]
+    assert nonogram_grid_object.get_col_color_segments(2) == [(2,2)]
+    idx, lengths, colors = nonogram_grid_object.row_color_runs()
+    assert idx.tolist() == [0,0,0,1,1]
+    assert lengths.tolist() == [2,1,1,2,1]
+    assert colors.tolist() == [1,2,2,2,1]
+    idx, lengths, colors = nonogram_grid_object.col_color_runs()
+    assert idx.tolist() == [0,1,1,2,3,4]
+    assert colors.tolist() == [1,1,2,2,1,2]
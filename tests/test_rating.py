@@ -0,0 +1,91 @@
+import os
+import shutil
+import pytest
+import pyNonogram.rating as rating
+import pyNonogram.nonogram as nonogram
+import pyNonogram.stream as stream
+import pyNonogram.cli as cli
+import pyNonogram.errors as errors
+
+test_dir = "tests/test_nonograms"
+test_path = "tests/test_nonograms/test1.non"
+#line logic gets stuck, probing one cell finishes it
+probe_puzzle = (5, 5, [[2, 1], [1, 3], [1], [3], [1, 1]], [[2, 1], [1, 1], [1, 1], [2, 1], [2, 1]])
+#two solutions
+ambiguous_puzzle = (2, 2, [[1], [1]], [[1], [1]])
+
+def test_trace_line_solvable():
+    trace = rating.trace(test_path)
+    assert trace.depth == rating.LINE_DEPTH
+    assert trace.probes == 0
+    assert trace.rounds >= 1 and trace.lines >= 11
+
+def test_trace_sources(tmp_path):
+    nonogram_object = nonogram.Nonogram(path=test_path)
+    nonogram_object.load()
+    path = str(tmp_path / "corpus.nonl")
+    stream.pack([test_path], path)
+    record = next(stream.iter_records(path))
+    assert rating.trace(nonogram_object) == rating.trace(test_path) == rating.trace(record)
+
+def test_trace_probe():
+    trace = rating.trace(probe_puzzle)
+    assert trace.depth == rating.PROBE_DEPTH
+    assert trace.probes >= 1
+
+def test_trace_ambiguous():
+    assert rating.trace(ambiguous_puzzle).depth == rating.SEARCH_DEPTH
+
+def test_score():
+    assert rating.score(rating.Trace(1, 10, 0, 0, rating.LINE_DEPTH)) == 1
+    assert rating.score(rating.Trace(100, 10, 10, 50, rating.SEARCH_DEPTH)) == rating.MAX_SCORE
+    easy = rating.score(rating.trace(test_path))
+    assert easy < rating.score(rating.trace(probe_puzzle))
+    assert rating.score(rating.trace(ambiguous_puzzle)) == 1 + rating.DEPTH_POINTS[rating.SEARCH_DEPTH]
+
+def test_rate_many():
+    results = list(rating.rate_many([test_path, (2, 2, [[2],[2]], [[1],[1]]), "tests/test_nonograms/missing.non"], workers=0, chunksize=2))
+    assert [idx for idx, _ in results] == [0, 1, 2]
+    assert results[0][1] == rating.trace(test_path)
+    assert results[1][1] is None and results[2][1] is None
+
+def test_rate_many_streams_input():
+    taken = []
+    def puzzles():
+        for i in range(100):
+            taken.append(i)
+            yield test_path
+    results = rating.rate_many(puzzles(), workers=2, chunksize=3)
+    next(results)
+    assert len(taken) <= 4*3
+    results.close()
+
+def test_write_ratings_directory(tmp_path):
+    directory = str(tmp_path / "puzzles")
+    shutil.copytree(test_dir, directory)
+    assert rating.write_ratings(directory, workers=0) == 2
+    nonogram_object = nonogram.Nonogram(path=os.path.join(directory, "test1.non"))
+    nonogram_object.load()
+    assert nonogram_object.difficulty == rating.score(rating.trace(test_path))
+    assert nonogram_object.check_solution()
+
+def test_write_ratings_nonl(tmp_path):
+    path = str(tmp_path / "corpus.nonl")
+    stream.pack([os.path.join(test_dir, name) for name in sorted(os.listdir(test_dir))], path)
+    assert rating.write_ratings(path, workers=0) == 2
+    scores = [nonogram_object.difficulty for nonogram_object in stream.iter_nonograms(path)]
+    assert scores == [rating.score(rating.trace(os.path.join(test_dir, name))) for name in sorted(os.listdir(test_dir))]
+
+def test_write_ratings_invalid(tmp_path):
+    with pytest.raises(errors.PathException):
+        rating.write_ratings(str(tmp_path / "missing"), workers=0)
+    path = tmp_path / "puzzle.txt"
+    path.write_text('')
+    with pytest.raises(errors.UnknownFormat):
+        rating.write_ratings(str(path), workers=0)
+
+def test_cli_rate(capsys):
+    assert cli.main(['rate', test_path]) == 0
+    lines = capsys.readouterr().out.splitlines()
+    assert lines[0].split('\t')[:2] == ['puzzle', 'score']
+    assert lines[1].split('\t')[1] == str(rating.score(rating.trace(test_path)))
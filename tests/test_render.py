@@ -0,0 +1,93 @@
+import pytest
+import numpy as np
+import pyNonogram.nonogram as nonogram
+import pyNonogram.render as render
+import pyNonogram.errors as errors
+
+test_path = "tests/test_nonograms/test1.non"
+
+def loaded():
+    nonogram_object = nonogram.Nonogram(path=test_path)
+    nonogram_object.load()
+    return nonogram_object
+
+def test_renderer_not_loaded():
+    with pytest.raises(errors.NotLoaded):
+        render.Renderer(nonogram.Nonogram())
+
+def test_frame():
+    nonogram_object = loaded()
+    nonogram_object.grid.set_cell(0,0,-1)
+    nonogram_object.grid.set_cell(2,0,1)
+    lines = render.Renderer(nonogram_object).frame().split('\n')
+    assert lines[0] == '           2    '
+    assert lines[1] == '       1 3 3 3 1'
+    assert lines[2] == '    1 --  ██    '
+    assert lines[4] == ' 2  2           '
+    assert len(lines) == 8
+
+def test_frame_width_matches_gutters():
+    renderer = render.Renderer(loaded())
+    assert all(len(line) == renderer.gutter_width + 5*renderer.col_space for line in renderer.frame().split('\n'))
+
+def test_print(capsys):
+    nonogram_object = loaded()
+    nonogram_object.print()
+    assert capsys.readouterr().out == nonogram_object.renderer().frame() + '\n'
+
+def test_renderer_cached():
+    nonogram_object = loaded()
+    assert nonogram_object.renderer() is nonogram_object.renderer()
+
+def test_ansi_first_frame_is_full():
+    renderer = render.Renderer(loaded())
+    assert renderer.ansi() == render.CLEAR + renderer.frame()
+
+def test_ansi_redraws_changed_cells_only():
+    nonogram_object = loaded()
+    renderer = nonogram_object.renderer()
+    renderer.ansi()
+    assert renderer.ansi() == ''
+    nonogram_object.grid.set_cell(1,2,1)
+    nonogram_object.grid.set_cell(3,2,-1)
+    update = renderer.ansi()
+    assert update.startswith(render.MOVE.format(5, renderer.gutter_width + renderer.col_space + 1))
+    assert '██  --' in update
+    assert update.endswith(render.MOVE.format(9, 1))
+
+def test_raster():
+    pixels = render.raster(np.array([[1,0],[-1,1]]), scale=2)
+    assert pixels.shape == (4,4)
+    assert pixels[0,0] == 0 and pixels[0,2] == 191 and pixels[2,0] == 255
+
+def test_raster_color():
+    assert render.raster(np.array([[1,-1]]), color=True).shape == (1,2,3)
+
+def test_write_image(tmp_path):
+    nonogram_object = loaded()
+    nonogram_object.load_solution()
+    path = str(tmp_path / "board.pgm")
+    nonogram_object.save_image(path, scale=3)
+    with open(path, 'rb') as f:
+        data = f.read()
+    assert data.startswith(b'P5\n15 18\n255\n')
+    assert len(data) == len(b'P5\n15 18\n255\n') + 15*18
+
+def test_write_image_ppm(tmp_path):
+    path = str(tmp_path / "board.ppm")
+    render.write_image(path, np.zeros((2,3), dtype=np.int8))
+    with open(path, 'rb') as f:
+        assert len(f.read()) == len(b'P6\n3 2\n255\n') + 2*3*3
+
+def test_write_image_unknown_format(tmp_path):
+    with pytest.raises(errors.UnknownFormat):
+        render.write_image(str(tmp_path / "board.png"), np.zeros((2,2)))
+
+def test_frame_colored():
+    nonogram_object = nonogram.Nonogram.from_solution(np.array([[1,2],[0,2]]))
+    nonogram_object.load_solution()
+    lines = render.Renderer(nonogram_object).frame().split('\n')
+    assert lines[0] == '         1.1 2.2'
+    assert lines[1] == '1.1 1.2 ████2222'
+    assert lines[2] == '    1.2 ----2222'
+    assert render.raster(nonogram_object.grid).tolist() == [[0, 76], [255, 76]]
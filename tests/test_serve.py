@@ -0,0 +1,111 @@
+import asyncio
+import json
+import pytest
+from concurrent.futures import ThreadPoolExecutor
+import pyNonogram.serve as serve
+import pyNonogram.batch as batch
+
+test_path = "tests/test_nonograms/test1.non"
+solution = "001000111011011011100010000100"
+
+with open(test_path) as f:
+    puzzle = f.read()
+
+def run(coroutine):
+    return asyncio.run(coroutine)
+
+async def started(**kwargs):
+    kwargs.setdefault('executor', ThreadPoolExecutor(2))
+    server = serve.SolverServer(**kwargs)
+    await server.start()
+    return server
+
+async def exchange(server, requests):
+    reader, writer = await asyncio.open_connection('127.0.0.1', server.port)
+    for request in requests:
+        writer.write((request if isinstance(request, str) else json.dumps(request)).encode() + b'\n')
+    await writer.drain()
+    writer.write_eof()
+    responses = []
+    while True:
+        line = await reader.readline()
+        if not line:
+            break
+        responses.append(json.loads(line))
+    writer.close()
+    return responses
+
+def test_parse_request_puzzle():
+    assert serve.parse_request({'puzzle': puzzle})[:2] == (5, 6)
+
+def test_parse_request_hints():
+    assert serve.parse_request({'width': 2, 'height': 2, 'rows': [[2],[1]], 'columns': [[2],[1]]}) == (2, 2, [[2],[1]], [[2],[1]])
+
+def test_parse_request_missing_puzzle():
+    with pytest.raises(serve.pyNonogram.errors.UnknownFormat):
+        serve.parse_request({'id': 1})
+
+def test_solve_in_process():
+    async def main():
+        server = await started()
+        try:
+            return await server.solve({'id': 7, 'puzzle': puzzle})
+        finally:
+            await server.close()
+    assert run(main()) == {'id': 7, 'status': batch.SOLVED, 'solution': solution}
+
+def test_socket_batches():
+    async def main():
+        server = await started(batch_size=4)
+        try:
+            return await exchange(server, [{'id': idx, 'puzzle': puzzle} for idx in range(10)])
+        finally:
+            await server.close()
+    responses = run(main())
+    assert sorted(response['id'] for response in responses) == list(range(10))
+    assert all(response['status'] == batch.SOLVED and response['solution'] == solution for response in responses)
+
+def test_socket_errors():
+    async def main():
+        server = await started()
+        try:
+            return await exchange(server, ['not json', {'id': 1, 'puzzle': 'author:x'},
+                                           {'id': 2, 'width': 2, 'height': 2, 'rows': [[2],[2]], 'columns': [[1],[1]]},
+                                           {'id': 3, 'width': 2, 'height': 2, 'rows': [[1],[1]], 'columns': [[1],[1]]}])
+        finally:
+            await server.close()
+    responses = {response['id']: response for response in run(main())}
+    assert responses[None]['status'] == batch.ERROR
+    assert responses[1]['status'] == batch.ERROR and 'message' in responses[1]
+    assert responses[2]['status'] == batch.ERROR
+    assert responses[3]['status'] == batch.PARTIAL
+
+def test_deadline():
+    async def main():
+        server = await started(batch_delay=0.5)
+        try:
+            return await exchange(server, [{'id': 1, 'puzzle': puzzle, 'deadline': 0.05}])
+        finally:
+            await server.close()
+    assert run(main()) == [{'id': 1, 'status': serve.TIMEOUT, 'solution': None}]
+
+def test_backpressure():
+    async def main():
+        server = await started(max_pending=1, batch_size=1, max_batches=1)
+        try:
+            responses = await exchange(server, [{'id': idx, 'puzzle': puzzle} for idx in range(20)])
+            return responses, server._queue.qsize()
+        finally:
+            await server.close()
+    responses, queued = run(main())
+    assert len(responses) == 20 and queued == 0
+
+def test_process_pool():
+    async def main():
+        server = serve.SolverServer(workers=1)
+        await server.start()
+        try:
+            return await exchange(server, [{'id': idx, 'puzzle': puzzle} for idx in range(3)])
+        finally:
+            await server.close()
+    assert all(response['status'] == batch.SOLVED for response in run(main()))
@@ -0,0 +1,187 @@
+import pytest
+import numpy as np
+import pyNonogram.solver as solver
+import pyNonogram.nonogram_grid as nonogram_grid
+import pyNonogram.bitset_grid as bitset_grid
+import pyNonogram.errors as errors
+
+def test_normalize_clues():
+    assert solver.normalize_clues([2,1]) == (2,1)
+
+def test_normalize_clues_empty_line():
+    assert solver.normalize_clues([0]) == ()
+
+def test_line_segments():
+    assert solver.line_segments([1,1,-1,0,1]) == (2,1)
+
+def test_solve_line_overlap():
+    assert solver.solve_line((4,), [0,0,0,0,0]) == [0,1,1,1,0]
+
+def test_solve_line_exact_fit():
+    assert solver.solve_line((2,2), [0,0,0,0,0]) == [1,1,-1,1,1]
+
+def test_solve_line_empty_clues():
+    assert solver.solve_line((), [0,0,0]) == [-1,-1,-1]
+
+def test_solve_line_uses_known_cells():
+    assert solver.solve_line((1,), [0,0,1,0,0]) == [-1,-1,1,-1,-1]
+
+def test_solve_line_nothing_deducible():
+    assert solver.solve_line((1,), [0,0,0]) == [0,0,0]
+
+def test_solve_line_contradiction():
+    assert solver.solve_line((3,), [0,-1,0,0,-1]) is None
+
+def test_solve_line_complete_line():
+    assert solver.solve_line((1,1), [1,-1,1]) == [1,-1,1]
+    assert solver.solve_line((2,), [1,-1,1]) is None
+
+def test_propagate():
+    grid = nonogram_grid.NonogramGrid((2,2))
+    deduced = solver.propagate(grid, [[2],[1]], [[2],[1]])
+    assert deduced == 4
+    assert np.all(grid == [[1,1],[1,-1]])
+
+def test_propagate_contradiction():
+    grid = nonogram_grid.NonogramGrid((2,2))
+    with pytest.raises(errors.Contradiction):
+        solver.propagate(grid, [[2],[2]], [[1],[1]])
+
+def test_propagate_trail_and_undo():
+    grid = nonogram_grid.NonogramGrid((2,2))
+    trail = []
+    solver.propagate(grid, [[2],[1]], [[2],[1]], trail=trail)
+    assert sorted(trail) == [(0,0), (0,1), (1,0), (1,1)]
+    solver.undo(grid, trail, 0)
+    assert trail == [] and np.all(grid == 0)
+
+def test_pick_cell():
+    grid = nonogram_grid.NonogramGrid((3,3))
+    grid[0] = [1,0,-1]
+    assert solver.pick_cell(grid) == (0,1)
+    grid[:] = 1
+    assert solver.pick_cell(grid) is None
+
+def test_search_unique():
+    grid = nonogram_grid.NonogramGrid((2,2))
+    solutions = []
+    assert solver.search(grid, [[2],[1]], [[2],[1]], solutions=solutions) == 1
+    assert np.all(solutions[0] == [[1,1],[1,-1]])
+    assert np.all(grid == 0)
+
+def test_search_multiple():
+    grid = nonogram_grid.NonogramGrid((2,2))
+    solutions = []
+    assert solver.search(grid, [[1],[1]], [[1],[1]], limit=5, solutions=solutions) == 2
+    assert sorted(solution.tolist() for solution in solutions) == [[[-1,1],[1,-1]], [[1,-1],[-1,1]]]
+    assert np.all(grid == 0)
+
+def test_search_limit():
+    grid = nonogram_grid.NonogramGrid((3,3))
+    assert solver.search(grid, [[1],[1],[1]], [[1],[1],[1]], limit=2) == 2
+    assert solver.search(grid, [[1],[1],[1]], [[1],[1],[1]], limit=10) == 6
+
+def test_search_unlimited():
+    grid = nonogram_grid.NonogramGrid((3,3))
+    assert solver.search(grid, [[1],[1],[1]], [[1],[1],[1]], limit=None) == 6
+
+def test_search_invalid_limit():
+    grid = nonogram_grid.NonogramGrid((2,2))
+    with pytest.raises(ValueError):
+        solver.search(grid, [[1],[1]], [[1],[1]], limit=0)
+
+def test_probe():
+    #line logic gets stuck, probing one cell finishes it
+    rows = [(2,1), (1,3), (1,), (3,), (1,1)]
+    columns = [(2,1), (1,1), (1,1), (2,1), (2,1)]
+    grid = nonogram_grid.NonogramGrid((5,5))
+    solver.propagate(grid, rows, columns)
+    assert np.any(grid == 0)
+    trail = []
+    assert solver.probe(grid, rows, columns, [1, -1], trail) is None
+    assert np.all(grid != 0) and len(trail) > 0
+
+def test_search_no_solution():
+    grid = nonogram_grid.NonogramGrid((2,2))
+    assert solver.search(grid, [[2],[2]], [[1],[1]]) == 0
+
+def test_line_feasible():
+    assert solver.line_feasible((2,1), [0,0,0,0,0]) == True
+    assert solver.line_feasible((2,1), [1,-1,0,0,0]) == False
+    assert solver.line_feasible((2,1), [1,1,-1,-1,1]) == True
+    assert solver.line_feasible((), [0,-1,0]) == True
+    assert solver.line_feasible((), [0,1,0]) == False
+
+def test_line_feasible_matches_solve_line():
+    rng = np.random.default_rng(0)
+    for _ in range(200):
+        line = rng.integers(-1, 2, size=8).tolist()
+        clues = solver.line_segments(rng.integers(0, 2, size=8).tolist())
+        assert solver.line_feasible(clues, line) == (solver.solve_line(clues, line) is not None)
+
+def test_check_cell_lines():
+    grid = nonogram_grid.NonogramGrid((2,2))
+    grid[0, :] = 1
+    with pytest.raises(errors.Contradiction) as info:
+        solver.check_cell_lines(grid, [(1,), (1,)], [(1,), (1,)], 1, 0)
+    assert info.value.lines == [('row', 0)]
+
+def test_normalize_colored_clues():
+    assert solver.normalize_clues([[2,1], [0,2], (1,2)]) == ((2,1), (1,2))
+    assert solver.is_colored(((2,1),)) and not solver.is_colored((2,))
+
+def test_color_line_segments():
+    assert solver.color_line_segments([1,1,2,-1,0,2]) == ((2,1), (1,2), (1,2))
+
+def test_solve_color_line_no_gap_between_colors():
+    assert solver.solve_color_line(((2,1), (1,2)), [0,0,0]) == [1,1,2]
+    assert solver.solve_color_line(((1,1), (1,1)), [0,0,0]) == [1,-1,1]
+
+def test_solve_color_line_overlap():
+    assert solver.solve_color_line(((2,2),), [0,0,0]) == [0,2,0]
+    assert solver.solve_color_line(((1,2),), [0,1,0]) is None
+
+def test_solve_color_line_matches_solve_line():
+    rng = np.random.default_rng(0)
+    for _ in range(200):
+        line = rng.integers(-1, 2, size=8).tolist()
+        clues = solver.line_segments(rng.integers(0, 2, size=8).tolist())
+        assert solver.solve_color_line(tuple((clue, 1) for clue in clues), line) == solver.solve_line(clues, line)
+
+def test_search_colored():
+    grid = nonogram_grid.NonogramGrid((2,2), colors=2)
+    solutions = []
+    assert solver.search(grid, [[(1,1),(1,2)], [(1,2)]], [[(1,1)], [(2,2)]], solutions=solutions) == 1
+    assert np.all(solutions[0] == [[1,2],[-1,2]])
+
+def test_solve_line_masks_matches_solve_line():
+    rng = np.random.default_rng(0)
+    for _ in range(500):
+        size = int(rng.integers(1, 12))
+        line = rng.integers(-1, 2, size=size).tolist()
+        clues = solver.line_segments(rng.integers(0, 2, size=size).tolist())
+        filled = sum(1 << i for i, value in enumerate(line) if value == 1)
+        crossed = sum(1 << i for i, value in enumerate(line) if value == -1)
+        result = solver.solve_line(clues, line)
+        masks = solver.solve_line_masks(clues, filled, crossed, size)
+        assert solver.line_feasible_masks(clues, filled, crossed, size) == (result is not None)
+        if result is None:
+            assert masks is None
+        else:
+            assert masks == (sum(1 << i for i, value in enumerate(result) if value == 1),
+                             sum(1 << i for i, value in enumerate(result) if value == -1))
+
+def test_solve_line_masks_overlap():
+    assert solver.solve_line_masks((3,), 0, 0, 4) == (0b0110, 0)
+    assert solver.solve_line_masks((2,), 0b00001, 0, 5) == (0b00011, 0b11100)
+    assert solver.solve_line_masks((3,), 0, 0b00100, 5) is None
+
+def test_propagate_bitset_grid():
+    solution = np.random.default_rng(1).integers(0, 2, size=(8,8))
+    rows = [solver.line_segments(row.tolist()) for row in solution]
+    columns = [solver.line_segments(col.tolist()) for col in solution.T]
+    grid = bitset_grid.BitsetGrid((8,8))
+    solver.propagate(grid, rows, columns)
+    expected = nonogram_grid.NonogramGrid((8,8))
+    solver.propagate(expected, rows, columns)
+    assert np.all(grid.to_array() == expected)
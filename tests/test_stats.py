@@ -0,0 +1,65 @@
+import pyNonogram.stats as stats
+import pyNonogram.nonogram as nonogram
+import pyNonogram.line_cache as line_cache
+import pyNonogram.solver as solver
+import pyNonogram.nonogram_grid as nonogram_grid
+
+test_path = "tests/test_nonograms/test1.non"
+
+def test_stats_init():
+    stats_object = stats.Stats()
+    assert stats_object.as_dict() == {'lines': 0, 'cells': 0, 'rounds': 0, 'multi_block': 0, 'cache_hits': 0, 'cache_misses': 0,
+                                      'probes': 0, 'guesses': 0, 'backtracks': 0, 'times': {}, 'calls': {}}
+
+def test_phase():
+    stats_object = stats.Stats()
+    with stats_object.phase('load'):
+        pass
+    with stats_object.phase('load'):
+        pass
+    assert stats_object.calls == {'load': 2}
+    assert stats_object.times['load'] >= 0
+
+def test_callback():
+    events = []
+    stats_object = stats.Stats(callback=lambda phase, seconds, record: events.append((phase, record)))
+    stats_object.add_time('solve', 0.5)
+    assert events == [('solve', stats_object)]
+
+def test_reset():
+    stats_object = stats.Stats()
+    stats_object.lines = 3
+    stats_object.add_time('load', 1.0)
+    stats_object.reset()
+    assert stats_object.lines == 0 and stats_object.times == {}
+
+def test_nonogram_phases():
+    stats_object = stats.Stats()
+    nonogram_object = nonogram.Nonogram(path=test_path, stats=stats_object)
+    nonogram_object.load()
+    nonogram_object.solve()
+    nonogram_object.check_all()
+    assert stats_object.calls == {'load': 1, 'solve': 1, 'check_all': 1}
+    assert stats_object.cells == 30
+    assert stats_object.lines >= 11
+    assert stats_object.rounds >= 1
+    assert stats_object.cache_hits + stats_object.cache_misses == stats_object.lines
+
+def test_nonogram_without_stats():
+    nonogram_object = nonogram.Nonogram(path=test_path)
+    nonogram_object.load()
+    assert nonogram_object.stats is None
+    assert nonogram_object.solve() == True
+
+def test_propagate_rounds():
+    stats_object = stats.Stats()
+    grid = nonogram_grid.NonogramGrid((2,2))
+    solver.propagate(grid, [[2],[1]], [[2],[1]], cache=line_cache.LineCache(0), stats=stats_object)
+    assert stats_object.rounds == 2 and stats_object.lines == 5 and stats_object.cells == 4
+
+def test_search_guesses():
+    stats_object = stats.Stats()
+    nonogram_object = nonogram.Nonogram(stats=stats_object)
+    nonogram_object.load_data('', '', 0, 0, 5, 6, [[1]]*5 + [[0]], [[1]]*5)
+    assert nonogram_object.solve(search=True) == True
+    assert stats_object.guesses >= 1
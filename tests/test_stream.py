@@ -0,0 +1,54 @@
+import pytest
+import pyNonogram.stream as stream
+import pyNonogram.nonogram as nonogram
+import pyNonogram.errors as errors
+
+test_paths = ["tests/test_nonograms/test1.non", "tests/test_nonograms/test2.non"]
+
+def test_pack_and_iter_records(tmp_path):
+    path = str(tmp_path / "corpus.nonl")
+    assert stream.pack(test_paths, path) == 2
+    records = list(stream.iter_records(path))
+    assert len(records) == 2
+    assert records[0][0] == "author:Test Author"
+    assert records[1][0] == "author:Test Author 2"
+
+def test_iter_nonograms(tmp_path):
+    path = str(tmp_path / "corpus.nonl")
+    stream.pack(test_paths, path)
+    nonograms = list(stream.iter_nonograms(path))
+    assert [nonogram_object.author for nonogram_object in nonograms] == ["Test Author", "Test Author 2"]
+    assert nonograms[0].rows == [[1], [3], [2,2], [3], [1], [1]]
+    assert nonograms[0].path is None
+
+def test_write_nonograms(tmp_path):
+    path = str(tmp_path / "corpus.nonl")
+    nonogram_object = nonogram.Nonogram()
+    nonogram_object.load(test_paths[0])
+    assert stream.write_nonograms(path, [nonogram_object, nonogram_object]) == 2
+    for loaded in stream.iter_nonograms(path):
+        assert loaded.to_lines() == nonogram_object.to_lines()
+
+def test_unpack(tmp_path):
+    path = str(tmp_path / "corpus.nonl")
+    stream.pack(test_paths, path)
+    written = stream.unpack(path, str(tmp_path / "out"))
+    assert len(written) == 2
+    for original, unpacked in zip(test_paths, written):
+        with open(original) as f, open(unpacked) as g:
+            assert f.read().strip() == g.read().strip()
+        nonogram.Nonogram().load(unpacked)
+
+def test_iter_records_invalid_extension():
+    with pytest.raises(errors.UnknownFormat):
+        list(stream.iter_records(test_paths[0]))
+
+def test_iter_records_invalid_path():
+    with pytest.raises(errors.PathException):
+        list(stream.iter_records("tests/test_nonograms/missing.nonl"))
+
+def test_iter_records_invalid_record(tmp_path):
+    path = tmp_path / "broken.nonl"
+    path.write_text("author:A\ndate:1\n\n")
+    with pytest.raises(errors.UnknownFormat):
+        list(stream.iter_records(str(path)))